@@ -14,8 +14,9 @@ def print_main_menu():
     print("\nChoose an application:\n")
     print("  1. 🆕 Sign Language Interpreter (Hand Keypoint Detection + TTS)")
     print("  2. 👁️  AI Vision Assistant (Object Detection + Scene Description)")
-    print("  3. ℹ️  About & Documentation")
-    print("  4. 🚪 Exit")
+    print("  3. 🤝 Unified Accessibility Mode (Hand Keypoints + Object Detection)")
+    print("  4. ℹ️  About & Documentation")
+    print("  5. 🚪 Exit")
     print("\n" + "="*80)
 
 
@@ -42,6 +43,7 @@ def run_sign_language_interpreter():
     print("  L      - Toggle keypoint labels")
     print("  K      - Toggle enhanced visualization")
     print("  S      - Save screenshot")
+    print("  V      - Start/stop session recording")
     print("  Q      - Quit")
     print("\n" + "=" * 80 + "\n")
     
@@ -76,11 +78,15 @@ def run_vision_assistant():
     print("  • Spatial awareness and tracking")
     print("\n🎮 Controls:")
     print("  S - Analyze and describe the scene with voice")
+    print("  P - Describe what passed by in the last few seconds")
+    print("  R - Read text aloud (signs, labels)")
     print("  Q - Quit the application")
     print("\n" + "=" * 80 + "\n")
     
     try:
+        from runtime_config import configure_runtime
         from vision_assistant import VisionAssistant
+        configure_runtime(['objects'])
         assistant = VisionAssistant()
         assistant.run()
     except KeyboardInterrupt:
@@ -92,6 +98,37 @@ def run_vision_assistant():
         input("\nPress Enter to continue...")
 
 
+def run_unified_mode():
+    """Run hand keypoint detection and the vision assistant on one camera."""
+    print("\n" + "=" * 80)
+    print("  🤝 UNIFIED ACCESSIBILITY MODE")
+    print("=" * 80)
+    print("\n✨ Features:")
+    print("  • Hand keypoints and object detection on a single camera")
+    print("  • Both models run concurrently on every frame")
+    print("  • One combined overlay")
+    print("\n🎮 Controls:")
+    print("  S - Analyze and describe the scene with voice")
+    print("  P - Describe what passed by in the last few seconds")
+    print("  R - Read text aloud (signs, labels)")
+    print("  Q - Quit the application")
+    print("\n" + "=" * 80 + "\n")
+    
+    try:
+        from runtime_config import configure_runtime
+        from unified_mode import UnifiedAccessibilityMode
+        configure_runtime(['hands', 'objects'])
+        mode = UnifiedAccessibilityMode()
+        mode.run()
+    except KeyboardInterrupt:
+        print("\nReturning to menu...")
+    except Exception as e:
+        print(f"\nError: {e}")
+        import traceback
+        traceback.print_exc()
+        input("\nPress Enter to continue...")
+
+
 def show_documentation():
     """Show documentation and help information."""
     print("\n" + "=" * 80)
@@ -116,6 +153,10 @@ def show_documentation():
     print("     - Scene description")
     print("     - Audio announcements")
     print("     - Spatial awareness")
+    print("")
+    print("  3. Unified Accessibility Mode")
+    print("     - Both of the above on one camera")
+    print("     - Concurrent inference, combined overlay")
     print("\n📚 Documentation Files:")
     print("  • README.md - Main project overview and quick start")
     print("  • docs/hand_keypoint_tts_usage.md - Sign language interpreter guide")
@@ -149,7 +190,7 @@ def main():
     """Main application entry point."""
     while True:
         print_main_menu()
-        choice = input("\nEnter your choice (1-4): ").strip()
+        choice = input("\nEnter your choice (1-5): ").strip()
         
         if choice == '1':
             run_sign_language_interpreter()
@@ -158,9 +199,12 @@ def main():
             run_vision_assistant()
         
         elif choice == '3':
-            show_documentation()
+            run_unified_mode()
         
         elif choice == '4':
+            show_documentation()
+        
+        elif choice == '5':
             print("\n" + "=" * 80)
             print("  Thank you for using Bridging Worlds! 🌉")
             print("  Empowering communication through AI - One gesture at a time ✋")
@@ -168,7 +212,7 @@ def main():
             sys.exit(0)
         
         else:
-            print("\n❌ Invalid choice. Please enter 1-4.")
+            print("\n❌ Invalid choice. Please enter 1-5.")
             input("Press Enter to continue...")
 
 
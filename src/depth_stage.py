@@ -0,0 +1,272 @@
+"""
+Monocular Depth Stage
+Runs a small CPU depth model (MiDaS v2.1 small, through cv2.dnn) on a
+background thread at a low rate (a few Hz) and caches the latest depth map.
+The detection loop only hands it frames without waiting and samples the
+cached map through detection boxes.
+
+MiDaS predicts relative inverse depth. It is turned into metres with a single
+scale factor, calibrated from detections of classes with a known real-world
+height (pinhole model: distance = focal_px * height_m / box_height_px). There
+is no independent metric reference, so for those classes the depth distance
+only reproduces the pinhole estimate (smoothed over the scene); what the
+depth map adds is distances for classes without a known height.
+
+Measure its cost with:  python src/depth_stage.py bench
+"""
+
+import argparse
+import math
+import threading
+import time
+import cv2
+import numpy as np
+from collections import deque
+from typing import Iterable, Optional, Tuple
+
+from model_registry import resolve_model
+
+
+INPUT_SIZE = 256
+MEAN = np.array([0.485, 0.456, 0.406], dtype=np.float32)
+STD = np.array([0.229, 0.224, 0.225], dtype=np.float32)
+
+# Approximate real-world heights in metres for scale calibration
+KNOWN_HEIGHTS = {
+    'person': 1.7,
+    'car': 1.5,
+    'bicycle': 1.0,
+    'motorcycle': 1.1,
+    'dog': 0.5,
+    'cat': 0.3,
+    'chair': 0.9,
+    'couch': 0.85,
+    'dining table': 0.75,
+    'bottle': 0.25,
+    'cup': 0.1,
+    'tv': 0.6,
+    'laptop': 0.25,
+    'potted plant': 0.5,
+}
+
+# Horizontal field of view assumed for focal length (typical webcam)
+DEFAULT_HFOV_DEGREES = 60.0
+
+
+def focal_length_px(frame_width: int, hfov_degrees: float = DEFAULT_HFOV_DEGREES) -> float:
+    """Focal length in pixels for a frame width and horizontal field of view."""
+    return frame_width / (2.0 * math.tan(math.radians(hfov_degrees) / 2.0))
+
+
+# Focal length per pixel of frame width at the default field of view
+FOCAL_PER_WIDTH = focal_length_px(1)
+
+
+def pinhole_distance(bbox, class_name: str, frame_width: int) -> Optional[float]:
+    """
+    Distance in metres of an object of known height from its box height.
+
+    Returns:
+        Distance, or None for classes without a known height
+    """
+    height_m = KNOWN_HEIGHTS.get(class_name)
+    box_height = bbox[3] - bbox[1]
+    if height_m is None or box_height <= 0:
+        return None
+    return FOCAL_PER_WIDTH * frame_width * height_m / box_height
+
+
+class DepthStage:
+    """
+    Background low-rate depth estimation with a cached depth map.
+    """
+
+    def __init__(self, rate_hz: float = 3.0, model_path: Optional[str] = None):
+        """
+        Load the depth model and start the worker thread.
+
+        Args:
+            rate_hz: Maximum depth updates per second
+            model_path: Path of the MiDaS small ONNX model (default: from the model registry)
+        """
+        self.rate_hz = rate_hz
+        self.net = cv2.dnn.readNet(model_path or resolve_model('midas-small'))
+
+        # Latest frame handed over by the detection loop (one slot; newer frames replace it)
+        self._lock = threading.Lock()
+        self._pending = threading.Event()
+        self._frame = None
+        self._last_submit = 0.0
+
+        # Latest result
+        self.depth_map = None
+        self.depth_timestamp = None
+        self.scale = None
+        self.inference_times = deque(maxlen=100)  # Last 100 depth inferences
+
+        self._running = True
+        self._thread = threading.Thread(target=self._worker, name='depth', daemon=True)
+        self._thread.start()
+
+    def submit(self, frame: np.ndarray, timestamp: Optional[float] = None) -> bool:
+        """
+        Offer a frame to the depth stage without waiting.
+
+        Frames arriving faster than rate_hz are ignored; the frame is copied so
+        the caller can reuse its buffer.
+
+        Returns:
+            True if the frame was taken
+        """
+        if timestamp is None:
+            timestamp = time.perf_counter()
+        if timestamp - self._last_submit < 1.0 / self.rate_hz:
+            return False
+        self._last_submit = timestamp
+
+        # Downscale while copying, so the hand-over is cheap
+        small = cv2.resize(frame, (INPUT_SIZE, INPUT_SIZE), interpolation=cv2.INTER_AREA)
+        with self._lock:
+            self._frame = (small, timestamp)
+        self._pending.set()
+        return True
+
+    def _worker(self):
+        """Run the model on the newest submitted frame."""
+        while True:
+            self._pending.wait()
+            if not self._running:
+                return
+            with self._lock:
+                small, timestamp = self._frame
+                self._pending.clear()
+
+            # A failed inference keeps the last good depth map; the thread keeps serving
+            start = time.perf_counter()
+            try:
+                depth = self.infer(small)
+            except Exception as e:
+                print(f"Depth Error: {e}")
+                continue
+            self.inference_times.append(time.perf_counter() - start)
+
+            # Publish atomically (single reference assignment)
+            self.depth_map = depth
+            self.depth_timestamp = timestamp
+
+    def infer(self, image: np.ndarray) -> np.ndarray:
+        """
+        Run the depth model synchronously.
+
+        Args:
+            image: BGR image (any size)
+
+        Returns:
+            INPUT_SIZE x INPUT_SIZE relative inverse depth (larger is closer)
+        """
+        blob = cv2.dnn.blobFromImage(image, 1.0 / 255, (INPUT_SIZE, INPUT_SIZE), MEAN * 255, swapRB=True)
+        blob /= STD.reshape(1, 3, 1, 1)
+        self.net.setInput(blob)
+        return self.net.forward().reshape(INPUT_SIZE, INPUT_SIZE)
+
+    def sample(self, bbox, frame_shape: Tuple[int, ...]) -> Optional[float]:
+        """
+        Median inverse depth in the central half of a box from the cached map.
+
+        Args:
+            bbox: [x1, y1, x2, y2] in frame pixels
+            frame_shape: Shape of the frame the box belongs to
+
+        Returns:
+            Relative inverse depth, or None before the first depth map
+        """
+        depth = self.depth_map
+        if depth is None:
+            return None
+        h, w = frame_shape[:2]
+        x1, y1, x2, y2 = bbox
+        # Central half of the box, mostly the object rather than the background
+        cx1 = int((x1 + (x2 - x1) / 4) * INPUT_SIZE / w)
+        cx2 = int((x2 - (x2 - x1) / 4) * INPUT_SIZE / w) + 1
+        cy1 = int((y1 + (y2 - y1) / 4) * INPUT_SIZE / h)
+        cy2 = int((y2 - (y2 - y1) / 4) * INPUT_SIZE / h) + 1
+        region = depth[max(0, cy1):min(INPUT_SIZE, cy2), max(0, cx1):min(INPUT_SIZE, cx2)]
+        if region.size == 0:
+            return None
+        return float(np.median(region))
+
+    def calibrate(self, detections: Iterable[dict], frame_shape: Tuple[int, ...]):
+        """
+        Fit the inverse-depth-to-metres scale from detections of known height.
+
+        The targets are the pinhole estimates of these same detections, not an
+        independent measurement, so the fit is circular for known-height classes:
+        it can only be as right as the pinhole model (and is wrong for boxes cut
+        off by the frame edge or occluded). The scale is useful for the other
+        classes in the scene. It is kept from earlier calls when no suitable
+        detections are present.
+        """
+        estimates = []
+        for det in detections:
+            meters = pinhole_distance(det['bbox'], det['class'], frame_shape[1])
+            inverse_depth = self.sample(det['bbox'], frame_shape)
+            if meters is not None and inverse_depth is not None and inverse_depth > 0:
+                estimates.append(meters * inverse_depth)
+        if estimates:
+            self.scale = float(np.median(estimates))
+
+    def distance(self, bbox, frame_shape: Tuple[int, ...]) -> Optional[float]:
+        """
+        Metric distance of a box from the cached depth map.
+
+        Returns:
+            Distance in metres, or None until a depth map and a scale are available
+        """
+        if self.scale is None:
+            return None
+        inverse_depth = self.sample(bbox, frame_shape)
+        if inverse_depth is None or inverse_depth <= 0:
+            return None
+        return self.scale / inverse_depth
+
+    def close(self):
+        """Stop the worker thread."""
+        self._running = False
+        self._pending.set()
+        self._thread.join()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Monocular depth stage")
+    parser.add_argument('command', choices=['bench'])
+    parser.add_argument('--runs', type=int, default=20, help="Inferences to time")
+    args = parser.parse_args()
+
+    stage = DepthStage(rate_hz=1e6)
+    frame = np.random.default_rng(0).integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+
+    stage.infer(frame)
+    start = time.perf_counter()
+    for _ in range(args.runs):
+        stage.infer(frame)
+    infer_ms = (time.perf_counter() - start) / args.runs * 1000
+
+    # Cost the detection loop pays per frame: the hand-over and a box lookup
+    submit_times = []
+    for i in range(200):
+        start = time.perf_counter()
+        stage.submit(frame, timestamp=float(i))
+        submit_times.append(time.perf_counter() - start)
+    start = time.perf_counter()
+    for _ in range(1000):
+        stage.sample([100, 100, 400, 600], frame.shape)
+    sample_us = (time.perf_counter() - start) / 1000 * 1e6
+    stage.close()
+
+    print(f"Depth inference:   {infer_ms:.1f} ms (background thread; {1000 / infer_ms:.1f} Hz max)")
+    print(f"Loop hand-over:    {np.median(submit_times) * 1000:.2f} ms per submitted frame")
+    print(f"Box depth lookup:  {sample_us:.1f} us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,218 @@
+"""
+Detection History Store
+A fixed-size ring buffer of recent per-frame object detections, kept as
+structured NumPy arrays so memory stays bounded for arbitrarily long sessions.
+"""
+
+import time
+import numpy as np
+from typing import Dict, List, Optional
+
+
+# Color names produced by VisionAssistant.get_dominant_color, stored as small ints
+COLOR_NAMES = (
+    'black', 'white', 'gray', 'red', 'orange',
+    'yellow', 'green', 'blue', 'purple', 'pink'
+)
+
+DETECTION_DTYPE = np.dtype([
+    ('timestamp', 'f8'),
+    ('frame_id', 'i8'),
+    ('class_id', 'i4'),
+    ('color_id', 'i1'),
+    ('confidence', 'f4'),
+    ('bbox', 'f4', (4,)),
+])
+
+
+class DetectionHistory:
+    """
+    Time-indexed store of the detections seen in recent frames.
+
+    Frames and detections live in two preallocated rings; once either is full
+    the oldest entries are overwritten.
+    """
+
+    def __init__(
+        self,
+        class_names: Dict[int, str],
+        max_frames: int = 300,
+        max_detections: int = 4096
+    ):
+        """
+        Initialize the history store.
+
+        Args:
+            class_names: Mapping of class id to class name (e.g. YOLO model.names)
+            max_frames: Number of frames to remember
+            max_detections: Number of individual detections to remember
+        """
+        self.class_names = dict(class_names)
+        self._class_ids = {name: class_id for class_id, name in self.class_names.items()}
+        self._color_ids = {name: idx for idx, name in enumerate(COLOR_NAMES)}
+
+        self.max_frames = max_frames
+        self.max_detections = max_detections
+
+        # Frame ring: capture time plus the span of detection slots it owns
+        self._frame_times = np.full(max_frames, -np.inf)
+        self._frame_starts = np.zeros(max_frames, dtype=np.int64)
+        self._frame_counts = np.zeros(max_frames, dtype=np.int32)
+
+        # Detection ring
+        self._records = np.zeros(max_detections, dtype=DETECTION_DTYPE)
+
+        # Totals ever written; ring positions are these modulo capacity
+        self.frame_total = 0
+        self.detection_total = 0
+
+    def add(self, detections: List[dict], timestamp: Optional[float] = None) -> int:
+        """
+        Record the detections of one frame.
+
+        Args:
+            detections: Detection dicts as returned by VisionAssistant.detect_objects
+            timestamp: Monotonic time of the frame (defaults to now)
+
+        Returns:
+            The frame id assigned to this frame
+        """
+        if timestamp is None:
+            timestamp = time.monotonic()
+
+        frame_id = self.frame_total
+        # A single frame can never own more than the whole detection ring
+        detections = detections[-self.max_detections:]
+        count = len(detections)
+
+        if count:
+            slots = (self.detection_total + np.arange(count)) % self.max_detections
+            records = self._records[slots]
+            records['timestamp'] = timestamp
+            records['frame_id'] = frame_id
+            records['class_id'] = [self._class_id(det) for det in detections]
+            records['color_id'] = [self._color_ids.get(det.get('color'), -1) for det in detections]
+            records['confidence'] = [det['confidence'] for det in detections]
+            records['bbox'] = [det['bbox'] for det in detections]
+            self._records[slots] = records
+
+        slot = frame_id % self.max_frames
+        self._frame_times[slot] = timestamp
+        self._frame_starts[slot] = self.detection_total
+        self._frame_counts[slot] = count
+
+        self.frame_total += 1
+        self.detection_total += count
+        return frame_id
+
+    def latest(self, max_age: float = 0.1, now: Optional[float] = None) -> Optional[List[dict]]:
+        """
+        Get the detections of the most recent frame if it is fresh enough.
+
+        Args:
+            max_age: Maximum age of the frame in seconds
+            now: Reference monotonic time (defaults to now)
+
+        Returns:
+            List of detection dicts, or None if no frame is recent enough
+        """
+        if self.frame_total == 0:
+            return None
+        if now is None:
+            now = time.monotonic()
+
+        slot = (self.frame_total - 1) % self.max_frames
+        if now - self._frame_times[slot] > max_age:
+            return None
+
+        start = self._frame_starts[slot]
+        stop = start + self._frame_counts[slot]
+        # Skip any part of the frame already overwritten by newer detections
+        start = max(start, self.detection_total - self.max_detections)
+        slots = np.arange(start, stop) % self.max_detections
+        return self.to_dicts(self._records[slots])
+
+    def since(self, seconds: float, now: Optional[float] = None) -> np.ndarray:
+        """
+        Get every stored detection from the last `seconds` seconds.
+
+        Args:
+            seconds: Size of the time window
+            now: Reference monotonic time (defaults to now)
+
+        Returns:
+            Structured array of DETECTION_DTYPE records, oldest first
+        """
+        if now is None:
+            now = time.monotonic()
+
+        stored = min(self.detection_total, self.max_detections)
+        slots = (self.detection_total - stored + np.arange(stored)) % self.max_detections
+        records = self._records[slots]
+        return records[records['timestamp'] >= now - seconds]
+
+    def summarize(self, seconds: float, now: Optional[float] = None) -> Dict[str, int]:
+        """
+        Count what was seen in the last `seconds` seconds.
+
+        Each class is counted by the largest number of instances visible in
+        any single frame, so an object seen across many frames counts once.
+
+        Args:
+            seconds: Size of the time window
+            now: Reference monotonic time (defaults to now)
+
+        Returns:
+            Dictionary of class name to count, most numerous first
+        """
+        records = self.since(seconds, now)
+        if len(records) == 0:
+            return {}
+
+        # Count instances per (frame, class) pair, then keep the peak per class
+        keys = np.stack([records['frame_id'], records['class_id']], axis=1)
+        pairs, counts = np.unique(keys, axis=0, return_counts=True)
+        class_ids, inverse = np.unique(pairs[:, 1], return_inverse=True)
+        peaks = np.zeros(len(class_ids), dtype=np.int64)
+        np.maximum.at(peaks, inverse, counts)
+
+        order = np.argsort(-peaks, kind='stable')
+        return {
+            self.class_names.get(int(class_ids[i]), str(class_ids[i])): int(peaks[i])
+            for i in order
+        }
+
+    def to_dicts(self, records: np.ndarray) -> List[dict]:
+        """
+        Convert stored records back to the detection dict format.
+
+        Args:
+            records: Structured array of DETECTION_DTYPE records
+
+        Returns:
+            List of detection dicts usable by analyze_scene and draw_detections
+        """
+        detections = []
+        for record in records:
+            class_id = int(record['class_id'])
+            color_id = int(record['color_id'])
+            detections.append({
+                'bbox': record['bbox'].tolist(),
+                'confidence': float(record['confidence']),
+                'class': self.class_names.get(class_id, str(class_id)),
+                'class_id': class_id,
+                'color': COLOR_NAMES[color_id] if color_id >= 0 else None
+            })
+        return detections
+
+    def clear(self):
+        """Forget all stored frames and detections."""
+        self._frame_times.fill(-np.inf)
+        self.frame_total = 0
+        self.detection_total = 0
+
+    def _class_id(self, detection: dict) -> int:
+        """Resolve the class id of a detection dict."""
+        if 'class_id' in detection:
+            return int(detection['class_id'])
+        return self._class_ids.get(detection['class'], -1)
@@ -0,0 +1,181 @@
+"""
+Object Detector Backends
+Interchangeable object detectors for the Vision Assistant. Every backend
+returns rows of [x1, y1, x2, y2, confidence, class_id] with COCO class ids,
+so scene analysis and drawing work the same whichever one is used.
+
+    yolo          - YOLOv8n through ultralytics/torch (most accurate)
+    mobilenet-ssd - MobileNet-SSD through cv2.dnn (no torch, fast startup, low memory)
+"""
+
+import os
+import cv2
+import numpy as np
+from typing import Optional
+
+from model_registry import map_model, resolve_model
+from runtime_config import get_runtime
+
+
+DEFAULT_BACKEND = os.environ.get('BRIDGING_WORLDS_DETECTOR', 'yolo')
+
+
+def load_yolo_model():
+    """Load the YOLO model resolved through the model registry."""
+    # Imported lazily so other backends and inference server clients never load torch
+    from ultralytics import YOLO
+
+    # Initialize YOLO model for object detection
+    print("Loading YOLO model...")
+    model = YOLO(resolve_model('yolov8n'))
+
+    # torch was not loaded yet when configure_runtime() applied the budget, so
+    # apply its object detection share now (nothing to apply if it never ran)
+    runtime = get_runtime()
+    if runtime.applied and 'objects' in runtime.assignments:
+        runtime.apply_torch()
+    return model
+
+
+class YoloDetector:
+    """
+    YOLOv8 object detection backend.
+    """
+
+    name = 'yolo'
+
+    def __init__(self):
+        self.model = load_yolo_model()
+        self.names = self.model.names
+
+    def detect(self, frame: np.ndarray, conf: float = 0.5) -> np.ndarray:
+        """
+        Detect objects in a BGR frame.
+
+        Args:
+            frame: Input image in BGR format
+            conf: Minimum confidence
+
+        Returns:
+            Array of [x1, y1, x2, y2, confidence, class_id] rows
+        """
+        rows = []
+        for result in self.model(frame, conf=conf, verbose=False):
+            boxes = result.boxes
+            rows.append(np.column_stack([
+                boxes.xyxy.cpu().numpy(),
+                boxes.conf.cpu().numpy(),
+                boxes.cls.cpu().numpy()
+            ]))
+        return np.concatenate(rows) if rows else np.empty((0, 6), dtype=np.float32)
+
+
+# MobileNet-SSD (PASCAL VOC) classes and the COCO class each maps to
+VOC_TO_COCO = (
+    ('background', None),
+    ('aeroplane', (4, 'airplane')),
+    ('bicycle', (1, 'bicycle')),
+    ('bird', (14, 'bird')),
+    ('boat', (8, 'boat')),
+    ('bottle', (39, 'bottle')),
+    ('bus', (5, 'bus')),
+    ('car', (2, 'car')),
+    ('cat', (15, 'cat')),
+    ('chair', (56, 'chair')),
+    ('cow', (19, 'cow')),
+    ('diningtable', (60, 'dining table')),
+    ('dog', (16, 'dog')),
+    ('horse', (17, 'horse')),
+    ('motorbike', (3, 'motorcycle')),
+    ('person', (0, 'person')),
+    ('pottedplant', (58, 'potted plant')),
+    ('sheep', (18, 'sheep')),
+    ('sofa', (57, 'couch')),
+    ('train', (6, 'train')),
+    ('tvmonitor', (62, 'tv')),
+)
+
+
+class MobileNetSSDDetector:
+    """
+    MobileNet-SSD object detection backend running on cv2.dnn.
+    """
+
+    name = 'mobilenet-ssd'
+
+    def __init__(self, prototxt: Optional[str] = None, caffemodel: Optional[str] = None):
+        """
+        Load the Caffe model.
+
+        Args:
+            prototxt: Path of MobileNetSSD_deploy.prototxt (default: from the model registry)
+            caffemodel: Path of MobileNetSSD_deploy.caffemodel (default: from the model registry)
+        """
+        print("Loading MobileNet-SSD model...")
+        if prototxt is None and caffemodel is None:
+            # Parse straight from read-only memory maps of the verified files
+            self.net = cv2.dnn.readNetFromCaffe(
+                map_model('mobilenet-ssd-prototxt'),
+                map_model('mobilenet-ssd-caffemodel')
+            )
+        else:
+            self.net = cv2.dnn.readNetFromCaffe(
+                prototxt or resolve_model('mobilenet-ssd-prototxt'),
+                caffemodel or resolve_model('mobilenet-ssd-caffemodel')
+            )
+
+        # Lookup table from VOC output index to COCO class id (-1 for background)
+        self.class_map = np.array(
+            [coco[0] if coco else -1 for _, coco in VOC_TO_COCO], dtype=np.int32
+        )
+        self.names = {coco[0]: coco[1] for _, coco in VOC_TO_COCO if coco}
+
+    def detect(self, frame: np.ndarray, conf: float = 0.5) -> np.ndarray:
+        """
+        Detect objects in a BGR frame.
+
+        Args:
+            frame: Input image in BGR format
+            conf: Minimum confidence
+
+        Returns:
+            Array of [x1, y1, x2, y2, confidence, class_id] rows
+        """
+        h, w = frame.shape[:2]
+        blob = cv2.dnn.blobFromImage(
+            cv2.resize(frame, (300, 300)), 0.007843, (300, 300), 127.5
+        )
+        self.net.setInput(blob)
+
+        # Output shape (1, 1, N, 7): [image_id, class, confidence, x1, y1, x2, y2]
+        output = self.net.forward().reshape(-1, 7)
+        class_ids = self.class_map[output[:, 1].astype(np.int32).clip(0, len(self.class_map) - 1)]
+        keep = (output[:, 2] >= conf) & (class_ids >= 0)
+        output = output[keep]
+
+        rows = np.empty((len(output), 6), dtype=np.float32)
+        rows[:, 0:4] = output[:, 3:7].clip(0.0, 1.0) * np.array([w, h, w, h], dtype=np.float32)
+        rows[:, 4] = output[:, 2]
+        rows[:, 5] = class_ids[keep]
+        return rows
+
+
+BACKENDS = {
+    YoloDetector.name: YoloDetector,
+    MobileNetSSDDetector.name: MobileNetSSDDetector
+}
+
+
+def create_detector(backend: str = DEFAULT_BACKEND):
+    """
+    Create an object detector backend by name.
+
+    Args:
+        backend: One of BACKENDS ('yolo' or 'mobilenet-ssd')
+
+    Returns:
+        Detector with a `names` dict and a `detect(frame, conf)` method
+    """
+    if backend not in BACKENDS:
+        raise ValueError(f"Unknown detector backend '{backend}', expected one of {sorted(BACKENDS)}")
+    return BACKENDS[backend]()
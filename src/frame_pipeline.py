@@ -0,0 +1,415 @@
+"""
+Multi-Process Frame Pipeline
+Runs capture, inference and annotation/display in separate processes so they
+stop competing for the GIL. Frames live in a ring of preallocated
+shared-memory slots; only small descriptors travel over the queues.
+
+Run with:  python src/frame_pipeline.py --stage hands
+"""
+
+import argparse
+import multiprocessing as mp
+import queue
+import time
+import cv2
+import numpy as np
+from collections import namedtuple
+from functools import partial
+from multiprocessing import shared_memory
+from typing import Optional, Tuple
+
+from shm_utils import untrack
+
+
+# What to do when every slot is in use:
+#   block       - wait for a slot to be freed (never drops, adds latency)
+#   drop_newest - discard the frame just captured
+#   drop_oldest - reclaim the oldest frame still waiting for inference
+POLICIES = ('block', 'drop_newest', 'drop_oldest')
+
+FrameDescriptor = namedtuple('FrameDescriptor', ['slot', 'frame_id', 'timestamp'])
+
+
+class SharedFrameRing:
+    """
+    Fixed number of equally sized BGR frame slots in one shared-memory block.
+    """
+
+    def __init__(self, slots: int, shape: Tuple[int, int, int], name: Optional[str] = None):
+        """
+        Create a new ring, or attach to an existing one by name.
+
+        Args:
+            slots: Number of frame slots
+            shape: Frame shape (height, width, channels)
+            name: Name of an existing ring to attach to
+        """
+        self.slots = slots
+        self.shape = tuple(shape)
+        self.owner = name is None
+
+        if self.owner:
+            size = slots * int(np.prod(self.shape))
+            self.shm = shared_memory.SharedMemory(create=True, size=size)
+        else:
+            self.shm = shared_memory.SharedMemory(name=name)
+            untrack(self.shm)
+
+        self.frames = np.ndarray((slots,) + self.shape, dtype=np.uint8, buffer=self.shm.buf)
+
+    @property
+    def name(self) -> str:
+        """Name other processes use to attach to this ring."""
+        return self.shm.name
+
+    def close(self):
+        """Detach from the ring, destroying it if this process created it."""
+        del self.frames
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class HandStage:
+    """
+    MediaPipe hand landmarks as a pipeline stage.
+    """
+
+    title = 'Hand Keypoint Pipeline'
+
+    def __init__(
+        self,
+        max_num_hands: int = 2,
+        min_detection_confidence: float = 0.7,
+        min_tracking_confidence: float = 0.5
+    ):
+        self.max_num_hands = max_num_hands
+        self.min_detection_confidence = min_detection_confidence
+        self.min_tracking_confidence = min_tracking_confidence
+        self.detector = None
+
+    def setup(self):
+        """Build the MediaPipe graph (runs in the inference process)."""
+        from hand_keypoint_detection import HandKeypointDetector
+
+        self.detector = HandKeypointDetector(
+            max_num_hands=self.max_num_hands,
+            min_detection_confidence=self.min_detection_confidence,
+            min_tracking_confidence=self.min_tracking_confidence,
+            use_server=False
+        )
+
+    def infer(self, frame: np.ndarray) -> list:
+        """Detect hands and return them in a compact picklable form."""
+        from hand_keypoint_detection import serialize_hand_results
+
+        return serialize_hand_results(self.detector.process(frame))
+
+    def render(self, frame: np.ndarray, result: list) -> str:
+        """Draw the hands onto the frame and return a status line."""
+        from hand_keypoint_detection import build_hand_results, draw_hand_landmarks
+
+        draw_hand_landmarks(frame, build_hand_results(result))
+        return f"Hands detected: {len(result)}"
+
+    def close(self):
+        """Release the MediaPipe graph."""
+        if self.detector is not None:
+            self.detector.close()
+
+
+class DetectorStage:
+    """
+    Object detection (any detectors.py backend) as a pipeline stage.
+    """
+
+    title = 'Vision Assistant Pipeline'
+
+    def __init__(self, backend: str = 'yolo', conf: float = 0.5):
+        self.backend = backend
+        self.conf = conf
+        self.detector = None
+
+    def setup(self):
+        """Load the detector (runs in the inference process)."""
+        from detectors import create_detector
+
+        self.detector = create_detector(self.backend)
+
+    def infer(self, frame: np.ndarray) -> list:
+        """Detect objects and return detection dicts with plain Python values."""
+        from vision_assistant import VisionAssistant
+
+        detections = []
+        for x1, y1, x2, y2, confidence, class_id in self.detector.detect(frame, self.conf).tolist():
+            bbox = [x1, y1, x2, y2]
+            detections.append({
+                'bbox': bbox,
+                'confidence': confidence,
+                'class': self.detector.names[int(class_id)],
+                'class_id': int(class_id),
+                'color': VisionAssistant.get_dominant_color(frame, bbox)
+            })
+        return detections
+
+    def render(self, frame: np.ndarray, result: list) -> str:
+        """Draw the detections onto the frame and return a status line."""
+        from vision_assistant import VisionAssistant
+
+        VisionAssistant.draw_detections(frame, result)
+        return f"Objects detected: {len(result)}"
+
+    def close(self):
+        """Release the model."""
+        self.detector = None
+
+
+STAGES = {
+    'hands': HandStage,
+    'yolo': partial(DetectorStage, backend='yolo'),
+    'mobilenet-ssd': partial(DetectorStage, backend='mobilenet-ssd')
+}
+
+
+def _capture_worker(ring_name, slots, shape, camera_index, policy,
+                    free_slots, pending, stop_event, dropped):
+    """Capture process: read, mirror into a free slot, publish a descriptor."""
+    ring = SharedFrameRing(slots, shape, name=ring_name)
+    height, width = shape[:2]
+
+    cap = cv2.VideoCapture(camera_index)
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+    capture_buffer = None
+    resize_buffer = np.empty(shape, dtype=np.uint8)
+    frame_id = 0
+
+    try:
+        while not stop_event.is_set():
+            # Reuse one buffer for reads; the only copy is the mirror into shared memory
+            success, capture_buffer = cap.read(capture_buffer)
+            if not success:
+                print("Error: Could not read frame")
+                break
+
+            slot = _acquire_slot(policy, free_slots, pending, stop_event, dropped)
+            if slot is None:
+                continue
+
+            if capture_buffer.shape != ring.shape:
+                cv2.resize(capture_buffer, (width, height), dst=resize_buffer)
+                cv2.flip(resize_buffer, 1, dst=ring.frames[slot])
+            else:
+                cv2.flip(capture_buffer, 1, dst=ring.frames[slot])
+
+            pending.put(FrameDescriptor(slot, frame_id, time.monotonic()))
+            frame_id += 1
+    finally:
+        cap.release()
+        stop_event.set()
+        ring.close()
+
+
+def _acquire_slot(policy, free_slots, pending, stop_event, dropped) -> Optional[int]:
+    """Get a slot to capture into, applying the backpressure policy."""
+    try:
+        return free_slots.get_nowait()
+    except queue.Empty:
+        pass
+
+    if policy == 'drop_newest':
+        with dropped.get_lock():
+            dropped.value += 1
+        return None
+
+    if policy == 'drop_oldest':
+        try:
+            stale = pending.get_nowait()
+        except queue.Empty:
+            pass
+        else:
+            with dropped.get_lock():
+                dropped.value += 1
+            return stale.slot
+
+    # Block (or every slot is busy downstream of the pending queue)
+    while not stop_event.is_set():
+        try:
+            return free_slots.get(timeout=0.1)
+        except queue.Empty:
+            continue
+    return None
+
+
+def _inference_worker(ring_name, slots, shape, stage, pending, results, stop_event):
+    """Inference process: run the stage on each pending slot."""
+    ring = SharedFrameRing(slots, shape, name=ring_name)
+    try:
+        stage.setup()
+        while not stop_event.is_set():
+            try:
+                descriptor = pending.get(timeout=0.1)
+            except queue.Empty:
+                continue
+            results.put((descriptor, stage.infer(ring.frames[descriptor.slot])))
+    finally:
+        stage.close()
+        stop_event.set()
+        ring.close()
+
+
+class FramePipeline:
+    """
+    Capture, inference and display split across processes.
+    """
+
+    def __init__(
+        self,
+        stage: object,
+        camera_index: int = 0,
+        width: int = 1280,
+        height: int = 720,
+        slots: int = 4,
+        policy: str = 'drop_oldest'
+    ):
+        """
+        Initialize the pipeline.
+
+        Args:
+            stage: Stage object with setup/infer/render/close (e.g. HandStage, DetectorStage)
+            camera_index: OpenCV camera index
+            width: Frame width of the shared slots
+            height: Frame height of the shared slots
+            slots: Number of preallocated frame slots
+            policy: Backpressure policy, one of POLICIES
+        """
+        if policy not in POLICIES:
+            raise ValueError(f"Unknown policy '{policy}', expected one of {POLICIES}")
+        if slots < 2:
+            raise ValueError("The pipeline needs at least two frame slots")
+
+        self.stage = stage
+        self.camera_index = camera_index
+        self.shape = (height, width, 3)
+        self.slots = slots
+        self.policy = policy
+
+        self.dropped = mp.Value('i', 0)
+        self.frames_shown = 0
+
+    def run(self):
+        """Run the pipeline until 'q' is pressed or capture stops."""
+        ring = SharedFrameRing(self.slots, self.shape)
+        free_slots = mp.Queue()
+        pending = mp.Queue()
+        results = mp.Queue()
+        stop_event = mp.Event()
+
+        for slot in range(self.slots):
+            free_slots.put(slot)
+
+        processes = [
+            mp.Process(
+                target=_capture_worker,
+                args=(ring.name, self.slots, self.shape, self.camera_index, self.policy,
+                      free_slots, pending, stop_event, self.dropped),
+                daemon=True
+            ),
+            mp.Process(
+                target=_inference_worker,
+                args=(ring.name, self.slots, self.shape, self.stage,
+                      pending, results, stop_event),
+                daemon=True
+            )
+        ]
+        for process in processes:
+            process.start()
+
+        print(f"Pipeline running ({self.slots} slots, policy: {self.policy}). Press 'q' to quit")
+        fps = 0.0
+        last_time = time.perf_counter()
+
+        try:
+            while not stop_event.is_set():
+                try:
+                    descriptor, result = results.get(timeout=0.1)
+                except queue.Empty:
+                    continue
+
+                if self.policy == 'drop_oldest':
+                    # Skip straight to the newest finished frame
+                    while True:
+                        try:
+                            newer = results.get_nowait()
+                        except queue.Empty:
+                            break
+                        free_slots.put(descriptor.slot)
+                        with self.dropped.get_lock():
+                            self.dropped.value += 1
+                        descriptor, result = newer
+
+                # The display process owns this slot until it is returned, so draw in place
+                frame = ring.frames[descriptor.slot]
+                status = self.stage.render(frame, result)
+
+                now = time.perf_counter()
+                fps = 0.9 * fps + 0.1 / max(now - last_time, 1e-6)
+                last_time = now
+                latency_ms = (time.monotonic() - descriptor.timestamp) * 1000
+
+                cv2.putText(frame, status, (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+                cv2.putText(
+                    frame,
+                    f"FPS: {fps:.1f} | Latency: {latency_ms:.0f} ms | Dropped: {self.dropped.value}",
+                    (10, 60),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.6,
+                    (255, 255, 0),
+                    2
+                )
+                cv2.imshow(self.stage.title, frame)
+                self.frames_shown += 1
+                free_slots.put(descriptor.slot)
+
+                if cv2.waitKey(1) & 0xFF == ord('q'):
+                    print("Quitting...")
+                    break
+        finally:
+            stop_event.set()
+            for process in processes:
+                process.join(timeout=2.0)
+                if process.is_alive():
+                    process.terminate()
+            for q in (free_slots, pending, results):
+                q.cancel_join_thread()
+            cv2.destroyAllWindows()
+            ring.close()
+
+        print(f"\nDisplayed {self.frames_shown} frames, dropped {self.dropped.value}")
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Multi-process capture/inference/display pipeline")
+    parser.add_argument('--stage', choices=sorted(STAGES), default='hands', help="Inference stage")
+    parser.add_argument('--camera', type=int, default=0, help="Camera index")
+    parser.add_argument('--width', type=int, default=1280, help="Frame width")
+    parser.add_argument('--height', type=int, default=720, help="Frame height")
+    parser.add_argument('--slots', type=int, default=4, help="Shared-memory frame slots")
+    parser.add_argument('--policy', choices=POLICIES, default='drop_oldest', help="Backpressure policy")
+    args = parser.parse_args()
+
+    pipeline = FramePipeline(
+        STAGES[args.stage](),
+        camera_index=args.camera,
+        width=args.width,
+        height=args.height,
+        slots=args.slots,
+        policy=args.policy
+    )
+    pipeline.run()
+
+
+if __name__ == "__main__":
+    main()
@@ -5,15 +5,110 @@ This program detects and tracks hand landmarks in real-time using webcam feed.
 
 import cv2
 import mediapipe as mp
+import mmap
 import numpy as np
+import os
+import re
 import sys
-from typing import Optional, Tuple
+import threading
+import time
+from collections import deque
+from types import SimpleNamespace
+from typing import List, Optional, Tuple
+
+from idle_monitor import IdleMonitor, set_capture_size
+from inference_server import InferenceClient
+from model_registry import resolve_model
+from overlay import OverlayLayer, Sprite
+from recorder import FrameRecorder
+from runtime_config import configure_runtime, get_runtime
 
 # Import TTS for Windows
 if sys.platform == 'win32':
     import win32com.client
 
 
+def serialize_hand_results(results: object) -> list:
+    """
+    Convert MediaPipe Hands results into plain lists and dicts.
+    
+    Args:
+        results: MediaPipe results object
+        
+    Returns:
+        List of dictionaries with hand label, score and normalized landmarks
+    """
+    if not results.multi_hand_landmarks:
+        return []
+    
+    hands = []
+    for hand_landmarks, handedness in zip(results.multi_hand_landmarks, results.multi_handedness):
+        classification = handedness.classification[0]
+        hands.append({
+            'label': classification.label,
+            'score': classification.score,
+            'landmarks': [[lm.x, lm.y, lm.z] for lm in hand_landmarks.landmark]
+        })
+    return hands
+
+
+def build_hand_results(hands: list) -> object:
+    """
+    Rebuild a MediaPipe-compatible results object from serialized hands.
+    
+    Args:
+        hands: List produced by serialize_hand_results
+        
+    Returns:
+        Object with multi_hand_landmarks and multi_handedness attributes
+    """
+    from mediapipe.framework.formats import classification_pb2, landmark_pb2
+    
+    if not hands:
+        return SimpleNamespace(multi_hand_landmarks=None, multi_handedness=None)
+    
+    multi_hand_landmarks = []
+    multi_handedness = []
+    for hand in hands:
+        landmark_list = landmark_pb2.NormalizedLandmarkList()
+        for x, y, z in hand['landmarks']:
+            landmark_list.landmark.add(x=x, y=y, z=z)
+        multi_hand_landmarks.append(landmark_list)
+        
+        classification_list = classification_pb2.ClassificationList()
+        classification_list.classification.add(label=hand['label'], score=hand['score'])
+        multi_handedness.append(classification_list)
+    
+    return SimpleNamespace(
+        multi_hand_landmarks=multi_hand_landmarks,
+        multi_handedness=multi_handedness
+    )
+
+
+def draw_hand_landmarks(image: np.ndarray, results: object) -> np.ndarray:
+    """
+    Draw MediaPipe hand landmarks and connections onto an image in place.
+    
+    Args:
+        image: Image to draw on (BGR)
+        results: MediaPipe results object
+        
+    Returns:
+        The same image
+    """
+    if results.multi_hand_landmarks:
+        for hand_landmarks in results.multi_hand_landmarks:
+            # Draw landmarks and connections
+            mp.solutions.drawing_utils.draw_landmarks(
+                image,
+                hand_landmarks,
+                mp.solutions.hands.HAND_CONNECTIONS,
+                mp.solutions.drawing_styles.get_default_hand_landmarks_style(),
+                mp.solutions.drawing_styles.get_default_hand_connections_style()
+            )
+    return image
+
+
 class HandKeypointDetector:
     """
     Detects hand keypoints using MediaPipe Hands solution.
@@ -25,7 +120,8 @@ class HandKeypointDetector:
         static_image_mode: bool = False,
         max_num_hands: int = 2,
         min_detection_confidence: float = 0.5,
-        min_tracking_confidence: float = 0.5
+        min_tracking_confidence: float = 0.5,
+        use_server: bool = True
     ):
         """
         Initialize the hand keypoint detector.
@@ -35,17 +131,29 @@ class HandKeypointDetector:
             max_num_hands: Maximum number of hands to detect (1 or 2)
             min_detection_confidence: Minimum confidence for hand detection
             min_tracking_confidence: Minimum confidence for hand tracking
+            use_server: Use the shared inference server when it is running
         """
         self.mp_hands = mp.solutions.hands
         self.mp_drawing = mp.solutions.drawing_utils
         self.mp_drawing_styles = mp.solutions.drawing_styles
         
-        self.hands = self.mp_hands.Hands(
-            static_image_mode=static_image_mode,
-            max_num_hands=max_num_hands,
-            min_detection_confidence=min_detection_confidence,
-            min_tracking_confidence=min_tracking_confidence
-        )
+        self.hands_options = {
+            'static_image_mode': static_image_mode,
+            'max_num_hands': max_num_hands,
+            'min_detection_confidence': min_detection_confidence,
+            'min_tracking_confidence': min_tracking_confidence
+        }
+        
+        # The MediaPipe graph is only built here when no server is available
+        self.client = InferenceClient.connect() if use_server else None
+        if self.client is not None:
+            print("Using shared inference server")
+            self.hands = None
+        else:
+            self.hands = self._create_pinned_hands()
+        
+        # Preallocated RGB buffer reused for every frame
+        self._rgb_buffer = None
         
         # Hand landmark names (21 points per hand)
         self.landmark_names = [
@@ -57,38 +165,68 @@ class HandKeypointDetector:
             'PINKY_MCP', 'PINKY_PIP', 'PINKY_DIP', 'PINKY_TIP'
         ]
     
-    def detect_hands(self, image: np.ndarray) -> Tuple[np.ndarray, Optional[object]]:
+    def _create_hands(self) -> object:
+        """Build the in-process MediaPipe Hands graph."""
+        return self.mp_hands.Hands(**self.hands_options)
+    
+    def _create_pinned_hands(self) -> object:
+        """Build the MediaPipe graph so its threads stay within the hands CPU budget."""
+        with get_runtime().pinned('hands'):
+            return self._create_hands()
+    
+    def detect_hands(
+        self,
+        image: np.ndarray,
+        in_place: bool = False
+    ) -> Tuple[np.ndarray, Optional[object]]:
         """
         Detect hands and their keypoints in an image.
         
         Args:
             image: Input image in BGR format (OpenCV format)
+            in_place: Draw onto `image` itself instead of a copy
             
         Returns:
             Tuple of (annotated_image, results)
         """
-        # Convert BGR to RGB for MediaPipe
-        image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-        
-        # Process the image
-        results = self.hands.process(image_rgb)
+        results = self.process(image)
         
         # Draw hand landmarks
-        annotated_image = image.copy()
-        
-        if results.multi_hand_landmarks:
-            for hand_landmarks in results.multi_hand_landmarks:
-                # Draw landmarks and connections
-                self.mp_drawing.draw_landmarks(
-                    annotated_image,
-                    hand_landmarks,
-                    self.mp_hands.HAND_CONNECTIONS,
-                    self.mp_drawing_styles.get_default_hand_landmarks_style(),
-                    self.mp_drawing_styles.get_default_hand_connections_style()
-                )
+        annotated_image = image if in_place else image.copy()
+        draw_hand_landmarks(annotated_image, results)
         
         return annotated_image, results
     
+    def process(self, image: np.ndarray, image_rgb: Optional[np.ndarray] = None) -> object:
+        """
+        Run hand landmark inference on a BGR image without drawing.
+        
+        Args:
+            image: Input image in BGR format
+            image_rgb: Optional RGB conversion of `image` that is already available
+            
+        Returns:
+            MediaPipe results object
+        """
+        if self.client is not None:
+            try:
+                return build_hand_results(self.client.hands(image, **self.hands_options))
+            except (OSError, ConnectionError, RuntimeError) as e:
+                # Server went away: fall back to in-process inference
+                print(f"Inference server unavailable ({e}), running MediaPipe locally")
+                self.client.close()
+                self.client = None
+                self.hands = self._create_pinned_hands()
+        
+        # Convert BGR to RGB for MediaPipe into a reused buffer (MediaPipe copies it)
+        if image_rgb is None:
+            if self._rgb_buffer is None or self._rgb_buffer.shape != image.shape:
+                self._rgb_buffer = np.empty_like(image)
+            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+        
+        # Process the image
+        return self.hands.process(image_rgb)
+    
     def get_keypoint_coordinates(
         self,
         results: object,
@@ -140,7 +278,8 @@ class HandKeypointDetector:
         self,
         image: np.ndarray,
         hands_data: list,
-        show_labels: bool = True
+        show_labels: bool = True,
+        in_place: bool = False
     ) -> np.ndarray:
         """
         Draw keypoints with enhanced visualization including labels.
@@ -149,11 +288,12 @@ class HandKeypointDetector:
             image: Input image
             hands_data: List of hand data from get_keypoint_coordinates
             show_labels: Whether to show keypoint labels
+            in_place: Draw onto `image` itself instead of a copy
             
         Returns:
             Image with enhanced keypoint visualization
         """
-        output = image.copy()
+        output = image if in_place else image.copy()
         
         for hand_data in hands_data:
             hand_label = hand_data['hand']
@@ -198,9 +338,152 @@ class HandKeypointDetector:
         
         return output
     
+    def reset_tracking(self):
+        """
+        Forget the hands tracked so far, e.g. when a different person is in view.
+        
+        The in-process graph is rebuilt, since MediaPipe keeps tracking state
+        between frames when static_image_mode is False.
+        """
+        if self.hands is not None:
+            self.hands.close()
+            self.hands = self._create_pinned_hands()
+    
     def close(self):
         """Clean up resources."""
-        self.hands.close()
+        if self.hands is not None:
+            self.hands.close()
+        if self.client is not None:
+            self.client.close()
+
+
+class LiveStreamHandDetector(HandKeypointDetector):
+    """
+    Hand keypoint detector on the MediaPipe Tasks HandLandmarker in LIVE_STREAM mode.
+    
+    Frames are submitted with detect_async and landmarks arrive through a result
+    callback, so the next frame can be captured and rendered while the current
+    one is processed. `process` returns the newest finished result, which may
+    belong to an earlier frame; `result_frame_id` and `result_timestamp_ms`
+    identify the frame it was computed on.
+    """
+    
+    def __init__(
+        self,
+        max_num_hands: int = 2,
+        min_detection_confidence: float = 0.5,
+        min_tracking_confidence: float = 0.5,
+        model_path: Optional[str] = None
+    ):
+        """
+        Initialize the live stream hand landmarker.
+        
+        Args:
+            max_num_hands: Maximum number of hands to detect
+            min_detection_confidence: Minimum confidence for hand detection
+            min_tracking_confidence: Minimum confidence for hand tracking
+            model_path: Path of hand_landmarker.task (default: from the model registry)
+        """
+        self.model_path = model_path
+        
+        # Submitted frames waiting for a result, keyed by timestamp
+        self._pending = {}
+        self._result_ready = threading.Condition()
+        self._latest_results = build_hand_results([])
+        self._last_timestamp_ms = -1
+        
+        self.frame_id = -1
+        self.result_frame_id = -1
+        self.result_timestamp_ms = -1
+        
+        # LIVE_STREAM graphs cannot be shared through the inference server
+        super().__init__(
+            static_image_mode=False,
+            max_num_hands=max_num_hands,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence,
+            use_server=False
+        )
+    
+    def _create_hands(self) -> object:
+        """Build the HandLandmarker task with this detector's result callback."""
+        vision = mp.tasks.vision
+        options = vision.HandLandmarkerOptions(
+            base_options=mp.tasks.BaseOptions(
+                model_asset_path=self.model_path or resolve_model('hand-landmarker')
+            ),
+            running_mode=vision.RunningMode.LIVE_STREAM,
+            num_hands=self.hands_options['max_num_hands'],
+            min_hand_detection_confidence=self.hands_options['min_detection_confidence'],
+            min_tracking_confidence=self.hands_options['min_tracking_confidence'],
+            result_callback=self._on_result
+        )
+        return vision.HandLandmarker.create_from_options(options)
+    
+    def _on_result(self, result: object, output_image: object, timestamp_ms: int):
+        """Store a finished result and match it back to its frame (MediaPipe thread)."""
+        hands = [
+            {
+                'label': handedness[0].category_name,
+                'score': handedness[0].score,
+                'landmarks': [[lm.x, lm.y, lm.z] for lm in landmarks]
+            }
+            for landmarks, handedness in zip(result.hand_landmarks, result.handedness)
+        ]
+        results = build_hand_results(hands)
+        
+        with self._result_ready:
+            self._latest_results = results
+            self.result_timestamp_ms = timestamp_ms
+            self.result_frame_id = self._pending.pop(timestamp_ms, -1)
+            # Frames submitted before this one were skipped by the graph
+            for stale in [ts for ts in self._pending if ts < timestamp_ms]:
+                del self._pending[stale]
+            self._result_ready.notify_all()
+    
+    @property
+    def latency_frames(self) -> int:
+        """How many frames the newest result lags behind the newest submitted frame."""
+        return self.frame_id - self.result_frame_id
+    
+    def process(
+        self,
+        image: np.ndarray,
+        image_rgb: Optional[np.ndarray] = None,
+        wait: bool = False
+    ) -> object:
+        """
+        Submit a BGR image and return the newest finished result.
+        
+        Args:
+            image: Input image in BGR format
+            image_rgb: Optional RGB conversion of `image` that is already available
+            wait: Block until the result for this image is ready (up to one second)
+            
+        Returns:
+            MediaPipe-compatible results object (empty until the first result arrives)
+        """
+        if image_rgb is None:
+            if self._rgb_buffer is None or self._rgb_buffer.shape != image.shape:
+                self._rgb_buffer = np.empty_like(image)
+            image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB, dst=self._rgb_buffer)
+        
+        # mp.Image copies the pixels, so the RGB buffer can be reused right away
+        mp_image = mp.Image(image_format=mp.ImageFormat.SRGB, data=image_rgb)
+        
+        # Timestamps must strictly increase
+        timestamp_ms = max(int(time.monotonic() * 1000), self._last_timestamp_ms + 1)
+        self._last_timestamp_ms = timestamp_ms
+        
+        with self._result_ready:
+            self.frame_id += 1
+            self._pending[timestamp_ms] = self.frame_id
+        self.hands.detect_async(mp_image, timestamp_ms)
+        
+        with self._result_ready:
+            if wait:
+                self._result_ready.wait_for(lambda: self.result_timestamp_ms >= timestamp_ms, timeout=1.0)
+            return self._latest_results
 
 
 class TextToSpeech:
@@ -241,66 +524,303 @@ class TextToSpeech:
 class SentenceManager:
     """
     Manages sentence display and word progression.
+    
+    Text can come from a string, a memory-mapped file that is tokenized only as
+    far as it has been read, and text streamed in at runtime. Display work is
+    limited to a window around the current word, so it does not grow with the
+    length of the document.
     """
     
-    def __init__(self, sentence: str, tts: TextToSpeech):
+    def __init__(self, sentence: str, tts: TextToSpeech, display_chars: int = 100):
         """
         Initialize sentence manager.
         
         Args:
             sentence: The sentence to display word by word
             tts: TextToSpeech instance
+            display_chars: Approximate number of characters shown around the current word
         """
         self.words = sentence.split()
         self.current_word_index = 0
         self.tts = tts
         self.sentence = sentence
+        self.display_chars = display_chars
+        
+        # Bumped on every state change so cached renderings know when to refresh
+        self.revision = 0
+        
+        # Word sources not yet tokenized, consumed in order
+        self._sources = deque()
+        self._file = None
+        self._mmap = None
+    
+    @classmethod
+    def from_file(
+        cls,
+        path: str,
+        tts: TextToSpeech,
+        encoding: str = 'utf-8',
+        display_chars: int = 100
+    ) -> 'SentenceManager':
+        """
+        Create a sentence manager that reads a (possibly very large) text file lazily.
+        
+        Args:
+            path: Path of the text file
+            tts: TextToSpeech instance
+            encoding: Text encoding of the file
+            display_chars: Approximate number of characters shown around the current word
+            
+        Returns:
+            SentenceManager backed by a memory map of the file
+        """
+        manager = cls("", tts, display_chars)
+        manager._file = open(path, 'rb')
+        if os.fstat(manager._file.fileno()).st_size > 0:
+            manager._mmap = mmap.mmap(manager._file.fileno(), 0, access=mmap.ACCESS_READ)
+            manager._sources.append(
+                match.group().decode(encoding, errors='replace')
+                for match in re.finditer(rb'\S+', manager._mmap)
+            )
+        return manager
+    
+    def append_text(self, text: str):
+        """
+        Append streamed text after everything already loaded.
+        
+        Args:
+            text: Text chunk; chunks are assumed to break at word boundaries
+        """
+        if self._sources:
+            self._sources.append(iter(text.split()))
+        else:
+            self.words.extend(text.split())
+        self.revision += 1
+    
+    def _fill(self, count: int):
+        """Tokenize pending text until at least `count` words are known (if available)."""
+        while len(self.words) < count and self._sources:
+            try:
+                self.words.append(next(self._sources[0]))
+            except StopIteration:
+                self._sources.popleft()
     
     def get_current_word(self) -> str:
         """Get the current word."""
+        self._fill(self.current_word_index + 1)
         if self.current_word_index < len(self.words):
             return self.words[self.current_word_index]
         return ""
     
     def get_display_text(self) -> str:
-        """Get the full sentence with current word highlighted."""
-        if self.current_word_index >= len(self.words):
-            return self.sentence
-        
-        display_words = []
-        for i, word in enumerate(self.words):
-            if i == self.current_word_index:
-                display_words.append(f"[{word}]")
-            else:
-                display_words.append(word)
+        """Get the text around the current word, with the current word highlighted."""
+        index = self.current_word_index
+        self._fill(index + 1)
         
-        return " ".join(display_words)
+        if index >= len(self.words):
+            # Complete: show the end of the text
+            return " ".join(self.words[self._extend_back(len(self.words), self.display_chars):])
+        
+        budget = self.display_chars - len(self.words[index]) - 2
+        
+        # Words before the current one get a third of the space...
+        before_budget = budget // 3
+        start = self._extend_back(index, before_budget)
+        
+        # ...words after it get the rest, including what the start left over
+        after_budget = budget - sum(len(word) + 1 for word in self.words[start:index])
+        end = index + 1
+        while True:
+            self._fill(end + 1)
+            if end >= len(self.words) or len(self.words[end]) + 1 > after_budget:
+                break
+            after_budget -= len(self.words[end]) + 1
+            end += 1
+        
+        # ...and anything still unused goes back to the start (short texts show in full)
+        start = self._extend_back(start, after_budget)
+        
+        return " ".join(self.words[start:index] + [f"[{self.words[index]}]"] + self.words[index + 1:end])
+    
+    def _extend_back(self, start: int, budget: int) -> int:
+        """Move `start` back over as many words as fit in `budget` characters."""
+        while start > 0 and len(self.words[start - 1]) + 1 <= budget:
+            budget -= len(self.words[start - 1]) + 1
+            start -= 1
+        return start
+    
+    def get_progress_text(self) -> str:
+        """Get the word progress, with '+' while the total is not known yet."""
+        more = "+" if self._sources else ""
+        return f"Word: {self.current_word_index}/{len(self.words)}{more}"
     
     def next_word(self):
         """Move to next word and speak it."""
-        if self.current_word_index < len(self.words):
-            current_word = self.words[self.current_word_index]
-            print(f"Speaking word {self.current_word_index + 1}/{len(self.words)}: {current_word}")
+        current_word = self.get_current_word()
+        if current_word:
+            print(f"Speaking word {self.current_word_index + 1}: {current_word}")
             self.tts.speak(current_word)
             self.current_word_index += 1
+            self.revision += 1
     
     def reset(self):
         """Reset to the beginning."""
         self.current_word_index = 0
+        self.revision += 1
         print("Reset to beginning of sentence")
     
     def is_complete(self) -> bool:
         """Check if all words have been spoken."""
+        self._fill(self.current_word_index + 1)
         return self.current_word_index >= len(self.words)
+    
+    def close(self):
+        """Release the memory-mapped file, if any."""
+        self._sources.clear()
+        if self._mmap is not None:
+            self._mmap.close()
+            self._mmap = None
+        if self._file is not None:
+            self._file.close()
+            self._file = None
+
+
+SENTENCE_PANEL_HEIGHT = 120
+
+# Sentence lines that fit above the progress text
+SENTENCE_PANEL_LINES = 2
+SENTENCE_LINE_CHARS = 50
 
 
-def main():
-    """Main function to run hand keypoint detection from webcam."""
+def render_hud_sprite(hands_data: list) -> Sprite:
+    """
+    Render the hand count and per-hand keypoint lines.
+    
+    Args:
+        hands_data: List of hand data from get_keypoint_coordinates
+        
+    Returns:
+        Transparent sprite positioned at the top-left of the frame
+    """
+    lines = [(f"Hands detected: {len(hands_data)}", 30, 1, (0, 255, 0))]
+    for i, hand_data in enumerate(hands_data):
+        hand_info = f"{hand_data['hand']}: {len(hand_data['keypoints'])} keypoints"
+        lines.append((hand_info, 70 + 30 * i, 0.6, (255, 255, 0)))
+    
+    width = max(
+        cv2.getTextSize(text, cv2.FONT_HERSHEY_SIMPLEX, scale, 2)[0][0]
+        for text, _, scale, _ in lines
+    ) + 20
+    height = lines[-1][1] + 15
+    
+    canvas = Sprite.canvas(width, height)
+    for text, y, scale, color in lines:
+        cv2.putText(canvas, text, (10, y), cv2.FONT_HERSHEY_SIMPLEX, scale, (*color, 255), 2)
+    return Sprite(canvas)
+
+
+def wrap_sentence_lines(
+    text: str,
+    max_chars_per_line: int = SENTENCE_LINE_CHARS,
+    max_lines: int = SENTENCE_PANEL_LINES
+) -> List[str]:
+    """
+    Wrap the sentence window into the lines that fit the sentence panel.
+    
+    Args:
+        text: Display text, with the current word in [brackets]
+        max_chars_per_line: Line width in characters
+        max_lines: Number of lines shown
+        
+    Returns:
+        At most `max_lines` lines, starting at the line with the current word
+        (or the last lines once the sentence is complete)
+    """
+    lines = []
+    current_line = []
+    
+    for word in text.split():
+        test_line = " ".join(current_line + [word])
+        if len(test_line) <= max_chars_per_line:
+            current_line.append(word)
+        else:
+            if current_line:
+                lines.append(" ".join(current_line))
+            current_line = [word]
+    
+    if current_line:
+        lines.append(" ".join(current_line))
+    
+    if len(lines) <= max_lines:
+        return lines
+    
+    current = next((i for i, line in enumerate(lines) if '[' in line), len(lines))
+    start = max(0, min(current, len(lines) - max_lines))
+    return lines[start:start + max_lines]
+
+
+def render_sentence_panel(sentence_manager: SentenceManager, width: int) -> Sprite:
+    """
+    Render the sentence panel with the current word highlighted.
+    
+    Args:
+        sentence_manager: Provides the sentence and progress
+        width: Frame width
+        
+    Returns:
+        Opaque sprite of height SENTENCE_PANEL_HEIGHT
+    """
+    height = SENTENCE_PANEL_HEIGHT
+    canvas = Sprite.canvas(width, height, (0, 0, 0))
+    cv2.rectangle(canvas, (0, 0), (width, height), (255, 255, 255, 255), 2)
+    
+    # Display sentence (split into multiple lines if needed)
+    lines = wrap_sentence_lines(sentence_manager.get_display_text())
+    
+    line_y = height - 80
+    for line in lines:
+        cv2.putText(canvas, line, (10, line_y), cv2.FONT_HERSHEY_SIMPLEX,
+                    0.7, (255, 255, 255, 255), 2)
+        line_y += 30
+    
+    # Display progress
+    progress_text = sentence_manager.get_progress_text()
+    cv2.putText(canvas, progress_text, (10, height - 15), cv2.FONT_HERSHEY_SIMPLEX,
+                0.6, (0, 255, 255, 255), 2)
+    
+    # Display completion status
+    if sentence_manager.is_complete():
+        cv2.putText(canvas, "COMPLETE - Press 'r' to reset", (width - 400, height - 15),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (0, 255, 0, 255), 2)
+    
+    return Sprite(canvas)
+
+
+def main(
+    text_path: Optional[str] = None,
+    live_stream: bool = False,
+    inference_ratio: int = 1,
+    idle_after: float = 10.0,
+    publish: bool = False
+):
+    """
+    Main function to run hand keypoint detection from webcam.
+    
+    Args:
+        text_path: Optional text file (e.g. a lecture script) to step through instead of the demo sentence
+        live_stream: Use the asynchronous MediaPipe Tasks HandLandmarker
+        inference_ratio: Displayed frames per landmark inference; landmarks are
+            smoothed and predicted in between
+        idle_after: Seconds without hands before dropping to low-power idle mode (0 disables it)
+        publish: Publish landmarks every frame on the shared-memory keypoint stream
+    """
     print("Hand Keypoint Detection Program with TTS")
     print("==========================================")
+    configure_runtime(['hands'])
     print("Controls:")
     print("  - Press 'q' to quit")
     print("  - Press 's' to save current frame")
+    print("  - Press 'v' to start/stop recording the session")
     print("  - Press 'l' to toggle labels")
     print("  - Press 'k' to toggle enhanced keypoints")
     print("  - Press SPACE to advance to next word and speak it")
@@ -311,21 +831,37 @@ def main():
     tts = TextToSpeech()
     
     # Initialize sentence manager
-    sentence = "Hello my name is John and I am a student in Durham University"
-    sentence_tts = "Hello my name is J O H N and I am a student in D U R H A M University"
-    sentence_manager = SentenceManager(sentence_tts, tts)
-    
-    print(f"Sentence: {sentence}")
-    print(f"Total words: {len(sentence_manager.words)}")
+    if text_path:
+        sentence_manager = SentenceManager.from_file(text_path, tts)
+        print(f"Text file: {text_path}")
+    else:
+        sentence = "Hello my name is John and I am a student in Durham University"
+        sentence_tts = "Hello my name is J O H N and I am a student in D U R H A M University"
+        sentence_manager = SentenceManager(sentence_tts, tts)
+        
+        print(f"Sentence: {sentence}")
+        print(f"Total words: {len(sentence_manager.words)}")
     print()
     
     # Initialize detector
-    detector = HandKeypointDetector(
-        static_image_mode=False,
-        max_num_hands=2,
-        min_detection_confidence=0.7,
-        min_tracking_confidence=0.5
-    )
+    if live_stream:
+        # Landmarks are computed while the next frame is captured and rendered
+        detector = LiveStreamHandDetector(
+            max_num_hands=2,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.5
+        )
+    else:
+        detector = HandKeypointDetector(
+            static_image_mode=False,
+            max_num_hands=2,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.5
+        )
+    
+    # Smooths landmark jitter and fills skipped frames with predictions
+    from landmark_filter import LandmarkPredictor
+    predictor = LandmarkPredictor(detector, inference_ratio=inference_ratio)
     
     # Open webcam
     cap = cv2.VideoCapture(0)
@@ -335,160 +871,130 @@ def main():
         return
     
     # Set camera resolution
-    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
-    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+    set_capture_size(cap, 1280, 720)
+    
+    # Low resolution, low frame rate presence checks while nobody is signing
+    idle_monitor = IdleMonitor(idle_after=idle_after)
+    
+    # Landmarks for external consumers (avatar renderer, logging)
+    publisher = None
+    if publish:
+        from keypoint_stream import KeypointPublisher
+        try:
+            publisher = KeypointPublisher()
+            print(f"Publishing keypoints on shared memory stream '{publisher.name}'")
+        except FileExistsError as e:
+            print(f"Error: {e} - keypoints will not be published")
     
     show_labels = True
     show_enhanced = False
     frame_count = 0
     saved_count = 0
     
+    # Cached HUD and sentence panel sprites
+    overlay = OverlayLayer()
+    
+    # Screenshots and session recordings are encoded on a background thread
+    recorder = FrameRecorder()
+    recording_count = 0
+    
+    # Capture and mirror buffers are allocated once and reused for every frame
+    raw_frame = None
+    frame = None
+    
     print("Starting camera... Press 'q' to quit")
     
     while True:
-        success, frame = cap.read()
+        success, raw_frame = cap.read(raw_frame)
         
         if not success:
             print("Error: Could not read frame")
             break
         
         # Flip frame horizontally to mirror the camera (more natural for user)
-        frame = cv2.flip(frame, 1)
-        
-        frame_count += 1
-        
-        # Detect hands
-        annotated_frame, results = detector.detect_hands(frame)
+        frame = cv2.flip(raw_frame, 1, dst=frame)
         
-        # Get keypoint data
-        hands_data = detector.get_keypoint_coordinates(results, frame.shape)
-        
-        # Use enhanced visualization if enabled
-        if show_enhanced and hands_data:
-            annotated_frame = detector.draw_enhanced_keypoints(
-                frame,
-                hands_data,
-                show_labels=show_labels
-            )
-        
-        # Display information on frame
-        info_text = f"Hands detected: {len(hands_data)}"
-        cv2.putText(
-            annotated_frame,
-            info_text,
-            (10, 30),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            1,
-            (0, 255, 0),
-            2
-        )
-        
-        # Display keypoint count for each hand
-        y_offset = 70
-        for hand_data in hands_data:
-            hand_info = f"{hand_data['hand']}: {len(hand_data['keypoints'])} keypoints"
-            cv2.putText(
-                annotated_frame,
-                hand_info,
-                (10, y_offset),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.6,
-                (255, 255, 0),
-                2
-            )
-            y_offset += 30
-        
-        # Display sentence with current word highlighted
-        sentence_display = sentence_manager.get_display_text()
-        
-        # Add background rectangle for better text visibility
-        text_bg_height = 120
-        cv2.rectangle(
-            annotated_frame,
-            (0, annotated_frame.shape[0] - text_bg_height),
-            (annotated_frame.shape[1], annotated_frame.shape[0]),
-            (0, 0, 0),
-            -1
-        )
-        cv2.rectangle(
-            annotated_frame,
-            (0, annotated_frame.shape[0] - text_bg_height),
-            (annotated_frame.shape[1], annotated_frame.shape[0]),
-            (255, 255, 255),
-            2
-        )
-        
-        # Display sentence (split into multiple lines if needed)
-        max_chars_per_line = 50
-        words_in_display = sentence_display.split()
-        lines = []
-        current_line = []
-        
-        for word in words_in_display:
-            test_line = " ".join(current_line + [word])
-            if len(test_line) <= max_chars_per_line:
-                current_line.append(word)
-            else:
-                if current_line:
-                    lines.append(" ".join(current_line))
-                current_line = [word]
-        
-        if current_line:
-            lines.append(" ".join(current_line))
-        
-        # Display lines
-        line_y = annotated_frame.shape[0] - 80
-        for line in lines:
-            cv2.putText(
+        if idle_monitor.idle:
+            # Hand detection only runs when the cheap presence check fires
+            if idle_monitor.should_check_hands(frame) and detector.process(frame).multi_hand_landmarks:
+                idle_monitor.wake()
+                set_capture_size(cap, 1280, 720)
+                continue
+            
+            cv2.putText(frame, "Idle - show your hands to start", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.5, (0, 255, 255), 1)
+            annotated_frame = frame
+            key_delay_ms = idle_monitor.idle_delay_ms
+        else:
+            frame_count += 1
+            
+            # Detect (or predict) hands, drawing straight onto the mirrored frame
+            results = predictor.process(frame)
+            annotated_frame = frame
+            if not show_enhanced:
+                draw_hand_landmarks(annotated_frame, results)
+            
+            # Get keypoint data
+            hands_data = detector.get_keypoint_coordinates(results, frame.shape)
+            
+            if publisher is not None:
+                publisher.publish(results, frame_count)
+            
+            if idle_monitor.update(bool(hands_data)):
+                set_capture_size(cap, *idle_monitor.idle_size)
+            
+            # Use enhanced visualization if enabled
+            if show_enhanced and hands_data:
+                annotated_frame = detector.draw_enhanced_keypoints(
+                    frame,
+                    hands_data,
+                    show_labels=show_labels,
+                    in_place=True
+                )
+            
+            # Draw the HUD and sentence panel from cached sprites; they are only
+            # re-rendered when the hands shown or the sentence state change
+            hud_key = tuple((hand_data['hand'], len(hand_data['keypoints'])) for hand_data in hands_data)
+            overlay.draw(annotated_frame, 'hud', hud_key, lambda: render_hud_sprite(hands_data))
+            
+            frame_height, frame_width = annotated_frame.shape[:2]
+            overlay.draw(
                 annotated_frame,
-                line,
-                (10, line_y),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.7,
-                (255, 255, 255),
-                2
+                'sentence_panel',
+                (sentence_manager.revision, frame_width),
+                lambda: render_sentence_panel(sentence_manager, frame_width),
+                0,
+                frame_height - SENTENCE_PANEL_HEIGHT
             )
-            line_y += 30
-        
-        # Display progress
-        progress_text = f"Word: {sentence_manager.current_word_index}/{len(sentence_manager.words)}"
-        cv2.putText(
-            annotated_frame,
-            progress_text,
-            (10, annotated_frame.shape[0] - 15),
-            cv2.FONT_HERSHEY_SIMPLEX,
-            0.6,
-            (0, 255, 255),
-            2
-        )
+            key_delay_ms = 1
         
-        # Display completion status
-        if sentence_manager.is_complete():
-            completion_text = "COMPLETE - Press 'r' to reset"
-            cv2.putText(
-                annotated_frame,
-                completion_text,
-                (annotated_frame.shape[1] - 400, annotated_frame.shape[0] - 15),
-                cv2.FONT_HERSHEY_SIMPLEX,
-                0.6,
-                (0, 255, 0),
-                2
-            )
+        # Queue the frame for the session recording (no-op when not recording)
+        recorder.write(annotated_frame)
         
         # Show frame
         cv2.imshow('Hand Keypoint Detection', annotated_frame)
         
-        # Handle key presses
-        key = cv2.waitKey(1) & 0xFF
+        # Handle key presses (the same keys work while idle)
+        key = cv2.waitKey(key_delay_ms) & 0xFF
+        
+        if key != 0xFF and idle_monitor.idle:
+            # Someone is at the keyboard: resume full rate
+            idle_monitor.wake(reason="Key pressed")
+            set_capture_size(cap, 1280, 720)
         
         if key == ord('q'):
             print("Quitting...")
             break
         elif key == ord('s'):
             filename = f"hand_keypoints_{saved_count:03d}.jpg"
-            cv2.imwrite(filename, annotated_frame)
-            print(f"Saved: {filename}")
-            saved_count += 1
+            if recorder.screenshot(annotated_frame, filename):
+                print(f"Saved: {filename}")
+                saved_count += 1
+            else:
+                print("Screenshot dropped: writer is busy")
+        elif key == ord('v'):
+            if recorder.toggle_recording(f"hand_session_{recording_count:03d}.mp4"):
+                recording_count += 1
         elif key == ord('l'):
             show_labels = not show_labels
             print(f"Labels: {'ON' if show_labels else 'OFF'}")
@@ -507,11 +1013,36 @@ def main():
     cap.release()
     cv2.destroyAllWindows()
     detector.close()
+    sentence_manager.close()
+    recorder.close()
+    if publisher is not None:
+        publisher.close()
     
     print(f"\nProcessed {frame_count} frames")
+    print(f"Landmark inference on {predictor.inference_rate:.0%} of frames "
+          f"({predictor.forced_inferences} forced by the error bound)")
+    print(idle_monitor.summary())
     print(f"Saved {saved_count} images")
     print("Program ended successfully")
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Hand keypoint detection with TTS")
+    parser.add_argument('text_path', nargs='?', help="Text file to step through instead of the demo sentence")
+    parser.add_argument('--live-stream', action='store_true',
+                        help="Run the MediaPipe Tasks HandLandmarker asynchronously (LIVE_STREAM mode)")
+    parser.add_argument('--inference-ratio', type=int, default=1,
+                        help="Displayed frames per landmark inference, e.g. 2 for 15 Hz inference at 30 fps")
+    parser.add_argument('--idle-after', type=float, default=10.0,
+                        help="Seconds without hands before entering low-power idle mode (0 disables it)")
+    parser.add_argument('--publish', action='store_true',
+                        help="Publish landmarks on the shared-memory keypoint stream (see keypoint_stream.py)")
+    args = parser.parse_args()
+    main(
+        args.text_path,
+        live_stream=args.live_stream,
+        inference_ratio=args.inference_ratio,
+        idle_after=args.idle_after,
+        publish=args.publish
+    )
@@ -0,0 +1,182 @@
+"""
+Idle Low-Power Mode
+Tracks whether anyone is signing in front of the camera. After a stretch with
+no hands the interpreter drops to a low capture resolution and frame rate and
+only runs a cheap presence check (frame differencing on a tiny grayscale
+thumbnail); hand detection is run only when something moves, or once in a
+while in case someone is standing still. As soon as hands show up the
+interpreter returns to full rate on the next frame.
+
+Idle time and time-to-wake are recorded as metrics. Time-to-wake runs from the
+first idle frame of the motion (or hand check) that led to waking up until the
+next full-rate frame, so it includes the low idle frame rate and the hand
+checks it took to notice someone.
+"""
+
+import time
+import cv2
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+def set_capture_size(cap: cv2.VideoCapture, width: int, height: int):
+    """Request a capture resolution."""
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+
+class IdleMonitor:
+    """
+    Idle/active state machine with a cheap presence check and wake metrics.
+    """
+
+    def __init__(
+        self,
+        idle_after: float = 10.0,
+        idle_fps: float = 5.0,
+        idle_size: Tuple[int, int] = (320, 240),
+        motion_threshold: float = 0.02,
+        check_interval: float = 1.0
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            idle_after: Seconds without hands before going idle (0 disables idling)
+            idle_fps: Frame rate while idle
+            idle_size: Capture resolution (width, height) while idle
+            motion_threshold: Fraction of thumbnail pixels that must change to count as motion
+            check_interval: Seconds between hand checks while idle even without motion
+        """
+        self.idle_after = idle_after
+        self.idle_fps = idle_fps
+        self.idle_size = idle_size
+        self.motion_threshold = motion_threshold
+        self.check_interval = check_interval
+
+        self.idle = False
+        self.last_hands_time = time.perf_counter()
+        self.idle_since = None
+        self.last_check_time = 0.0
+        self.activity_since = None
+        self.wake_started = None
+
+        # Metrics
+        self.idle_periods = 0
+        self.total_idle_seconds = 0.0
+        self.wake_times: List[float] = []
+
+        # Presence check buffers, reused while idle
+        self._thumbnail = None
+        self._gray = None
+        self._previous = None
+        self._diff = None
+
+    @property
+    def idle_delay_ms(self) -> int:
+        """cv2.waitKey delay that caps the idle frame rate."""
+        return max(1, int(1000 / self.idle_fps))
+
+    def update(self, hands_present: bool, now: Optional[float] = None) -> bool:
+        """
+        Record an active-mode frame.
+
+        Args:
+            hands_present: Whether hands were detected in the frame
+            now: Current time in seconds (default: time.perf_counter())
+
+        Returns:
+            True if the caller should switch to idle mode now
+        """
+        if now is None:
+            now = time.perf_counter()
+
+        if self.wake_started is not None:
+            # First full-rate frame after waking
+            self.wake_times.append(now - self.wake_started)
+            self.wake_started = None
+
+        if hands_present:
+            self.last_hands_time = now
+            return False
+        if self.idle_after > 0 and now - self.last_hands_time >= self.idle_after:
+            self.enter_idle(now)
+            return True
+        return False
+
+    def enter_idle(self, now: Optional[float] = None):
+        """Switch to idle mode."""
+        if now is None:
+            now = time.perf_counter()
+        self.idle = True
+        self.idle_since = now
+        self.last_check_time = now
+        self.idle_periods += 1
+        self.activity_since = None
+        self._previous = None
+        print("No hands for a while: entering low-power idle mode")
+
+    def should_check_hands(self, frame: np.ndarray, now: Optional[float] = None) -> bool:
+        """
+        Cheap presence check for an idle-mode frame.
+
+        Args:
+            frame: Captured BGR frame
+            now: Current time in seconds (default: time.perf_counter())
+
+        Returns:
+            True if something moved (or the periodic check is due) and hand detection should run
+        """
+        if now is None:
+            now = time.perf_counter()
+
+        self._thumbnail = cv2.resize(frame, (80, 60), dst=self._thumbnail, interpolation=cv2.INTER_AREA)
+        self._gray = cv2.cvtColor(self._thumbnail, cv2.COLOR_BGR2GRAY, dst=self._gray)
+
+        if self._previous is None:
+            self._previous = self._gray.copy()
+            return False
+
+        self._diff = cv2.absdiff(self._gray, self._previous, dst=self._diff)
+        np.copyto(self._previous, self._gray)
+        moved = np.count_nonzero(self._diff > 25) > self.motion_threshold * self._diff.size
+
+        if moved or now - self.last_check_time >= self.check_interval:
+            # Keep the start of an ongoing stretch of motion for the time-to-wake
+            if self.activity_since is None:
+                self.activity_since = now
+            self.last_check_time = now
+            return True
+        self.activity_since = None
+        return False
+
+    def wake(self, now: Optional[float] = None, reason: str = "Hands detected"):
+        """
+        Leave idle mode because hands were seen (or a key was pressed).
+
+        The time from the first idle frame that showed the activity (see
+        should_check_hands) until the next full-rate frame is recorded as the
+        time-to-wake.
+        """
+        if now is None:
+            now = time.perf_counter()
+        self.idle = False
+        self.total_idle_seconds += now - self.idle_since
+        self.idle_since = None
+        self.last_hands_time = now
+        self.wake_started = self.activity_since if self.activity_since is not None else now
+        self.activity_since = None
+        print(f"{reason}: resuming full rate")
+
+    def summary(self, now: Optional[float] = None) -> str:
+        """Human-readable idle metrics."""
+        if now is None:
+            now = time.perf_counter()
+        idle_seconds = self.total_idle_seconds
+        if self.idle_since is not None:
+            idle_seconds += now - self.idle_since
+        text = f"Idle {idle_seconds:.1f}s over {self.idle_periods} periods"
+        if self.wake_times:
+            wake_ms = np.array(self.wake_times) * 1000
+            text += f", time-to-wake mean {wake_ms.mean():.0f} ms / max {wake_ms.max():.0f} ms"
+        return text
@@ -0,0 +1,393 @@
+"""
+Shared Inference Server
+A long-lived local process that holds the YOLO and MediaPipe models and serves
+frames to several VisionAssistant / HandKeypointDetector clients over a Unix
+socket. YOLO requests from all clients are micro-batched together.
+
+Run with:  python src/inference_server.py
+"""
+
+import argparse
+import json
+import os
+import queue
+import socket
+import struct
+import tempfile
+import threading
+import time
+import numpy as np
+from typing import List, Optional, Tuple
+
+
+DEFAULT_SOCKET_PATH = os.environ.get(
+    'BRIDGING_WORLDS_SOCKET',
+    os.path.join(tempfile.gettempdir(), 'bridging-worlds-inference.sock')
+)
+
+# Message framing: header length, payload length, then JSON header and raw payload
+_FRAME_HEADER = struct.Struct('!II')
+
+
+def _recv_exact(sock: socket.socket, size: int) -> bytearray:
+    """Receive exactly `size` bytes from a socket."""
+    buffer = bytearray(size)
+    view = memoryview(buffer)
+    received = 0
+    while received < size:
+        n = sock.recv_into(view[received:], size - received)
+        if n == 0:
+            raise ConnectionError("Connection closed")
+        received += n
+    return buffer
+
+
+def send_message(sock: socket.socket, header: dict, payload: Optional[np.ndarray] = None):
+    """
+    Send a JSON header followed by an optional raw array payload.
+
+    Args:
+        sock: Connected socket
+        header: JSON-serializable message header
+        payload: Optional array sent as raw bytes without an extra copy
+    """
+    if payload is not None:
+        payload = np.ascontiguousarray(payload)
+        header = dict(header, shape=list(payload.shape), dtype=str(payload.dtype))
+        payload_view = memoryview(payload).cast('B')
+    else:
+        payload_view = memoryview(b'')
+
+    header_bytes = json.dumps(header).encode('utf-8')
+    sock.sendall(_FRAME_HEADER.pack(len(header_bytes), len(payload_view)) + header_bytes)
+    if len(payload_view):
+        sock.sendall(payload_view)
+
+
+def recv_message(sock: socket.socket) -> Tuple[dict, Optional[np.ndarray]]:
+    """
+    Receive a message sent by send_message.
+
+    Returns:
+        Tuple of (header, payload array or None)
+    """
+    header_len, payload_len = _FRAME_HEADER.unpack(_recv_exact(sock, _FRAME_HEADER.size))
+    header = json.loads(_recv_exact(sock, header_len).decode('utf-8'))
+    if not payload_len:
+        return header, None
+
+    payload = np.frombuffer(_recv_exact(sock, payload_len), dtype=header['dtype'])
+    return header, payload.reshape(header['shape'])
+
+
+class _DetectRequest:
+    """A pending YOLO request waiting for its batch to run."""
+
+    __slots__ = ('frame', 'conf', 'event', 'result', 'error')
+
+    def __init__(self, frame: np.ndarray, conf: float):
+        self.frame = frame
+        self.conf = conf
+        self.event = threading.Event()
+        self.result = None
+        self.error = None
+
+
+class InferenceServer:
+    """
+    Serves YOLO object detection and MediaPipe hand landmarks to local clients.
+    """
+
+    def __init__(
+        self,
+        socket_path: str = DEFAULT_SOCKET_PATH,
+        max_batch: int = 8,
+        batch_timeout: float = 0.005
+    ):
+        """
+        Initialize the server.
+
+        Args:
+            socket_path: Filesystem path of the Unix socket to listen on
+            max_batch: Maximum number of frames per YOLO batch
+            batch_timeout: Seconds to wait for more frames before running a batch
+        """
+        self.socket_path = socket_path
+        self.max_batch = max_batch
+        self.batch_timeout = batch_timeout
+
+        self.model = None
+        self._requests = queue.Queue()
+        self._running = False
+        self._listener = None
+        self._socket_inode = None
+
+    def load_models(self):
+        """Load the shared YOLO model."""
+        from detectors import load_yolo_model
+
+        self.model = load_yolo_model()
+
+    def serve_forever(self):
+        """Accept client connections until stopped."""
+        if not hasattr(socket, 'AF_UNIX'):
+            raise RuntimeError("Unix sockets are not available on this platform")
+        self._remove_stale_socket()
+        if self.model is None:
+            self.load_models()
+
+        self._listener = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self._listener.bind(self.socket_path)
+        os.chmod(self.socket_path, 0o600)
+        self._socket_inode = os.stat(self.socket_path).st_ino
+        self._listener.listen()
+        self._running = True
+
+        threading.Thread(target=self._batch_loop, daemon=True).start()
+        print(f"Inference server listening on {self.socket_path}")
+
+        try:
+            while self._running:
+                try:
+                    conn, _ = self._listener.accept()
+                except OSError:
+                    break
+                threading.Thread(target=self._handle_client, args=(conn,), daemon=True).start()
+        finally:
+            self.stop()
+
+    def _remove_stale_socket(self):
+        """
+        Remove a socket file left behind by a server that is no longer running.
+
+        Raises RuntimeError if a server is still listening on the path.
+        """
+        probe = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        try:
+            probe.connect(self.socket_path)
+        except FileNotFoundError:
+            return
+        except ConnectionRefusedError:
+            # Nobody is listening: the file is stale
+            os.unlink(self.socket_path)
+            return
+        finally:
+            probe.close()
+        raise RuntimeError(f"An inference server is already listening on {self.socket_path}")
+
+    def stop(self):
+        """Stop accepting clients and remove the socket file this server created."""
+        self._running = False
+        if self._listener is not None:
+            self._listener.close()
+            self._listener = None
+        if self._socket_inode is not None:
+            try:
+                # Leave the path alone if another server has replaced it since
+                if os.stat(self.socket_path).st_ino == self._socket_inode:
+                    os.unlink(self.socket_path)
+            except FileNotFoundError:
+                pass
+            self._socket_inode = None
+
+    def _handle_client(self, conn: socket.socket):
+        """Serve one client connection."""
+        # MediaPipe keeps tracking state between frames, so each client gets its own graph
+        hands = None
+        try:
+            while True:
+                try:
+                    header, frame = recv_message(conn)
+                except (ConnectionError, OSError):
+                    break
+
+                op = header.get('op')
+                try:
+                    if op == 'info':
+                        reply = {'names': {str(k): v for k, v in self.model.names.items()}}
+                    elif op == 'detect':
+                        reply = {'detections': self._detect(frame, header.get('conf', 0.5))}
+                    elif op == 'hands':
+                        if hands is None:
+                            hands = self._create_hands(header)
+                        reply = {'hands': self._detect_hands(hands, frame)}
+                    else:
+                        reply = {'error': f"Unknown operation: {op}"}
+                except Exception as e:
+                    reply = {'error': str(e)}
+
+                send_message(conn, reply)
+        finally:
+            if hands is not None:
+                hands.close()
+            conn.close()
+
+    def _detect(self, frame: np.ndarray, conf: float) -> List[list]:
+        """Queue a frame for the next YOLO batch and wait for its result."""
+        request = _DetectRequest(frame, conf)
+        self._requests.put(request)
+        request.event.wait()
+        if request.error is not None:
+            raise request.error
+        return request.result
+
+    def _batch_loop(self):
+        """Collect pending YOLO requests into micro-batches and run them."""
+        while self._running:
+            try:
+                batch = [self._requests.get(timeout=0.5)]
+            except queue.Empty:
+                continue
+
+            deadline = time.monotonic() + self.batch_timeout
+            while len(batch) < self.max_batch:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    break
+                try:
+                    batch.append(self._requests.get(timeout=remaining))
+                except queue.Empty:
+                    break
+
+            self._run_batch(batch)
+
+    def _run_batch(self, batch: List[_DetectRequest]):
+        """Run YOLO once for a batch of requests."""
+        try:
+            min_conf = min(request.conf for request in batch)
+            results = self.model([request.frame for request in batch], conf=min_conf, verbose=False)
+
+            for request, result in zip(batch, results):
+                boxes = result.boxes
+                rows = np.column_stack([
+                    boxes.xyxy.cpu().numpy(),
+                    boxes.conf.cpu().numpy(),
+                    boxes.cls.cpu().numpy()
+                ])
+                request.result = rows[rows[:, 4] >= request.conf].tolist()
+        except Exception as e:
+            for request in batch:
+                request.error = e
+        finally:
+            for request in batch:
+                request.event.set()
+
+    def _create_hands(self, header: dict):
+        """Create a MediaPipe Hands graph with the client's settings."""
+        import mediapipe as mp
+
+        return mp.solutions.hands.Hands(
+            static_image_mode=header.get('static_image_mode', False),
+            max_num_hands=header.get('max_num_hands', 2),
+            min_detection_confidence=header.get('min_detection_confidence', 0.5),
+            min_tracking_confidence=header.get('min_tracking_confidence', 0.5)
+        )
+
+    def _detect_hands(self, hands, frame: np.ndarray) -> List[dict]:
+        """Run MediaPipe Hands on a BGR frame."""
+        import cv2
+        from hand_keypoint_detection import serialize_hand_results
+
+        results = hands.process(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+        return serialize_hand_results(results)
+
+
+class InferenceClient:
+    """
+    Thin client for a running InferenceServer.
+    """
+
+    def __init__(self, socket_path: str = DEFAULT_SOCKET_PATH, timeout: float = 5.0):
+        """
+        Connect to the server.
+
+        Args:
+            socket_path: Filesystem path of the server's Unix socket
+            timeout: Socket timeout in seconds
+        """
+        self.sock = socket.socket(socket.AF_UNIX, socket.SOCK_STREAM)
+        self.sock.settimeout(timeout)
+        try:
+            self.sock.connect(socket_path)
+        except OSError:
+            self.sock.close()
+            raise
+        self._lock = threading.Lock()
+
+    @classmethod
+    def connect(cls, socket_path: str = DEFAULT_SOCKET_PATH) -> Optional['InferenceClient']:
+        """
+        Connect to the server if it is running.
+
+        Returns:
+            An InferenceClient, or None if no server is available
+        """
+        if not hasattr(socket, 'AF_UNIX') or not os.path.exists(socket_path):
+            return None
+        try:
+            return cls(socket_path)
+        except OSError:
+            return None
+
+    def request(self, op: str, frame: Optional[np.ndarray] = None, **params) -> dict:
+        """Send one request and wait for the reply."""
+        with self._lock:
+            send_message(self.sock, dict(params, op=op), frame)
+            reply, _ = recv_message(self.sock)
+        if 'error' in reply:
+            raise RuntimeError(f"Inference server error: {reply['error']}")
+        return reply
+
+    def class_names(self) -> dict:
+        """Get the YOLO class names served by the server."""
+        names = self.request('info')['names']
+        return {int(k): v for k, v in names.items()}
+
+    def detect(self, frame: np.ndarray, conf: float = 0.5) -> List[list]:
+        """
+        Detect objects in a BGR frame.
+
+        Returns:
+            List of [x1, y1, x2, y2, confidence, class_id] rows
+        """
+        return self.request('detect', frame, conf=conf)['detections']
+
+    def hands(self, frame: np.ndarray, **options) -> List[dict]:
+        """
+        Detect hand landmarks in a BGR frame.
+
+        Args:
+            frame: Input image in BGR format
+            **options: MediaPipe Hands settings used when the server creates this client's graph
+
+        Returns:
+            Serialized hands as produced by serialize_hand_results
+        """
+        return self.request('hands', frame, **options)['hands']
+
+    def close(self):
+        """Close the connection."""
+        self.sock.close()
+
+
+def main():
+    """Main entry point."""
+    parser = argparse.ArgumentParser(description="Shared inference server for Bridging Worlds")
+    parser.add_argument('--socket', default=DEFAULT_SOCKET_PATH, help="Unix socket path")
+    parser.add_argument('--max-batch', type=int, default=8, help="Maximum YOLO batch size")
+    parser.add_argument('--batch-timeout-ms', type=float, default=5.0,
+                        help="Time to wait for more frames before running a batch")
+    args = parser.parse_args()
+
+    server = InferenceServer(args.socket, args.max_batch, args.batch_timeout_ms / 1000.0)
+    try:
+        server.serve_forever()
+    except RuntimeError as e:
+        print(f"Error: {e}")
+    except KeyboardInterrupt:
+        print("\nShutting down inference server...")
+        server.stop()
+
+
+if __name__ == "__main__":
+    main()
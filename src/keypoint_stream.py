@@ -0,0 +1,353 @@
+"""
+Keypoint Stream
+Publishes hand landmarks every frame as fixed-size binary records in a
+shared-memory ring, so external consumers (avatar renderer, logging service)
+can read them without touching the camera or the OpenCV window.
+
+The ring is a seqlock per slot: the publisher marks a slot odd while writing
+it and even when done, and never waits for anyone. Subscribers attach and
+detach at will, copy a slot and re-check its sequence to detect torn reads,
+and use the record sequence numbers to count records they missed.
+
+Run a subscriber with:  python src/keypoint_stream.py subscribe
+Measure publish cost:   python src/keypoint_stream.py bench
+"""
+
+import argparse
+import os
+import sys
+import time
+import numpy as np
+from multiprocessing import shared_memory
+from typing import List, Optional
+
+from shm_utils import untrack
+
+
+DEFAULT_STREAM_NAME = 'bridging_worlds_keypoints'
+MAGIC = 0x4B505453  # 'KPTS'
+VERSION = 2
+MAX_HANDS = 2
+
+# Handedness codes stored in records
+HAND_LABELS = ('Left', 'Right')
+
+HEADER_DTYPE = np.dtype([
+    ('magic', '<u4'),
+    ('version', '<u4'),
+    ('capacity', '<u4'),
+    ('record_size', '<u4'),
+    ('write_seq', '<u8'),
+    ('publisher_pid', '<u8'),
+])
+
+# One frame of hand landmarks (548 bytes)
+RECORD_DTYPE = np.dtype([
+    ('seq', '<u8'),
+    ('timestamp', '<f8'),
+    ('frame_id', '<u8'),
+    ('num_hands', 'u1'),
+    ('labels', 'u1', (MAX_HANDS,)),
+    ('scores', '<f4', (MAX_HANDS,)),
+    ('landmarks', '<f4', (MAX_HANDS, 21, 3)),
+])
+
+# Slot = seqlock word + record
+SLOT_DTYPE = np.dtype([
+    ('lock', '<u8'),
+    ('record', RECORD_DTYPE),
+])
+
+
+def _process_alive(pid: int) -> bool:
+    """Whether a process with this id is still running."""
+    if pid <= 0:
+        return False
+    if sys.platform == 'win32':
+        # os.kill would terminate the process on Windows
+        import ctypes
+
+        PROCESS_QUERY_LIMITED_INFORMATION = 0x1000
+        STILL_ACTIVE = 259
+        kernel32 = ctypes.windll.kernel32
+        handle = kernel32.OpenProcess(PROCESS_QUERY_LIMITED_INFORMATION, False, pid)
+        if not handle:
+            return False
+        try:
+            exit_code = ctypes.c_ulong()
+            if not kernel32.GetExitCodeProcess(handle, ctypes.byref(exit_code)):
+                return False
+            return exit_code.value == STILL_ACTIVE
+        finally:
+            kernel32.CloseHandle(handle)
+    try:
+        os.kill(pid, 0)
+    except ProcessLookupError:
+        return False
+    except PermissionError:
+        # Running, but owned by another user
+        return True
+    return True
+
+
+def _reclaim_stale(name: str):
+    """
+    Remove a ring left behind by a publisher that is no longer running.
+
+    Raises:
+        FileExistsError: If the ring's publisher is still running, or the
+            segment is not a keypoint stream whose publisher can be checked
+    """
+    existing = shared_memory.SharedMemory(name=name)
+    magic = version = pid = 0
+    if existing.size >= HEADER_DTYPE.itemsize:
+        header = np.frombuffer(existing.buf, dtype=HEADER_DTYPE, count=1)[0]
+        magic, version, pid = int(header['magic']), int(header['version']), int(header['publisher_pid'])
+        del header
+    existing.close()
+
+    if magic != MAGIC or version != VERSION:
+        untrack(existing)
+        raise FileExistsError(
+            f"Shared memory '{name}' exists but is not a version {VERSION} keypoint stream; "
+            f"use another stream name or remove the segment"
+        )
+    if _process_alive(pid):
+        untrack(existing)
+        raise FileExistsError(f"Keypoint stream '{name}' is already published by process {pid}")
+
+    print(f"Removing stale keypoint stream '{name}' (publisher {pid} is gone)")
+    existing.unlink()
+
+
+class KeypointPublisher:
+    """
+    Writes hand landmark records into a shared-memory ring (single producer).
+    """
+
+    def __init__(self, name: str = DEFAULT_STREAM_NAME, capacity: int = 64):
+        """
+        Create the ring, replacing a stale one left by a crashed publisher.
+
+        Args:
+            name: Shared memory name subscribers attach to
+            capacity: Number of records kept; slower subscribers miss older ones
+
+        Raises:
+            FileExistsError: If another running process publishes on this name
+        """
+        size = HEADER_DTYPE.itemsize + capacity * SLOT_DTYPE.itemsize
+        try:
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+        except FileExistsError:
+            _reclaim_stale(name)
+            self.shm = shared_memory.SharedMemory(name=name, create=True, size=size)
+
+        self.name = name
+        self.capacity = capacity
+        self._header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        self._slots = np.ndarray((capacity,), dtype=SLOT_DTYPE, buffer=self.shm.buf, offset=HEADER_DTYPE.itemsize)
+        self._locks = self._slots['lock']
+        self._records = self._slots['record']
+
+        self._slots.fill(0)
+        self._header['capacity'] = capacity
+        self._header['record_size'] = RECORD_DTYPE.itemsize
+        self._header['version'] = VERSION
+        self._header['write_seq'] = 0
+        self._header['publisher_pid'] = os.getpid()
+        self._header['magic'] = MAGIC
+
+        self.seq = 0
+
+    def publish(self, results: object, frame_id: int = 0, timestamp: Optional[float] = None) -> int:
+        """
+        Publish one frame of MediaPipe hand results.
+
+        Args:
+            results: MediaPipe results object (multi_hand_landmarks / multi_handedness)
+            frame_id: Frame number of the results
+            timestamp: Capture time in seconds (default: time.time())
+
+        Returns:
+            Sequence number of the published record
+        """
+        seq = self.seq + 1
+        index = seq % self.capacity
+        record = self._records[index]
+
+        # Odd lock: slot is being written
+        self._locks[index] = 2 * seq - 1
+
+        record['seq'] = seq
+        record['timestamp'] = time.time() if timestamp is None else timestamp
+        record['frame_id'] = frame_id
+
+        num_hands = 0
+        if results.multi_hand_landmarks:
+            for hand_landmarks, handedness in zip(results.multi_hand_landmarks[:MAX_HANDS], results.multi_handedness):
+                classification = handedness.classification[0]
+                record['labels'][num_hands] = classification.label == 'Right'
+                record['scores'][num_hands] = classification.score
+                record['landmarks'][num_hands] = [(lm.x, lm.y, lm.z) for lm in hand_landmarks.landmark]
+                num_hands += 1
+        record['num_hands'] = num_hands
+
+        # Even lock: slot is complete
+        self._locks[index] = 2 * seq
+        self._header['write_seq'] = seq
+        self.seq = seq
+        return seq
+
+    def close(self):
+        """Remove the ring; attached subscribers keep their mapping until they close."""
+        del self._header, self._slots, self._locks, self._records
+        self.shm.close()
+        self.shm.unlink()
+
+
+class KeypointSubscriber:
+    """
+    Reads hand landmark records from a publisher's ring without blocking it.
+    """
+
+    def __init__(self, name: str = DEFAULT_STREAM_NAME):
+        """
+        Attach to a running publisher.
+
+        Args:
+            name: Shared memory name of the stream
+
+        Raises:
+            FileNotFoundError: If no publisher is running
+        """
+        self.shm = shared_memory.SharedMemory(name=name)
+        untrack(self.shm)
+
+        self._header = np.ndarray((), dtype=HEADER_DTYPE, buffer=self.shm.buf)
+        if self._header['magic'] != MAGIC or self._header['version'] != VERSION:
+            self.shm.close()
+            raise ValueError(f"'{name}' is not a version {VERSION} keypoint stream")
+
+        self.capacity = int(self._header['capacity'])
+        self._slots = np.ndarray((self.capacity,), dtype=SLOT_DTYPE, buffer=self.shm.buf,
+                                 offset=HEADER_DTYPE.itemsize)
+        self._locks = self._slots['lock']
+        self._records = self._slots['record']
+
+        # Start from the newest record; earlier history is not counted as dropped
+        self.last_seq = int(self._header['write_seq'])
+        self.dropped = 0
+
+    def poll(self) -> np.ndarray:
+        """
+        Get every record published since the last poll.
+
+        Records overwritten before they could be read are counted in `dropped`.
+
+        Returns:
+            Array of RECORD_DTYPE records in publish order (possibly empty)
+        """
+        head = int(self._header['write_seq'])
+        if head < self.last_seq:
+            # Publisher restarted
+            self.last_seq = 0
+        if head == self.last_seq:
+            return np.empty(0, dtype=RECORD_DTYPE)
+
+        first = max(self.last_seq + 1, head - self.capacity + 1)
+        self.dropped += first - (self.last_seq + 1)
+
+        records = []
+        for seq in range(first, head + 1):
+            index = seq % self.capacity
+            before = self._locks[index]
+            record = self._records[index].copy()
+            if before != 2 * seq or self._locks[index] != before:
+                # Overwritten (or being written) while we copied it
+                self.dropped += 1
+                continue
+            records.append(record)
+
+        self.last_seq = head
+        return np.array(records, dtype=RECORD_DTYPE)
+
+    def close(self):
+        """Detach from the stream."""
+        del self._header, self._slots, self._locks, self._records
+        self.shm.close()
+
+
+def record_to_hands(record: np.void) -> List[dict]:
+    """
+    Convert a record into hands in the serialize_hand_results format.
+
+    Args:
+        record: One RECORD_DTYPE record
+
+    Returns:
+        List of dictionaries with hand label, score and normalized landmarks
+    """
+    return [
+        {
+            'label': HAND_LABELS[record['labels'][i]],
+            'score': float(record['scores'][i]),
+            'landmarks': record['landmarks'][i].tolist()
+        }
+        for i in range(record['num_hands'])
+    ]
+
+
+def _canned_results():
+    """MediaPipe-shaped results for two hands (benchmarking without a camera)."""
+    from types import SimpleNamespace
+
+    rng = np.random.default_rng(0)
+    return SimpleNamespace(
+        multi_hand_landmarks=[
+            SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in rng.random((21, 3))])
+            for _ in range(MAX_HANDS)
+        ],
+        multi_handedness=[
+            SimpleNamespace(classification=[SimpleNamespace(label=label, score=0.9)])
+            for label in HAND_LABELS
+        ]
+    )
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Hand keypoint shared-memory stream")
+    parser.add_argument('command', choices=['subscribe', 'bench'])
+    parser.add_argument('--name', default=DEFAULT_STREAM_NAME, help="Stream name")
+    parser.add_argument('--frames', type=int, default=10000, help="Records to publish (bench)")
+    args = parser.parse_args()
+
+    if args.command == 'bench':
+        publisher = KeypointPublisher(args.name + '_bench')
+        results = _canned_results()
+        start = time.perf_counter()
+        for frame_id in range(args.frames):
+            publisher.publish(results, frame_id)
+        elapsed = time.perf_counter() - start
+        publisher.close()
+        print(f"Publish: {elapsed / args.frames * 1e6:.1f} us per frame (two hands)")
+        return
+
+    subscriber = KeypointSubscriber(args.name)
+    print(f"Subscribed to {args.name} ({subscriber.capacity} slots). Ctrl+C to stop.")
+    try:
+        while True:
+            for record in subscriber.poll():
+                latency_ms = (time.time() - record['timestamp']) * 1000
+                hands = ", ".join(hand['label'] for hand in record_to_hands(record)) or "no hands"
+                print(f"#{record['seq']} frame {record['frame_id']}: {hands} "
+                      f"({latency_ms:.1f} ms old, {subscriber.dropped} dropped)")
+            time.sleep(0.005)
+    except KeyboardInterrupt:
+        pass
+    finally:
+        subscriber.close()
+
+
+if __name__ == "__main__":
+    main()
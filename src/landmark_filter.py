@@ -0,0 +1,250 @@
+"""
+Landmark Temporal Filtering
+Smooths hand landmark jitter with a vectorized One-Euro filter and extrapolates
+landmarks with the filtered velocity, so MediaPipe can run below the display
+rate (e.g. 15 Hz inference for a 30 Hz display).
+
+All 21 landmarks x (x, y, z) of a hand are filtered as one array per step.
+"""
+
+import time
+import numpy as np
+from typing import List, Optional
+
+from hand_keypoint_detection import build_hand_results, serialize_hand_results
+
+
+def _smoothing_factor(cutoff: np.ndarray, dt: float) -> np.ndarray:
+    """Exponential smoothing factor for a cutoff frequency and time step."""
+    tau = 1.0 / (2.0 * np.pi * cutoff)
+    return 1.0 / (1.0 + tau / dt)
+
+
+class OneEuroFilter:
+    """
+    One-Euro filter over an array of values (Casiez et al., 2012).
+
+    Slow movements are smoothed heavily to remove jitter; fast movements raise
+    the cutoff frequency so the filter does not lag.
+    """
+
+    def __init__(self, min_cutoff: float = 1.0, beta: float = 10.0, d_cutoff: float = 1.0):
+        """
+        Initialize the filter.
+
+        Args:
+            min_cutoff: Cutoff frequency (Hz) when still; lower means smoother
+            beta: How quickly the cutoff rises with speed; higher means less lag
+            d_cutoff: Cutoff frequency (Hz) for the velocity estimate
+        """
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.d_cutoff = d_cutoff
+        self.reset()
+
+    def reset(self):
+        """Forget the filter state."""
+        self.value = None
+        self.velocity = None
+        self.timestamp = None
+
+    def __call__(self, x: np.ndarray, timestamp: float) -> np.ndarray:
+        """
+        Filter a new measurement.
+
+        Args:
+            x: Measured values
+            timestamp: Measurement time in seconds
+
+        Returns:
+            Filtered values (same shape as x)
+        """
+        if self.value is None:
+            self.value = x.astype(np.float64)
+            self.velocity = np.zeros_like(self.value)
+            self.timestamp = timestamp
+            return self.value
+
+        dt = max(timestamp - self.timestamp, 1e-6)
+        velocity = (x - self.value) / dt
+        self.velocity += _smoothing_factor(self.d_cutoff, dt) * (velocity - self.velocity)
+
+        cutoff = self.min_cutoff + self.beta * np.abs(self.velocity)
+        self.value = self.value + _smoothing_factor(cutoff, dt) * (x - self.value)
+        self.timestamp = timestamp
+        return self.value
+
+    def predict(self, timestamp: float) -> np.ndarray:
+        """
+        Extrapolate the filtered values with constant velocity.
+
+        Args:
+            timestamp: Time in seconds to predict for
+
+        Returns:
+            Predicted values
+        """
+        return self.value + self.velocity * (timestamp - self.timestamp)
+
+
+class HandTrack:
+    """
+    One hand followed across inferences: its filter and latest handedness.
+    """
+
+    def __init__(self, min_cutoff: float, beta: float):
+        self.filter = OneEuroFilter(min_cutoff, beta)
+        self.label = None
+        self.score = 0.0
+
+
+class LandmarkPredictor:
+    """
+    Runs a hand detector on every Nth frame and predicts landmarks in between.
+
+    Hands are matched to their tracks by wrist position rather than by
+    handedness label, because MediaPipe often gives crossed hands (or a
+    mirrored view) the same label.
+    """
+
+    def __init__(
+        self,
+        detector: object,
+        inference_ratio: int = 2,
+        max_error: float = 0.03,
+        min_cutoff: float = 1.0,
+        beta: float = 10.0,
+        max_match_distance: float = 0.25
+    ):
+        """
+        Initialize the predictor.
+
+        Args:
+            detector: HandKeypointDetector (anything with process(image) returning MediaPipe results)
+            inference_ratio: Displayed frames per real inference (1 = infer every frame and
+                pass the detector's results through unfiltered, without smoothing lag)
+            max_error: Error bound in normalized image units. A real inference is forced when
+                the last prediction missed by more than this, or when the extrapolated
+                movement since the last inference exceeds it
+            min_cutoff: One-Euro minimum cutoff frequency (Hz)
+            beta: One-Euro speed coefficient
+            max_match_distance: Largest wrist movement between inferences (normalized
+                image units) for a hand to continue an existing track
+        """
+        self.detector = detector
+        self.inference_ratio = max(1, inference_ratio)
+        self.max_error = max_error
+        self.min_cutoff = min_cutoff
+        self.beta = beta
+        self.max_match_distance = max_match_distance
+
+        # Hands currently followed, in the detector's order
+        self.tracks: List[HandTrack] = []
+
+        self.frames_since_inference = 0
+        self.last_error = 0.0
+        self.inferences = 0
+        self.predictions = 0
+        self.forced_inferences = 0
+
+    def _needs_inference(self, timestamp: float) -> bool:
+        """Decide whether this frame must run the real detector."""
+        if not self.tracks or self.frames_since_inference + 1 >= self.inference_ratio:
+            return True
+
+        forced = self.last_error > self.max_error
+        if not forced:
+            # Constant-velocity extrapolation gets less reliable the further it moves
+            for track in self.tracks:
+                hand_filter = track.filter
+                drift = np.abs(hand_filter.velocity[:, :2]).max() * (timestamp - hand_filter.timestamp)
+                if drift > self.max_error:
+                    forced = True
+                    break
+        if forced:
+            self.forced_inferences += 1
+        return forced
+
+    def _match(self, measured: List[np.ndarray], timestamp: float) -> List[Optional[HandTrack]]:
+        """
+        Pair measured hands with existing tracks, closest wrists first.
+
+        Returns:
+            The track for each measured hand, or None for a hand that starts a new track
+        """
+        predicted = [track.filter.predict(timestamp)[0, :2] for track in self.tracks]
+        pairs = sorted(
+            (float(np.linalg.norm(landmarks[0, :2] - wrist)), hand_index, track_index)
+            for hand_index, landmarks in enumerate(measured)
+            for track_index, wrist in enumerate(predicted)
+        )
+
+        matches = [None] * len(measured)
+        used = set()
+        for distance, hand_index, track_index in pairs:
+            if distance > self.max_match_distance:
+                break
+            if matches[hand_index] is None and track_index not in used:
+                matches[hand_index] = self.tracks[track_index]
+                used.add(track_index)
+        return matches
+
+    def _update(self, hands: list, timestamp: float):
+        """Feed measured hands into their tracks, measuring the prediction error."""
+        measured = [np.asarray(hand['landmarks'], dtype=np.float64) for hand in hands]
+        self.last_error = 0.0
+
+        # Hands without a match start new tracks; tracks without a hand are dropped
+        tracks = []
+        for hand, landmarks, track in zip(hands, measured, self._match(measured, timestamp)):
+            if track is None:
+                track = HandTrack(self.min_cutoff, self.beta)
+            elif self.frames_since_inference > 0:
+                error = np.abs(track.filter.predict(timestamp)[:, :2] - landmarks[:, :2]).max()
+                self.last_error = max(self.last_error, float(error))
+
+            track.filter(landmarks, timestamp)
+            track.label = hand['label']
+            track.score = hand['score']
+            tracks.append(track)
+        self.tracks = tracks
+
+    def process(self, image: np.ndarray, timestamp: Optional[float] = None) -> object:
+        """
+        Get smoothed hand landmarks for a frame, inferring or predicting as needed.
+
+        Args:
+            image: Input image in BGR format
+            timestamp: Frame time in seconds (default: now)
+
+        Returns:
+            MediaPipe-compatible results object
+        """
+        if self.inference_ratio == 1:
+            # Nothing to predict: the detector's own results, without filter lag
+            self.inferences += 1
+            return self.detector.process(image)
+
+        if timestamp is None:
+            timestamp = time.perf_counter()
+
+        if self._needs_inference(timestamp):
+            self._update(serialize_hand_results(self.detector.process(image)), timestamp)
+            self.frames_since_inference = 0
+            self.inferences += 1
+            landmarks = [track.filter.value for track in self.tracks]
+        else:
+            self.frames_since_inference += 1
+            self.predictions += 1
+            landmarks = [track.filter.predict(timestamp) for track in self.tracks]
+
+        return build_hand_results([
+            {'label': track.label, 'score': track.score, 'landmarks': values.tolist()}
+            for track, values in zip(self.tracks, landmarks)
+        ])
+
+    @property
+    def inference_rate(self) -> float:
+        """Fraction of frames that ran the real detector."""
+        total = self.inferences + self.predictions
+        return self.inferences / total if total else 1.0
@@ -0,0 +1,338 @@
+"""
+Model Registry
+Resolves named model files for every detector backend from a local cache,
+pre-seeded offline bundles, or (only as a last resort) the network, and
+verifies them by SHA-256 before use.
+
+Resolution order for a model file:
+    1. the cache directory (models/ by default, BRIDGING_WORLDS_MODEL_DIR)
+    2. offline bundle directories, used in place without copying
+       (BRIDGING_WORLDS_MODEL_BUNDLES, separated by os.pathsep)
+    3. download into the cache, unless offline (BRIDGING_WORLDS_OFFLINE=1)
+
+Trusted hashes come from the model spec or a bundle's manifest.json
+({filename: sha256}). A file with neither is refused, unless pinning on first
+use is explicitly allowed (BRIDGING_WORLDS_ALLOW_UNPINNED=1), in which case
+its digest is pinned in the cache manifest. Verified digests are remembered
+per file size and modification time, so warm starts do not re-hash large
+weights.
+"""
+
+import hashlib
+import json
+import os
+import urllib.request
+import numpy as np
+from collections import namedtuple
+from typing import Dict, List, Optional
+
+
+PROJECT_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# sha256 is the published digest of the file at url; None means the file is only
+# accepted with a hash from a bundle manifest (or when pinning on first use is allowed)
+ModelSpec = namedtuple('ModelSpec', ['filename', 'url', 'sha256', 'description'])
+
+MODELS = {
+    'yolov8n': ModelSpec(
+        'yolov8n.pt',
+        'https://github.com/ultralytics/assets/releases/download/v8.1.0/yolov8n.pt',
+        None,
+        "YOLOv8 nano object detector (ultralytics)"
+    ),
+    'mobilenet-ssd-prototxt': ModelSpec(
+        'MobileNetSSD_deploy.prototxt',
+        'https://raw.githubusercontent.com/chuanqi305/MobileNet-SSD/master/MobileNetSSD_deploy.prototxt',
+        None,
+        "MobileNet-SSD network definition (Caffe)"
+    ),
+    'mobilenet-ssd-caffemodel': ModelSpec(
+        'MobileNetSSD_deploy.caffemodel',
+        'https://github.com/chuanqi305/MobileNet-SSD/raw/master/MobileNetSSD_deploy.caffemodel',
+        None,
+        "MobileNet-SSD weights (Caffe)"
+    ),
+    'hand-landmarker': ModelSpec(
+        'hand_landmarker.task',
+        'https://storage.googleapis.com/mediapipe-models/hand_landmarker/hand_landmarker/float16/1/hand_landmarker.task',
+        None,
+        "MediaPipe Tasks hand landmarker (LIVE_STREAM mode)"
+    ),
+    'midas-small': ModelSpec(
+        'midas_v21_small_256.onnx',
+        'https://github.com/isl-org/MiDaS/releases/download/v2_1/model-small.onnx',
+        None,
+        "MiDaS v2.1 small monocular depth (ONNX, cv2.dnn)"
+    ),
+    'text-detection': ModelSpec(
+        'text_detection_en_ppocrv3_2023may.onnx',
+        'https://github.com/opencv/opencv_zoo/raw/main/models/text_detection_ppocr/text_detection_en_ppocrv3_2023may.onnx',
+        None,
+        "PP-OCRv3 DB text detector, English (ONNX, cv2.dnn)"
+    ),
+    'text-recognition': ModelSpec(
+        'text_recognition_CRNN_EN_2021sep.onnx',
+        'https://github.com/opencv/opencv_zoo/raw/main/models/text_recognition_crnn/text_recognition_CRNN_EN_2021sep.onnx',
+        None,
+        "CRNN text recognizer, English digits and letters (ONNX, cv2.dnn)"
+    ),
+}
+
+MANIFEST_NAME = 'registry.json'
+BUNDLE_MANIFEST_NAME = 'manifest.json'
+
+
+class ModelIntegrityError(Exception):
+    """Raised when a model file does not match its expected SHA-256."""
+
+
+def _sha256(path: str) -> str:
+    """Hash a file in chunks."""
+    digest = hashlib.sha256()
+    with open(path, 'rb') as f:
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            digest.update(chunk)
+    return digest.hexdigest()
+
+
+class ModelRegistry:
+    """
+    Offline-first resolver and verifier for model files.
+    """
+
+    def __init__(
+        self,
+        cache_dir: Optional[str] = None,
+        bundle_dirs: Optional[List[str]] = None,
+        offline: Optional[bool] = None,
+        allow_unpinned: Optional[bool] = None
+    ):
+        """
+        Initialize the registry.
+
+        Args:
+            cache_dir: Directory holding downloaded models and the registry manifest
+            bundle_dirs: Read-only directories with pre-seeded model files
+            offline: Never touch the network (defaults to BRIDGING_WORLDS_OFFLINE)
+            allow_unpinned: Trust and pin files without a known hash on first use
+                (defaults to BRIDGING_WORLDS_ALLOW_UNPINNED)
+        """
+        if cache_dir is None:
+            cache_dir = os.environ.get('BRIDGING_WORLDS_MODEL_DIR', os.path.join(PROJECT_ROOT, 'models'))
+        if bundle_dirs is None:
+            bundles = os.environ.get('BRIDGING_WORLDS_MODEL_BUNDLES', '')
+            bundle_dirs = [path for path in bundles.split(os.pathsep) if path]
+        if offline is None:
+            offline = os.environ.get('BRIDGING_WORLDS_OFFLINE', '') not in ('', '0')
+        if allow_unpinned is None:
+            allow_unpinned = os.environ.get('BRIDGING_WORLDS_ALLOW_UNPINNED', '') not in ('', '0')
+
+        self.cache_dir = cache_dir
+        self.bundle_dirs = list(bundle_dirs)
+        self.offline = offline
+        self.allow_unpinned = allow_unpinned
+
+        self._manifest_path = os.path.join(cache_dir, MANIFEST_NAME)
+        self._manifest = self._load_manifest()
+        self._bundle_hashes = self._load_bundle_hashes()
+
+    def _load_manifest(self) -> dict:
+        """Load pinned hashes and verification results from the cache."""
+        try:
+            with open(self._manifest_path, 'r', encoding='utf-8') as f:
+                manifest = json.load(f)
+        except (OSError, ValueError):
+            manifest = {}
+        manifest.setdefault('pins', {})
+        manifest.setdefault('verified', {})
+        return manifest
+
+    def _save_manifest(self):
+        """
+        Write the manifest atomically.
+
+        A read-only cache (e.g. an offline machine that only uses bundles) keeps
+        the manifest in memory for this process instead.
+        """
+        temp_path = self._manifest_path + '.tmp'
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(temp_path, 'w', encoding='utf-8') as f:
+                json.dump(self._manifest, f, indent=2, sort_keys=True)
+            os.replace(temp_path, self._manifest_path)
+        except OSError as e:
+            print(f"Warning: could not save {self._manifest_path} ({e}); verified hashes are kept in memory only")
+
+    def _load_bundle_hashes(self) -> Dict[str, str]:
+        """Collect expected hashes from the bundles' manifest files."""
+        hashes = {}
+        for bundle_dir in self.bundle_dirs:
+            try:
+                with open(os.path.join(bundle_dir, BUNDLE_MANIFEST_NAME), 'r', encoding='utf-8') as f:
+                    hashes.update(json.load(f))
+            except (OSError, ValueError):
+                continue
+        return hashes
+
+    def spec(self, name: str) -> ModelSpec:
+        """Look up a model by name."""
+        if name not in MODELS:
+            raise KeyError(f"Unknown model '{name}', expected one of {sorted(MODELS)}")
+        return MODELS[name]
+
+    def expected_sha256(self, spec: ModelSpec) -> Optional[str]:
+        """Get the hash a model file must have, if one is known."""
+        expected = spec.sha256 or self._bundle_hashes.get(spec.filename)
+        if expected is None and self.allow_unpinned:
+            expected = self._manifest['pins'].get(spec.filename)
+        return expected
+
+    def _check_known(self, spec: ModelSpec, expected: Optional[str]):
+        """Refuse a file without a trusted hash unless pinning on first use is allowed."""
+        if expected is None and not self.allow_unpinned:
+            raise ModelIntegrityError(
+                f"No known SHA-256 for {spec.filename}. Add it to a bundle's {BUNDLE_MANIFEST_NAME}, "
+                "or set BRIDGING_WORLDS_ALLOW_UNPINNED=1 to trust and pin the file on first use."
+            )
+
+    def resolve(self, name: str) -> str:
+        """
+        Get the path of a verified local copy of a model.
+
+        Args:
+            name: Model name from MODELS
+
+        Returns:
+            Absolute path of the model file
+        """
+        spec = self.spec(name)
+        candidates = [os.path.join(self.cache_dir, spec.filename)]
+        candidates += [os.path.join(bundle_dir, spec.filename) for bundle_dir in self.bundle_dirs]
+
+        for path in candidates:
+            if os.path.isfile(path):
+                self.verify(spec, path)
+                return os.path.abspath(path)
+
+        if self.offline:
+            raise FileNotFoundError(
+                f"Model '{name}' ({spec.filename}) is not in {self.cache_dir} or any offline bundle, "
+                "and downloads are disabled"
+            )
+        return self.download(name)
+
+    def map(self, name: str) -> np.memmap:
+        """
+        Memory-map a verified model file read-only.
+
+        Args:
+            name: Model name from MODELS
+
+        Returns:
+            uint8 memmap of the whole file, shared with the OS page cache
+        """
+        return np.memmap(self.resolve(name), dtype=np.uint8, mode='r')
+
+    def verify(self, spec: ModelSpec, path: str):
+        """
+        Check a model file against its expected SHA-256.
+
+        Files without a known hash are refused, or pinned on first use when
+        allow_unpinned is set. Raises ModelIntegrityError on a mismatch.
+        """
+        expected = self.expected_sha256(spec)
+        self._check_known(spec, expected)
+
+        real_path = os.path.realpath(path)
+        stat = os.stat(real_path)
+        record = self._manifest['verified'].get(real_path)
+
+        if record and record['size'] == stat.st_size and record['mtime_ns'] == stat.st_mtime_ns:
+            digest = record['sha256']
+        else:
+            print(f"Verifying {spec.filename}...")
+            digest = _sha256(real_path)
+
+        if expected is not None and digest != expected.lower():
+            raise ModelIntegrityError(
+                f"{path} has SHA-256 {digest}, expected {expected}. "
+                "Delete the file to download it again."
+            )
+
+        changed = False
+        if expected is None:
+            self._manifest['pins'][spec.filename] = digest
+            changed = True
+        if record is None or record['sha256'] != digest or record['mtime_ns'] != stat.st_mtime_ns:
+            self._manifest['verified'][real_path] = {
+                'size': stat.st_size,
+                'mtime_ns': stat.st_mtime_ns,
+                'sha256': digest
+            }
+            changed = True
+        if changed:
+            self._save_manifest()
+
+    def download(self, name: str) -> str:
+        """
+        Download a model into the cache, hashing it while streaming.
+
+        Args:
+            name: Model name from MODELS
+
+        Returns:
+            Absolute path of the downloaded file
+        """
+        spec = self.spec(name)
+        self._check_known(spec, self.expected_sha256(spec))
+        os.makedirs(self.cache_dir, exist_ok=True)
+        path = os.path.join(self.cache_dir, spec.filename)
+        partial_path = path + '.part'
+
+        print(f"Downloading {spec.filename}...")
+        digest = hashlib.sha256()
+        try:
+            with urllib.request.urlopen(spec.url) as response, open(partial_path, 'wb') as f:
+                total_size = int(response.headers.get('Content-Length') or 0)
+                downloaded = 0
+                for chunk in iter(lambda: response.read(1 << 20), b''):
+                    f.write(chunk)
+                    digest.update(chunk)
+                    downloaded += len(chunk)
+                    if total_size > 0:
+                        print(f"\rProgress: {downloaded * 100 / total_size:.1f}%", end='')
+            print("\nDownload complete!")
+
+            expected = self.expected_sha256(spec)
+            if expected is not None and digest.hexdigest() != expected.lower():
+                raise ModelIntegrityError(
+                    f"Downloaded {spec.filename} has SHA-256 {digest.hexdigest()}, expected {expected}"
+                )
+            os.replace(partial_path, path)
+        finally:
+            if os.path.exists(partial_path):
+                os.remove(partial_path)
+
+        self.verify(spec, path)
+        return os.path.abspath(path)
+
+
+_default_registry = None
+
+
+def get_registry() -> ModelRegistry:
+    """Get the process-wide registry configured from the environment."""
+    global _default_registry
+    if _default_registry is None:
+        _default_registry = ModelRegistry()
+    return _default_registry
+
+
+def resolve_model(name: str) -> str:
+    """Resolve a model path with the default registry."""
+    return get_registry().resolve(name)
+
+
+def map_model(name: str) -> np.memmap:
+    """Memory-map a model file with the default registry."""
+    return get_registry().map(name)
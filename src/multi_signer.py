@@ -0,0 +1,303 @@
+"""
+Multi-Signer Mode
+Tracks the hands of several signers at once, e.g. in a classroom. The object
+detector finds people, every person crop goes to its own HandKeypointDetector
+on a thread pool, and the landmarks are mapped back to full-frame coordinates.
+
+Cropping keeps each signer's hands large in MediaPipe's input, and giving every
+signer a dedicated detector keeps MediaPipe's tracking state per person. People
+are re-detected only every few frames; in between the previous (padded) boxes
+are reused, since hand tracking inside a crop tolerates small movements.
+"""
+
+import time
+import cv2
+import numpy as np
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Optional, Tuple
+
+from detectors import DEFAULT_BACKEND, create_detector
+from hand_keypoint_detection import (
+    HandKeypointDetector,
+    build_hand_results,
+    draw_hand_landmarks,
+    serialize_hand_results
+)
+from recorder import FrameRecorder
+from runtime_config import configure_runtime, get_runtime
+
+
+PERSON_CLASS_ID = 0
+
+
+def box_iou(a: np.ndarray, b: np.ndarray) -> np.ndarray:
+    """
+    Pairwise intersection over union of two sets of [x1, y1, x2, y2] boxes.
+
+    Returns:
+        Array of shape (len(a), len(b))
+    """
+    x1 = np.maximum(a[:, None, 0], b[None, :, 0])
+    y1 = np.maximum(a[:, None, 1], b[None, :, 1])
+    x2 = np.minimum(a[:, None, 2], b[None, :, 2])
+    y2 = np.minimum(a[:, None, 3], b[None, :, 3])
+    intersection = np.clip(x2 - x1, 0, None) * np.clip(y2 - y1, 0, None)
+    area_a = (a[:, 2] - a[:, 0]) * (a[:, 3] - a[:, 1])
+    area_b = (b[:, 2] - b[:, 0]) * (b[:, 3] - b[:, 1])
+    return intersection / np.maximum(area_a[:, None] + area_b[None, :] - intersection, 1e-6)
+
+
+class MultiSignerTracker:
+    """
+    Per-person hand keypoint detection for several signers in one frame.
+    """
+
+    def __init__(
+        self,
+        max_signers: int = 6,
+        detect_interval: int = 5,
+        padding: float = 0.15,
+        backend: str = DEFAULT_BACKEND,
+        workers: Optional[int] = None
+    ):
+        """
+        Initialize the person detector and one hand detector per signer slot.
+
+        Args:
+            max_signers: Maximum number of people tracked at once
+            detect_interval: Run person detection every N frames
+            padding: Fraction of the person box added on each side so raised hands stay inside
+            backend: Object detector backend used to find people
+            workers: Hand detection threads (default: one per signer)
+        """
+        self.max_signers = max_signers
+        self.detect_interval = max(1, detect_interval)
+        self.padding = padding
+
+        self.person_detector = create_detector(backend)
+        self.hand_detectors = [
+            HandKeypointDetector(
+                static_image_mode=False,
+                max_num_hands=2,
+                min_detection_confidence=0.5,
+                min_tracking_confidence=0.5,
+                use_server=False
+            )
+            for _ in range(max_signers)
+        ]
+
+        # MediaPipe releases the GIL while inferring, so crops run in parallel.
+        # Every signer gets a worker so none waits behind another; the CPU share
+        # is limited by pinning the workers (and each graph's executors, see
+        # HandKeypointDetector) to the hands CPUs instead
+        runtime = get_runtime()
+        self.executor = ThreadPoolExecutor(
+            max_workers=workers or max_signers,
+            thread_name_prefix='signer',
+            initializer=runtime.pin_thread,
+            initargs=('hands',)
+        )
+
+        # Padded full-frame box per signer slot (None when the slot is free)
+        self.signer_boxes: List[Optional[np.ndarray]] = [None] * max_signers
+        self.frame_count = 0
+
+    def update_signers(self, frame: np.ndarray):
+        """
+        Detect people and assign them to signer slots.
+
+        A person keeps the slot whose previous box overlaps them most, so each
+        hand detector keeps tracking the same signer across frames.
+        """
+        h, w = frame.shape[:2]
+        with get_runtime().pinned('objects'):
+            rows = self.person_detector.detect(frame)
+        people = rows[rows[:, 5] == PERSON_CLASS_ID]
+        people = people[np.argsort(-people[:, 4])][:self.max_signers, :4]
+
+        # Pad and clip to the frame
+        pad = (people[:, 2:4] - people[:, 0:2]) * self.padding
+        boxes = np.empty_like(people)
+        boxes[:, 0:2] = people[:, 0:2] - pad
+        boxes[:, 2:4] = people[:, 2:4] + pad
+        boxes = boxes.clip(0, [w, h, w, h]).astype(np.int32)
+
+        previous = [i for i, box in enumerate(self.signer_boxes) if box is not None]
+        assigned: List[Optional[np.ndarray]] = [None] * self.max_signers
+        unmatched = list(range(len(boxes)))
+
+        if previous and len(boxes):
+            overlap = box_iou(np.array([self.signer_boxes[i] for i in previous], dtype=np.float32),
+                              boxes.astype(np.float32))
+            # Greedy matching, best overlaps first
+            for flat in np.argsort(-overlap, axis=None):
+                row, col = np.unravel_index(flat, overlap.shape)
+                if overlap[row, col] <= 0:
+                    break
+                slot = previous[row]
+                if assigned[slot] is None and col in unmatched:
+                    assigned[slot] = boxes[col]
+                    unmatched.remove(col)
+
+        # A slot whose person was not found again is handed to someone else, so
+        # its detector stops tracking the previous signer's hands
+        for slot in previous:
+            if assigned[slot] is None:
+                self.hand_detectors[slot].reset_tracking()
+
+        free_slots = [i for i in range(self.max_signers) if assigned[i] is None]
+        for slot, col in zip(free_slots, unmatched):
+            assigned[slot] = boxes[col]
+
+        self.signer_boxes = assigned
+
+    def _process_crop(self, slot: int, frame: np.ndarray, box: np.ndarray) -> list:
+        """
+        Detect hands in one signer's crop (worker thread).
+
+        Returns:
+            Serialized hands with landmarks in full-frame normalized coordinates
+        """
+        x1, y1, x2, y2 = box
+        if x2 - x1 < 2 or y2 - y1 < 2:
+            return []
+        h, w = frame.shape[:2]
+        hands = serialize_hand_results(self.hand_detectors[slot].process(frame[y1:y2, x1:x2]))
+
+        # Map crop-normalized landmarks back to the full frame
+        scale_x = (x2 - x1) / w
+        scale_y = (y2 - y1) / h
+        for hand in hands:
+            hand['landmarks'] = [
+                [x1 / w + x * scale_x, y1 / h + y * scale_y, z * scale_x]
+                for x, y, z in hand['landmarks']
+            ]
+        return hands
+
+    def process(self, frame: np.ndarray) -> Tuple[object, List[dict]]:
+        """
+        Detect the hands of every signer in a BGR frame.
+
+        Args:
+            frame: Input image in BGR format
+
+        Returns:
+            Tuple of (combined MediaPipe-compatible results for drawing,
+            list of signer dicts with 'id', 'bbox' and 'hands' from get_keypoint_coordinates)
+        """
+        if self.frame_count % self.detect_interval == 0:
+            self.update_signers(frame)
+        self.frame_count += 1
+
+        futures = [
+            (slot, box, self.executor.submit(self._process_crop, slot, frame, box))
+            for slot, box in enumerate(self.signer_boxes) if box is not None
+        ]
+
+        signers = []
+        all_hands = []
+        for slot, box, future in futures:
+            hands = future.result()
+            all_hands.extend(hands)
+            signers.append({
+                'id': slot,
+                'bbox': box.tolist(),
+                'hands': self.hand_detectors[slot].get_keypoint_coordinates(
+                    build_hand_results(hands), frame.shape
+                )
+            })
+
+        return build_hand_results(all_hands), signers
+
+    @staticmethod
+    def draw_signers(frame: np.ndarray, results: object, signers: List[dict]) -> np.ndarray:
+        """Draw signer boxes, ids and hand landmarks onto the frame in place."""
+        for signer in signers:
+            x1, y1, x2, y2 = signer['bbox']
+            cv2.rectangle(frame, (x1, y1), (x2, y2), (255, 200, 0), 2)
+            cv2.putText(frame, f"Signer {signer['id'] + 1}: {len(signer['hands'])} hands",
+                        (x1 + 5, y1 + 20), cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 200, 0), 2)
+        draw_hand_landmarks(frame, results)
+        return frame
+
+    def close(self):
+        """Clean up resources."""
+        self.executor.shutdown(wait=True)
+        for detector in self.hand_detectors:
+            detector.close()
+
+
+def main():
+    """Main entry point."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Multi-signer hand keypoint detection")
+    parser.add_argument('--max-signers', type=int, default=6, help="Maximum number of people tracked")
+    parser.add_argument('--detect-interval', type=int, default=5, help="Run person detection every N frames")
+    parser.add_argument('--backend', choices=['yolo', 'mobilenet-ssd'], default=DEFAULT_BACKEND,
+                        help="Object detector used to find people")
+    parser.add_argument('--camera', type=int, default=0, help="OpenCV camera index")
+    args = parser.parse_args()
+    configure_runtime(['hands', 'objects'])
+
+    tracker = MultiSignerTracker(
+        max_signers=args.max_signers,
+        detect_interval=args.detect_interval,
+        backend=args.backend
+    )
+    recorder = FrameRecorder()
+
+    cap = cv2.VideoCapture(args.camera)
+    if not cap.isOpened():
+        print("Error: Could not open webcam")
+        tracker.close()
+        return
+    cap.set(cv2.CAP_PROP_FRAME_WIDTH, 1280)
+    cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 720)
+
+    print("Multi-signer mode: press 'V' to start/stop recording, 'Q' to quit")
+
+    raw_frame = None
+    frame = None
+    fps = 0.0
+    last_time = time.perf_counter()
+
+    try:
+        while True:
+            success, raw_frame = cap.read(raw_frame)
+            if not success:
+                print("Failed to grab frame")
+                break
+
+            # Flip frame horizontally to mirror the camera (more natural for user)
+            frame = cv2.flip(raw_frame, 1, dst=frame)
+
+            results, signers = tracker.process(frame)
+            tracker.draw_signers(frame, results, signers)
+
+            now = time.perf_counter()
+            fps = 0.9 * fps + 0.1 / max(now - last_time, 1e-6)
+            last_time = now
+            cv2.putText(frame, f"Signers: {len(signers)} | FPS: {fps:.1f}", (10, 30),
+                        cv2.FONT_HERSHEY_SIMPLEX, 0.8, (0, 255, 0), 2)
+
+            recorder.write(frame)
+            cv2.imshow('Multi-Signer Mode', frame)
+
+            key = cv2.waitKey(1) & 0xFF
+            if key == ord('q') or key == ord('Q'):
+                break
+            elif key == ord('v') or key == ord('V'):
+                recorder.toggle_recording(f"signers_session_{time.strftime('%Y%m%d_%H%M%S')}.mp4")
+
+    except KeyboardInterrupt:
+        print("\nInterrupted by user")
+
+    finally:
+        recorder.close()
+        cap.release()
+        cv2.destroyAllWindows()
+        tracker.close()
+
+
+if __name__ == "__main__":
+    main()
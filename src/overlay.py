@@ -0,0 +1,194 @@
+"""
+Retained-Mode Overlay Layer
+Static text panels are rendered once into BGRA sprites and only rebuilt when
+the state they show changes. Each frame then just blends the cached sprites.
+"""
+
+import cv2
+import numpy as np
+from collections import OrderedDict
+from typing import Callable, Hashable, Optional, Tuple
+
+
+class Sprite:
+    """
+    A pre-rendered BGRA image that can be blended onto BGR frames.
+    """
+
+    def __init__(self, bgra: np.ndarray, x: int = 0, y: int = 0):
+        """
+        Prepare a sprite for fast blending.
+
+        Args:
+            bgra: Rendered image with an alpha channel
+            x: Default left position on the frame
+            y: Default top position on the frame
+        """
+        self.x = x
+        self.y = y
+        self.baseline = 0
+        self.height, self.width = bgra.shape[:2]
+        self.bgr = np.ascontiguousarray(bgra[:, :, :3])
+
+        alpha = bgra[:, :, 3]
+        if np.all(alpha == 255):
+            self.mode = 'opaque'
+        elif np.all((alpha == 0) | (alpha == 255)):
+            # Hard-edged text and shapes: a masked copy is enough
+            self.mode = 'mask'
+            self.mask = (alpha == 255)[:, :, None]
+        else:
+            # Premultiply once so each blend is a single fused expression
+            self.mode = 'blend'
+            alpha16 = alpha.astype(np.uint16)[:, :, None]
+            self.premultiplied = self.bgr.astype(np.uint16) * alpha16
+            self.inverse_alpha = 255 - alpha16
+
+    @staticmethod
+    def canvas(width: int, height: int, color: Optional[Tuple[int, int, int]] = None) -> np.ndarray:
+        """
+        Create a BGRA canvas to draw a sprite on with the usual cv2 calls.
+
+        Args:
+            width: Canvas width
+            height: Canvas height
+            color: Opaque BGR background, or None for a transparent canvas
+
+        Returns:
+            BGRA image; draw with 4-tuple colors such as (255, 255, 255, 255)
+        """
+        canvas = np.zeros((height, width, 4), dtype=np.uint8)
+        if color is not None:
+            canvas[:] = (*color, 255)
+        return canvas
+
+    def blend(self, frame: np.ndarray, x: Optional[int] = None, y: Optional[int] = None) -> np.ndarray:
+        """
+        Blend the sprite onto a BGR frame in place, clipped to the frame.
+
+        Args:
+            frame: BGR frame to draw on
+            x: Left position (defaults to the sprite's own position)
+            y: Top position (defaults to the sprite's own position)
+
+        Returns:
+            The same frame
+        """
+        x = self.x if x is None else int(x)
+        y = self.y if y is None else int(y)
+
+        # Clip the sprite against the frame edges
+        fx1, fy1 = max(x, 0), max(y, 0)
+        fx2 = min(x + self.width, frame.shape[1])
+        fy2 = min(y + self.height, frame.shape[0])
+        if fx2 <= fx1 or fy2 <= fy1:
+            return frame
+        sx1, sy1 = fx1 - x, fy1 - y
+        sx2, sy2 = sx1 + (fx2 - fx1), sy1 + (fy2 - fy1)
+
+        roi = frame[fy1:fy2, fx1:fx2]
+        if self.mode == 'opaque':
+            roi[:] = self.bgr[sy1:sy2, sx1:sx2]
+        elif self.mode == 'mask':
+            np.copyto(roi, self.bgr[sy1:sy2, sx1:sx2], where=self.mask[sy1:sy2, sx1:sx2])
+        else:
+            blended = roi * self.inverse_alpha[sy1:sy2, sx1:sx2]
+            blended += self.premultiplied[sy1:sy2, sx1:sx2]
+            roi[:] = blended // 255
+        return frame
+
+
+class OverlayLayer:
+    """
+    Cache of named sprites, each rebuilt only when its state key changes.
+    """
+
+    def __init__(self, max_sprites: int = 64):
+        """
+        Initialize the layer.
+
+        Args:
+            max_sprites: Number of sprites kept before the least recently used is dropped
+        """
+        self.max_sprites = max_sprites
+        self._sprites = OrderedDict()
+        self.rebuilds = 0
+
+    def sprite(self, name: Hashable, key: Hashable, render: Callable[[], Sprite]) -> Sprite:
+        """
+        Get a cached sprite, rendering it again if its key changed.
+
+        Args:
+            name: Identifies the overlay element (e.g. 'sentence_panel')
+            key: Everything the sprite's content depends on
+            render: Builds a new Sprite when the cache is stale
+
+        Returns:
+            The cached or freshly rendered sprite
+        """
+        cached = self._sprites.get(name)
+        if cached is not None and cached[0] == key:
+            self._sprites.move_to_end(name)
+            return cached[1]
+
+        sprite = render()
+        self.rebuilds += 1
+        self._sprites[name] = (key, sprite)
+        self._sprites.move_to_end(name)
+        while len(self._sprites) > self.max_sprites:
+            self._sprites.popitem(last=False)
+        return sprite
+
+    def draw(
+        self,
+        frame: np.ndarray,
+        name: Hashable,
+        key: Hashable,
+        render: Callable[[], Sprite],
+        x: Optional[int] = None,
+        y: Optional[int] = None
+    ) -> np.ndarray:
+        """
+        Blend a cached sprite onto a frame, rebuilding it first if needed.
+
+        Returns:
+            The same frame
+        """
+        return self.sprite(name, key, render).blend(frame, x, y)
+
+    def clear(self):
+        """Drop every cached sprite."""
+        self._sprites.clear()
+
+
+def text_sprite(
+    text: str,
+    font_scale: float,
+    color: Tuple[int, int, int],
+    thickness: int = 1,
+    background: Optional[Tuple[int, int, int]] = None,
+    padding: int = 0
+) -> Sprite:
+    """
+    Render one line of text into a sprite.
+
+    Args:
+        text: Text to render
+        font_scale: cv2.FONT_HERSHEY_SIMPLEX scale
+        color: BGR text color
+        thickness: Stroke thickness
+        background: Opaque BGR background, or None for transparent
+        padding: Extra pixels below the baseline
+
+    Returns:
+        Sprite whose `baseline` attribute is the text baseline offset from its top
+    """
+    (text_width, text_height), baseline = cv2.getTextSize(
+        text, cv2.FONT_HERSHEY_SIMPLEX, font_scale, thickness
+    )
+    canvas = Sprite.canvas(text_width, text_height + max(baseline, padding), background)
+    cv2.putText(canvas, text, (0, text_height), cv2.FONT_HERSHEY_SIMPLEX,
+                font_scale, (*color, 255), thickness)
+    sprite = Sprite(canvas)
+    sprite.baseline = text_height
+    return sprite
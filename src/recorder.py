@@ -0,0 +1,212 @@
+"""
+Frame Recorder
+Saves screenshots and session recordings on a background writer thread, so
+JPEG/video encoding and disk writes never stall the camera loop.
+
+Frames are copied into a fixed pool of preallocated buffers and handed to the
+writer through a bounded queue. When the writer falls behind and no buffer is
+free the frame is dropped instead of blocking the caller, and the number of
+dropped frames is reported.
+"""
+
+import os
+import queue
+import threading
+import cv2
+import numpy as np
+from typing import Optional
+
+
+# Video codec chosen from the recording file extension
+FOURCC_BY_EXTENSION = {
+    '.mp4': 'mp4v',
+    '.avi': 'MJPG',
+}
+
+
+class FrameRecorder:
+    """
+    Asynchronous screenshot and session video writer.
+    """
+
+    def __init__(self, max_queue: int = 8, fps: float = 30.0):
+        """
+        Initialize the recorder and start its writer thread.
+
+        Args:
+            max_queue: Number of frames that can wait for the writer before new ones are dropped
+            fps: Frame rate written into session recordings
+        """
+        self.max_queue = max_queue
+        self.fps = fps
+
+        self.dropped_frames = 0
+        self.dropped_screenshots = 0
+        self.recorded_frames = 0
+        self.recording_path = None
+
+        # Frame buffers are allocated lazily for the first frame shape and recycled
+        self._free = queue.Queue()
+        self._buffer_shape = None
+        self._jobs = queue.Queue()
+        self._thread = threading.Thread(target=self._writer_loop, name='recorder', daemon=True)
+        self._thread.start()
+
+    @property
+    def is_recording(self) -> bool:
+        """Whether a session recording is in progress."""
+        return self.recording_path is not None
+
+    def _copy_frame(self, frame: np.ndarray) -> Optional[np.ndarray]:
+        """
+        Copy a frame into a free pool buffer without blocking.
+
+        Returns:
+            The buffer holding the copy, or None if every buffer is in use
+        """
+        if frame.shape != self._buffer_shape:
+            # New resolution: start a fresh pool; old buffers are discarded as they come back
+            self._buffer_shape = frame.shape
+            self._free = queue.Queue()
+            for _ in range(self.max_queue):
+                self._free.put(np.empty(frame.shape, dtype=frame.dtype))
+
+        try:
+            buffer = self._free.get_nowait()
+        except queue.Empty:
+            return None
+        np.copyto(buffer, frame)
+        return buffer
+
+    def screenshot(self, frame: np.ndarray, filename: str) -> bool:
+        """
+        Queue a frame to be saved as an image.
+
+        Args:
+            frame: BGR frame; it is copied, so the caller may reuse it immediately
+            filename: Output path (format chosen by extension)
+
+        Returns:
+            True if queued, False if dropped because the writer is behind
+        """
+        buffer = self._copy_frame(frame)
+        if buffer is None:
+            self.dropped_screenshots += 1
+            return False
+        self._jobs.put(('image', filename, buffer, self._free))
+        return True
+
+    def start_recording(self, filename: str):
+        """
+        Start a session recording.
+
+        Args:
+            filename: Output path; '.avi' records MJPEG, anything else MP4
+        """
+        if self.is_recording:
+            self.stop_recording()
+        self.recording_path = filename
+        self.recorded_frames = 0
+        self.dropped_frames = 0
+        self._jobs.put(('open', filename, None, None))
+
+    def write(self, frame: np.ndarray) -> bool:
+        """
+        Queue a frame for the current recording. Does nothing when not recording.
+
+        Args:
+            frame: BGR frame; it is copied, so the caller may reuse it immediately
+
+        Returns:
+            True if queued, False if not recording or dropped
+        """
+        if not self.is_recording:
+            return False
+        buffer = self._copy_frame(frame)
+        if buffer is None:
+            self.dropped_frames += 1
+            return False
+        self.recorded_frames += 1
+        self._jobs.put(('frame', None, buffer, self._free))
+        return True
+
+    def stop_recording(self) -> Optional[str]:
+        """
+        Finish the current recording once the writer has flushed its queued frames.
+
+        Returns:
+            Path of the finished recording, or None if not recording
+        """
+        if not self.is_recording:
+            return None
+        path = self.recording_path
+        self.recording_path = None
+        self._jobs.put(('close', path, None, None))
+        print(f"Recording saved: {path} ({self.recorded_frames} frames, {self.dropped_frames} dropped)")
+        return path
+
+    def toggle_recording(self, filename: str) -> bool:
+        """
+        Start recording to filename, or stop the current recording.
+
+        Returns:
+            True if a recording is now in progress
+        """
+        if self.is_recording:
+            self.stop_recording()
+        else:
+            self.start_recording(filename)
+            print(f"Recording: {filename}")
+        return self.is_recording
+
+    def _writer_loop(self):
+        """Encode and write queued jobs until closed."""
+        writer = None
+        video_path = None
+        video_size = None
+        while True:
+            kind, filename, buffer, pool = self._jobs.get()
+            try:
+                if kind == 'image':
+                    if not cv2.imwrite(filename, buffer):
+                        print(f"Error: could not save {filename}")
+                elif kind == 'open':
+                    # The writer is created with the size of the first frame
+                    if writer is not None:
+                        writer.release()
+                    writer = None
+                    video_path = filename
+                elif kind == 'frame':
+                    if writer is None:
+                        height, width = buffer.shape[:2]
+                        video_size = (width, height)
+                        extension = os.path.splitext(video_path)[1].lower()
+                        fourcc = cv2.VideoWriter_fourcc(*FOURCC_BY_EXTENSION.get(extension, 'mp4v'))
+                        writer = cv2.VideoWriter(video_path, fourcc, self.fps, video_size)
+                    if buffer.shape[1::-1] != video_size:
+                        # Capture size changed mid-recording (idle mode): keep the video size
+                        writer.write(cv2.resize(buffer, video_size))
+                    else:
+                        writer.write(buffer)
+                elif kind == 'close':
+                    if writer is not None:
+                        writer.release()
+                    writer = None
+                elif kind == 'stop':
+                    if writer is not None:
+                        writer.release()
+                    return
+            except Exception as e:
+                print(f"Recorder error: {e}")
+            finally:
+                if buffer is not None:
+                    pool.put(buffer)
+                self._jobs.task_done()
+
+    def close(self):
+        """Finish any recording, write everything still queued and stop the writer thread."""
+        self.stop_recording()
+        self._jobs.put(('stop', None, None, None))
+        self._thread.join()
+        if self.dropped_screenshots:
+            print(f"Recorder dropped {self.dropped_screenshots} screenshots")
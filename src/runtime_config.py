@@ -0,0 +1,199 @@
+"""
+Runtime Configuration
+One CPU thread budget shared by every pipeline in the process, so torch's
+intra-op pool, OpenCV's internal pool and MediaPipe's executors do not each
+assume they own the whole machine.
+
+Each entry point calls configure_runtime() with the pipelines it runs; the
+budget is split between them by weight:
+
+    hands   - MediaPipe hand landmarks (graph threads, multi-signer crop workers)
+    objects - object detection (torch intra-op threads)
+    opencv  - OpenCV's internal parallel_for pool (colour conversion, resize, drawing)
+
+MediaPipe has no thread-count setting, so its share is enforced by CPU
+affinity: on Linux a thread's affinity is inherited by the threads it starts,
+so worker threads started inside pinned() only run on that pipeline's CPUs.
+MediaPipe starts its executors when the graph is built, but torch starts its
+pool lazily on the first inference, so object detection runs every inference
+inside pinned(). Pinning is optional (pin=True or BRIDGING_WORLDS_PIN_CPUS=1).
+
+Only configure_runtime() changes process-wide settings; get_runtime() just
+reads the active plan, so library code never resizes pools on its own.
+
+Environment:
+    BRIDGING_WORLDS_CPU_BUDGET  - number of CPUs to use (default: all available)
+    BRIDGING_WORLDS_PIN_CPUS    - pin each pipeline to its own CPUs
+"""
+
+import os
+import sys
+from collections import namedtuple
+from contextlib import contextmanager
+from typing import Dict, Iterable, List, Optional, Sequence
+
+import cv2
+
+
+# Relative share of the budget for each pipeline
+PIPELINE_WEIGHTS = {
+    'hands': 2,
+    'objects': 3,
+    'opencv': 1,
+}
+
+ThreadAssignment = namedtuple('ThreadAssignment', ['threads', 'cpus'])
+
+
+def available_cpus() -> List[int]:
+    """CPUs this process may run on."""
+    if hasattr(os, 'sched_getaffinity'):
+        return sorted(os.sched_getaffinity(0))
+    return list(range(os.cpu_count() or 1))
+
+
+class RuntimeConfig:
+    """
+    Thread counts and CPU sets for the pipelines of one process.
+    """
+
+    def __init__(
+        self,
+        pipelines: Iterable[str] = tuple(PIPELINE_WEIGHTS),
+        budget: Optional[int] = None,
+        pin: Optional[bool] = None
+    ):
+        """
+        Split the CPU budget between pipelines.
+
+        Args:
+            pipelines: Pipelines running in this process ('opencv' is always included)
+            budget: Number of CPUs to use (default: BRIDGING_WORLDS_CPU_BUDGET or all available)
+            pin: Pin pipelines to disjoint CPU sets (default: BRIDGING_WORLDS_PIN_CPUS)
+        """
+        cpus = available_cpus()
+        if budget is None:
+            budget = int(os.environ.get('BRIDGING_WORLDS_CPU_BUDGET', 0)) or len(cpus)
+        if pin is None:
+            pin = os.environ.get('BRIDGING_WORLDS_PIN_CPUS', '') not in ('', '0')
+
+        self.budget = max(1, min(budget, len(cpus)))
+        self.pin = pin and hasattr(os, 'sched_setaffinity')
+        self.applied = False
+        self.assignments = self._plan(list(dict.fromkeys(list(pipelines) + ['opencv'])), cpus)
+
+    def _plan(self, pipelines: Sequence[str], cpus: List[int]) -> Dict[str, ThreadAssignment]:
+        """Share the budget by weight (largest remainder), at least one thread each."""
+        for name in pipelines:
+            if name not in PIPELINE_WEIGHTS:
+                raise ValueError(f"Unknown pipeline '{name}', expected one of {sorted(PIPELINE_WEIGHTS)}")
+
+        total_weight = sum(PIPELINE_WEIGHTS[name] for name in pipelines)
+        shares = {name: self.budget * PIPELINE_WEIGHTS[name] / total_weight for name in pipelines}
+        threads = {name: max(1, int(share)) for name, share in shares.items()}
+        leftover = self.budget - sum(threads.values())
+        for name in sorted(pipelines, key=lambda n: shares[n] - int(shares[n]), reverse=True):
+            if leftover <= 0:
+                break
+            threads[name] += 1
+            leftover -= 1
+
+        # Consecutive CPU ranges; pipelines overlap only when the budget is smaller than their count
+        assignments = {}
+        start = 0
+        budget_cpus = cpus[:self.budget]
+        for name in pipelines:
+            count = threads[name]
+            assigned = [budget_cpus[(start + i) % len(budget_cpus)] for i in range(count)]
+            assignments[name] = ThreadAssignment(count, assigned)
+            start += count
+        return assignments
+
+    def threads(self, pipeline: str) -> int:
+        """Thread count assigned to a pipeline."""
+        return self.assignments[pipeline].threads if pipeline in self.assignments else 1
+
+    def apply_global(self):
+        """Apply the process-wide settings: OpenCV's pool and, if already loaded, torch."""
+        cv2.setNumThreads(self.threads('opencv'))
+        self.applied = True
+        if 'torch' in sys.modules and 'objects' in self.assignments:
+            self.apply_torch()
+
+    def apply_torch(self):
+        """Limit torch's intra-op pool to the object detection share."""
+        import torch
+
+        torch.set_num_threads(self.threads('objects'))
+
+    def pin_thread(self, pipeline: str):
+        """
+        Keep the calling thread on a pipeline's CPUs when pinning is enabled.
+
+        For worker threads that belong to one pipeline for their whole life,
+        e.g. as a ThreadPoolExecutor initializer.
+        """
+        if self.pin and pipeline in self.assignments:
+            # On Linux, pid 0 addresses the calling thread only
+            os.sched_setaffinity(0, self.assignments[pipeline].cpus)
+
+    @contextmanager
+    def pinned(self, pipeline: str):
+        """
+        Run a block on a pipeline's CPUs when pinning is enabled.
+
+        Threads started inside the block (e.g. a MediaPipe graph's executors)
+        keep that CPU set; the calling thread's affinity is restored afterwards.
+        """
+        if not self.pin or pipeline not in self.assignments:
+            yield
+            return
+
+        previous = os.sched_getaffinity(0)
+        self.pin_thread(pipeline)
+        try:
+            yield
+        finally:
+            os.sched_setaffinity(0, previous)
+
+    def describe(self) -> str:
+        """One line summary of the plan."""
+        parts = [
+            f"{name}={assignment.threads}" + (f"@{assignment.cpus}" if self.pin else "")
+            for name, assignment in self.assignments.items()
+        ]
+        return f"CPU budget {self.budget}: " + ", ".join(parts)
+
+
+_runtime = None
+
+
+def configure_runtime(
+    pipelines: Iterable[str],
+    budget: Optional[int] = None,
+    pin: Optional[bool] = None
+) -> RuntimeConfig:
+    """
+    Plan the thread budget for the pipelines an entry point runs and apply it.
+
+    Args:
+        pipelines: Pipelines running in this process, e.g. ['hands', 'objects']
+        budget: Number of CPUs to use
+        pin: Pin pipelines to disjoint CPU sets
+
+    Returns:
+        The active RuntimeConfig
+    """
+    global _runtime
+    _runtime = RuntimeConfig(pipelines, budget, pin)
+    _runtime.apply_global()
+    print(_runtime.describe())
+    return _runtime
+
+
+def get_runtime() -> RuntimeConfig:
+    """Get the active runtime config (every pipeline sharing the machine if none was configured)."""
+    global _runtime
+    if _runtime is None:
+        _runtime = RuntimeConfig()
+    return _runtime
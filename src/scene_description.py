@@ -0,0 +1,242 @@
+"""
+Scene Description
+Turns detections into the Vision Assistant's spoken scene description.
+
+The text only depends on a small quantized signature of the scene: for each
+class, in order of first appearance, its count, its colour tally and the
+distance/position bucket of its closest member. The signature is built in
+one pass grouped on class ids, and complete descriptions are kept in an LRU
+keyed by it, so a repeated or unchanged scene costs only the signature.
+Per-class phrases are cached as well, so a scene where one class changed
+rebuilds only that phrase.
+"""
+
+from collections import OrderedDict
+from typing import Dict, Hashable, List, Optional, Tuple
+
+from depth_stage import FOCAL_PER_WIDTH, KNOWN_HEIGHTS
+
+
+POSITIONS = ("on your left", "in front of you", "on your right")
+DISTANCES = ("very close", "close", "at medium distance", "far away")
+
+NUMBER_WORDS = {
+    1: "one", 2: "two", 3: "three", 4: "four", 5: "five",
+    6: "six", 7: "seven", 8: "eight", 9: "nine", 10: "ten"
+}
+
+# One class in a scene signature
+GroupSignature = Tuple[str, int, Tuple[Tuple[str, int], ...], int, int]
+
+
+def count_word(count: int) -> str:
+    """Convert counts to words for numbers 1-10."""
+    return NUMBER_WORDS.get(count, str(count))
+
+
+def pluralize(class_name: str, count: int) -> str:
+    """Make a class name plural if needed."""
+    if count <= 1:
+        return class_name
+    # Handle irregular plurals
+    if class_name.endswith('s') or class_name.endswith('sh') or class_name.endswith('ch'):
+        return f"{class_name}es"
+    elif class_name.endswith('y') and class_name not in ['toy', 'key', 'boy']:
+        return f"{class_name[:-1]}ies"
+    return f"{class_name}s"
+
+
+class _LRU:
+    """Small least-recently-used map."""
+
+    def __init__(self, max_entries: int):
+        self.max_entries = max_entries
+        self._entries = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def get(self, key: Hashable):
+        value = self._entries.get(key)
+        if value is None:
+            self.misses += 1
+            return None
+        self.hits += 1
+        self._entries.move_to_end(key)
+        return value
+
+    def put(self, key: Hashable, value):
+        self._entries[key] = value
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.max_entries:
+            self._entries.popitem(last=False)
+
+    def clear(self):
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+class SceneDescriber:
+    """
+    Memoized natural language scene descriptions.
+    """
+
+    def __init__(self, class_names: Dict[int, str], max_descriptions: int = 256, max_phrases: int = 1024):
+        """
+        Initialize the caches.
+
+        Args:
+            class_names: Detector class names by class id
+            max_descriptions: Complete descriptions kept (LRU)
+            max_phrases: Per-class phrases kept (LRU)
+        """
+        # Known real-world height per class id, for pinhole distances
+        # (depth_stage.pinhole_distance without the per-detection name lookup)
+        self.known_heights = {
+            class_id: KNOWN_HEIGHTS[name] for class_id, name in class_names.items() if name in KNOWN_HEIGHTS
+        }
+        # Class id by name, for detection dicts from before 'class_id' was added
+        self._class_ids = {name: class_id for class_id, name in class_names.items()}
+
+        self.descriptions = _LRU(max_descriptions)
+        self.phrases = _LRU(max_phrases)
+
+    def signature(
+        self,
+        detections: List[dict],
+        frame_width: int,
+        frame_height: Optional[int] = None,
+        depth_stage=None
+    ) -> Tuple[GroupSignature, ...]:
+        """
+        Quantized scene signature: one (class name, count, colour tally, distance
+        bucket, position bucket) entry per class, in order of first appearance.
+
+        The colour tally lists (colour, count) in order of first appearance;
+        distance and position are those of the class's closest detection (the
+        first one on ties).
+
+        Args:
+            detections: Detection dicts from VisionAssistant.detect_objects
+            frame_width: Frame width in pixels
+            frame_height: Frame height in pixels (needed for depth-map distances)
+            depth_stage: Optional DepthStage for metric distances
+        """
+        use_depth = depth_stage is not None and bool(frame_height)
+        frame_shape = (frame_height, frame_width)
+        focal = FOCAL_PER_WIDTH * frame_width
+        left_edge = frame_width * 0.33
+        right_edge = frame_width * 0.67
+        known_heights = self.known_heights
+        class_ids = self._class_ids
+
+        # class id -> [class name, count, colour tally, closest distance bucket, its position bucket]
+        groups = {}
+        for det in detections:
+            x1, y1, x2, y2 = det['bbox']
+            class_id = det.get('class_id')
+            if class_id is None:
+                # Unknown names group by name
+                class_id = class_ids.get(det['class'], det['class'])
+            box_height = y2 - y1
+
+            # Distance: metric bucket from the depth map or the class's known height, else box height
+            meters = depth_stage.distance(det['bbox'], frame_shape) if use_depth else None
+            if meters is None:
+                height_m = known_heights.get(class_id)
+                if height_m is not None and box_height > 0:
+                    meters = focal * height_m / box_height
+            if meters is not None:
+                distance = 0 if meters < 1.0 else 1 if meters < 2.0 else 2 if meters < 4.0 else 3
+            else:
+                distance = 0 if box_height > 300 else 1 if box_height > 200 else 2 if box_height > 100 else 3
+
+            group = groups.get(class_id)
+            if group is None:
+                group = groups[class_id] = [det['class'], 0, {}, len(DISTANCES), 0]
+            group[1] += 1
+            color = det.get('color')
+            if color:
+                group[2][color] = group[2].get(color, 0) + 1
+            if distance < group[3]:
+                center_x = (x1 + x2) / 2
+                group[3] = distance
+                group[4] = 0 if center_x < left_edge else 2 if center_x > right_edge else 1
+
+        return tuple(
+            (name, count, tuple(tally.items()), distance, position)
+            for name, count, tally, distance, position in groups.values()
+        )
+
+    def phrase(self, group: GroupSignature) -> str:
+        """Spoken phrase for one class of a signature (cached)."""
+        text = self.phrases.get(group)
+        if text is not None:
+            return text
+
+        class_name, count, tally, distance, position = group
+        where = f"{DISTANCES[distance]} {POSITIONS[position]}"
+
+        if count == 1:
+            color = f"{tally[0][0]} " if tally else ""
+            text = f"one {color}{class_name} {where}"
+        else:
+            number = count_word(count)
+            plural_name = pluralize(class_name, count)
+            colored = sum(n for _, n in tally)
+            if len(tally) == 1:
+                # All same color
+                object_desc = f"{number} {tally[0][0]} {plural_name}"
+            elif len(tally) > 1 and colored >= count * 0.7:
+                # Multiple colors; ties go to the color seen first
+                dominant = max(tally, key=lambda entry: entry[1])[0]
+                object_desc = f"{number} {plural_name}, mostly {dominant}"
+            else:
+                object_desc = f"{number} {plural_name}"
+            text = f"{object_desc}, with one {where}"
+
+        self.phrases.put(group, text)
+        return text
+
+    def describe(
+        self,
+        detections: List[dict],
+        frame_width: int,
+        frame_height: Optional[int] = None,
+        depth_stage=None
+    ) -> str:
+        """
+        Natural language description of the detections (cached by scene signature).
+
+        Args:
+            detections: Detection dicts from VisionAssistant.detect_objects
+            frame_width: Frame width in pixels
+            frame_height: Frame height in pixels
+            depth_stage: Optional DepthStage for metric distances
+
+        Returns:
+            Description such as "I see one red car far away on your left."
+        """
+        if not detections:
+            return "No objects detected in view."
+
+        key = self.signature(detections, frame_width, frame_height, depth_stage)
+        text = self.descriptions.get(key)
+        if text is not None:
+            return text
+
+        object_descriptions = [self.phrase(group) for group in key]
+
+        # Combine all descriptions
+        if len(object_descriptions) == 1:
+            text = f"I see {object_descriptions[0]}."
+        elif len(object_descriptions) == 2:
+            text = f"I see {object_descriptions[0]}, and {object_descriptions[1]}."
+        else:
+            # List all but last with commas, then "and" for the last one
+            all_but_last = ", ".join(object_descriptions[:-1])
+            text = f"I see {all_but_last}, and {object_descriptions[-1]}."
+
+        self.descriptions.put(key, text)
+        return text
@@ -0,0 +1,18 @@
+"""
+Shared Memory Helpers
+Small utilities shared by the modules that pass data between processes
+through multiprocessing.shared_memory (frame ring, keypoint stream).
+"""
+
+import sys
+from multiprocessing import shared_memory
+
+
+def untrack(shm: shared_memory.SharedMemory):
+    """Stop the resource tracker from unlinking a segment this process only attached to."""
+    if sys.version_info < (3, 13) and sys.platform != 'win32':
+        from multiprocessing import resource_tracker
+        try:
+            resource_tracker.unregister(shm._name, 'shared_memory')
+        except Exception:
+            pass
@@ -0,0 +1,445 @@
+"""
+Soak Mode
+Replays a recorded video through the sign language interpreter and the vision
+assistant pipelines for hours, looping the file, to find slow growth that
+only shows up on stations running all day.
+
+Every sample interval it records:
+    - process RSS and the Python heap traced by tracemalloc
+    - tracemalloc snapshots (the first one, after a warm-up, is the baseline)
+    - p50/p95/p99 latency per pipeline and FPS over the interval
+    - the number of objects tracked by the garbage collector
+
+The final report lists the source lines whose allocations grew most since the
+baseline, RSS and heap growth rates, and latency / FPS drift. RSS growing much
+faster than the traced heap points at native memory (MediaPipe graph, COM TTS
+objects, OpenCV) rather than Python objects.
+
+tracemalloc slows allocation-heavy code down, so absolute latencies are higher
+than in normal runs; compare them over time, not against other runs.
+
+Run with:  python src/soak_mode.py recording.mp4 --hours 12
+"""
+
+import argparse
+import csv
+import gc
+import os
+import time
+import tracemalloc
+import numpy as np
+from datetime import datetime
+from typing import Dict, List, Optional
+
+import cv2
+
+from detectors import DEFAULT_BACKEND
+from runtime_config import configure_runtime
+
+try:
+    import psutil
+except ImportError:
+    psutil = None
+
+
+PERCENTILES = (50, 95, 99)
+
+
+def rss_bytes() -> Optional[int]:
+    """Resident set size of this process (None when it cannot be read)."""
+    if psutil is not None:
+        return psutil.Process().memory_info().rss
+    try:
+        with open('/proc/self/statm') as f:
+            return int(f.read().split()[1]) * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, AttributeError):
+        return None
+
+
+class VideoReplay:
+    """
+    Endless frame source that loops a recorded video.
+    """
+
+    def __init__(self, path: str, realtime: bool = False):
+        """
+        Open the recording.
+
+        Args:
+            path: Video file to replay
+            realtime: Pace frames at the recording's frame rate instead of as fast as possible
+        """
+        self.cap = cv2.VideoCapture(path)
+        if not self.cap.isOpened():
+            raise IOError(f"Could not open {path}")
+        fps = self.cap.get(cv2.CAP_PROP_FPS) or 30.0
+        self.frame_interval = 1.0 / fps if realtime else 0.0
+        self.loops = 0
+        self._frame = None
+        self._next_time = time.perf_counter()
+
+    def read(self) -> np.ndarray:
+        """Next frame, rewinding at the end of the file."""
+        success, self._frame = self.cap.read(self._frame)
+        if not success:
+            self.cap.set(cv2.CAP_PROP_POS_FRAMES, 0)
+            self.loops += 1
+            success, self._frame = self.cap.read(self._frame)
+            if not success:
+                raise IOError("Could not read frames from the recording")
+
+        if self.frame_interval:
+            delay = self._next_time - time.perf_counter()
+            if delay > 0:
+                time.sleep(delay)
+            self._next_time = max(self._next_time + self.frame_interval, time.perf_counter())
+        return self._frame
+
+    def close(self):
+        self.cap.release()
+
+
+class HandsPipeline:
+    """
+    Per-frame work of the sign language interpreter, without the window.
+    """
+
+    name = 'hands'
+
+    def __init__(self, inference_ratio: int = 1):
+        from hand_keypoint_detection import (
+            SENTENCE_PANEL_HEIGHT,
+            HandKeypointDetector,
+            SentenceManager,
+            TextToSpeech,
+            draw_hand_landmarks,
+            render_hud_sprite,
+            render_sentence_panel
+        )
+        from landmark_filter import LandmarkPredictor
+        from overlay import OverlayLayer
+
+        self._draw_hand_landmarks = draw_hand_landmarks
+        self._render_hud_sprite = render_hud_sprite
+        self._render_sentence_panel = render_sentence_panel
+        self._panel_height = SENTENCE_PANEL_HEIGHT
+
+        # In-process inference, so everything the interpreter allocates is measured here
+        self.detector = HandKeypointDetector(
+            static_image_mode=False,
+            max_num_hands=2,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.5,
+            use_server=False
+        )
+        self.predictor = LandmarkPredictor(self.detector, inference_ratio=inference_ratio)
+        self.sentence_manager = SentenceManager(
+            "Hello my name is J O H N and I am a student in D U R H A M University", TextToSpeech()
+        )
+        self.overlay = OverlayLayer()
+        self._frame = None
+
+    def step(self, frame: np.ndarray):
+        """Detect, draw and build the overlays for one frame."""
+        if self._frame is None or self._frame.shape != frame.shape:
+            self._frame = np.empty_like(frame)
+        np.copyto(self._frame, frame)
+        image = self._frame
+
+        results = self.predictor.process(image)
+        self._draw_hand_landmarks(image, results)
+        hands_data = self.detector.get_keypoint_coordinates(results, image.shape)
+
+        hud_key = tuple((hand_data['hand'], len(hand_data['keypoints'])) for hand_data in hands_data)
+        self.overlay.draw(image, 'hud', hud_key, lambda: self._render_hud_sprite(hands_data))
+        height, width = image.shape[:2]
+        self.overlay.draw(
+            image,
+            'sentence_panel',
+            (self.sentence_manager.revision, width),
+            lambda: self._render_sentence_panel(self.sentence_manager, width),
+            0,
+            height - self._panel_height
+        )
+
+    def speak(self):
+        """Advance the sentence by one word (spoken through the TTS engine)."""
+        if self.sentence_manager.is_complete():
+            self.sentence_manager.reset()
+        else:
+            self.sentence_manager.next_word()
+
+    def close(self):
+        self.detector.close()
+        self.sentence_manager.close()
+
+
+class VisionPipeline:
+    """
+    Per-frame work of the vision assistant, without the window.
+    """
+
+    name = 'objects'
+
+    def __init__(self, backend: str = DEFAULT_BACKEND):
+        from vision_assistant import VisionAssistant
+
+        self.assistant = VisionAssistant(use_server=False, open_camera=False, backend=backend)
+        self.detections = []
+        self._frame = None
+
+    def step(self, frame: np.ndarray):
+        """Detect, record history and draw for one frame."""
+        if self._frame is None or self._frame.shape != frame.shape:
+            self._frame = np.empty_like(frame)
+        np.copyto(self._frame, frame)
+
+        self.detections = self.assistant.detect_objects(self._frame)
+        self.assistant.history.add(self.detections)
+        self.assistant.draw_detections(self._frame, self.detections)
+        self.assistant.draw_hud(self._frame, len(self.detections))
+
+    def speak(self):
+        """Describe the scene and what passed by, as on the S and P keys."""
+        height, width = self._frame.shape[:2]
+        if self.detections:
+            self.assistant.speak(self.assistant.analyze_scene(self.detections, width, height))
+        else:
+            self.assistant.speak("No objects detected in view")
+        self.assistant.speak(self.assistant.describe_recent(5.0))
+
+    def close(self):
+        self.assistant.cleanup()
+
+
+class SoakMonitor:
+    """
+    Periodic memory and latency samples with a drift report.
+    """
+
+    def __init__(self, traceback_depth: int = 1, top: int = 15):
+        """
+        Start tracing allocations.
+
+        Args:
+            traceback_depth: Frames stored per allocation (more shows callers, costs more)
+            top: Number of allocation growth sites in the report
+        """
+        self.top = top
+        self.samples: List[Dict[str, float]] = []
+        self.baseline = None
+        self.snapshot = None
+
+        # Latencies of the current interval only, so the monitor itself does not grow
+        self._latencies: Dict[str, List[float]] = {}
+        self._frames = 0
+        self._start = time.perf_counter()
+        self._interval_start = self._start
+
+        tracemalloc.start(traceback_depth)
+
+    def record(self, name: str, seconds: float):
+        """Add one latency measurement."""
+        self._latencies.setdefault(name, []).append(seconds)
+
+    def frame_done(self):
+        self._frames += 1
+
+    def _take_snapshot(self) -> tracemalloc.Snapshot:
+        """Snapshot without the tracer's and this module's own allocations."""
+        return tracemalloc.take_snapshot().filter_traces((
+            tracemalloc.Filter(False, tracemalloc.__file__),
+            tracemalloc.Filter(False, __file__),
+            tracemalloc.Filter(False, '<frozen importlib._bootstrap>'),
+            tracemalloc.Filter(False, '<unknown>'),
+        ))
+
+    def sample(self) -> Dict[str, float]:
+        """Close the current interval and record a sample (the first becomes the baseline)."""
+        now = time.perf_counter()
+        traced, _ = tracemalloc.get_traced_memory()
+        rss = rss_bytes()
+        sample = {
+            'elapsed_h': (now - self._start) / 3600,
+            'frames': self._frames,
+            'fps': self._frames / max(now - self._interval_start, 1e-6),
+            'rss_mb': rss / 2**20 if rss is not None else float('nan'),
+            'traced_mb': traced / 2**20,
+            'gc_objects': len(gc.get_objects()),
+        }
+        for name, values in sorted(self._latencies.items()):
+            for p, value in zip(PERCENTILES, np.percentile(values, PERCENTILES)):
+                sample[f'{name}_p{p}_ms'] = float(value) * 1000
+
+        self.snapshot = self._take_snapshot()
+        if self.baseline is None:
+            self.baseline = self.snapshot
+
+        self.samples.append(sample)
+        self._latencies = {}
+        self._frames = 0
+        self._interval_start = time.perf_counter()
+
+        print(f"[soak {sample['elapsed_h']:.2f}h] {sample['fps']:.1f} FPS, RSS {sample['rss_mb']:.1f} MB, "
+              f"traced {sample['traced_mb']:.1f} MB, "
+              f"frame p99 {sample.get('frame_p99_ms', float('nan')):.1f} ms")
+        return sample
+
+    @staticmethod
+    def _slope_per_hour(hours: np.ndarray, values: np.ndarray) -> float:
+        """Least squares growth per hour (0 with fewer than two samples)."""
+        valid = ~np.isnan(values)
+        if valid.sum() < 2 or np.ptp(hours[valid]) == 0:
+            return 0.0
+        return float(np.polyfit(hours[valid], values[valid], 1)[0])
+
+    def report(self) -> str:
+        """Drift and allocation growth since the baseline sample."""
+        if len(self.samples) < 2:
+            return "Soak report: not enough samples (run longer than the warm-up and one sample interval)"
+
+        # The baseline sample includes warm-up; drift is measured from it onwards
+        samples = self.samples[1:]
+        hours = np.array([s['elapsed_h'] for s in samples])
+        duration = self.samples[-1]['elapsed_h'] - self.samples[0]['elapsed_h']
+
+        def column(key):
+            return np.array([s.get(key, float('nan')) for s in samples])
+
+        def change(key):
+            # Intermittent latencies (speech) only appear in some intervals: use the
+            # first and last intervals that have them
+            having = [s[key] for s in samples if key in s]
+            before, after = (having[0], having[-1]) if having else (float('nan'), float('nan'))
+            percent = (after - before) / before * 100 if before else float('nan')
+            return f"{before:10.2f} -> {after:10.2f} ({percent:+.1f}%)"
+
+        lines = [
+            "=" * 72,
+            f"SOAK REPORT ({duration:.2f} h measured after warm-up, {len(self.samples)} samples)",
+            "=" * 72,
+            "",
+            "Memory",
+            f"  RSS (MB)            {change('rss_mb')}   {self._slope_per_hour(hours, column('rss_mb')):+.2f} MB/h",
+            f"  Traced heap (MB)    {change('traced_mb')}   "
+            f"{self._slope_per_hour(hours, column('traced_mb')):+.2f} MB/h",
+            f"  GC objects          {change('gc_objects')}   "
+            f"{self._slope_per_hour(hours, column('gc_objects')):+.0f} /h",
+        ]
+        native = self._slope_per_hour(hours, column('rss_mb') - column('traced_mb'))
+        lines.append(f"  Untraced (native)   {native:+.2f} MB/h (RSS growth not explained by Python allocations)")
+
+        lines += ["", "Throughput and latency (first -> last interval)",
+                  f"  FPS                 {change('fps')}   {self._slope_per_hour(hours, column('fps')):+.2f} /h"]
+        latency_keys = sorted({key for s in samples for key in s if key.endswith('_ms')})
+        for key in latency_keys:
+            lines.append(f"  {key:<20}{change(key)}")
+
+        lines += ["", f"Top {self.top} allocation growth sites since the baseline"]
+        growth = [
+            stat for stat in self.snapshot.compare_to(self.baseline, 'lineno')
+            if stat.size_diff > 0
+        ][:self.top]
+        if not growth:
+            lines.append("  (none)")
+        for stat in growth:
+            frame = stat.traceback[0]
+            lines.append(f"  {stat.size_diff / 1024:+10.1f} KiB {stat.count_diff:+8d} blocks  "
+                         f"{frame.filename}:{frame.lineno}")
+        return "\n".join(lines)
+
+    def write(self, prefix: str):
+        """Write the report (<prefix>.txt) and every sample (<prefix>.csv)."""
+        with open(prefix + '.txt', 'w') as f:
+            f.write(self.report() + "\n")
+        keys = list(dict.fromkeys(key for sample in self.samples for key in sample))
+        with open(prefix + '.csv', 'w', newline='') as f:
+            writer = csv.DictWriter(f, fieldnames=keys)
+            writer.writeheader()
+            writer.writerows(self.samples)
+
+    def stop(self):
+        tracemalloc.stop()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Replay a recording through both apps and report memory/latency drift")
+    parser.add_argument('video', help="Recorded camera input to loop")
+    parser.add_argument('--hours', type=float, default=12.0, help="Run time")
+    parser.add_argument('--app', choices=['both', 'hands', 'vision'], default='both', help="Pipelines to run")
+    parser.add_argument('--backend', choices=['yolo', 'mobilenet-ssd'], default=DEFAULT_BACKEND,
+                        help="Object detector backend")
+    parser.add_argument('--inference-ratio', type=int, default=1, help="Hand landmark inference ratio")
+    parser.add_argument('--warmup', type=float, default=60.0, help="Seconds before the baseline snapshot")
+    parser.add_argument('--interval', type=float, default=60.0, help="Seconds between samples")
+    parser.add_argument('--speak-every', type=int, default=900,
+                        help="Frames between speech requests (exercises the TTS engine; 0 disables)")
+    parser.add_argument('--realtime', action='store_true', help="Replay at the recording's frame rate")
+    parser.add_argument('--traceback-depth', type=int, default=1, help="tracemalloc frames per allocation")
+    parser.add_argument('--top', type=int, default=15, help="Allocation growth sites in the report")
+    parser.add_argument('--output', default=f"soak_{datetime.now():%Y%m%d_%H%M%S}",
+                        help="Report path prefix (.txt report, .csv samples)")
+    args = parser.parse_args()
+
+    pipeline_names = ['hands', 'objects'] if args.app == 'both' else ['hands' if args.app == 'hands' else 'objects']
+    configure_runtime(pipeline_names)
+
+    # Trace from before the pipelines are built, so their allocations have file/line info
+    monitor = SoakMonitor(args.traceback_depth, args.top)
+    replay = VideoReplay(args.video, args.realtime)
+    pipelines = []
+    if 'hands' in pipeline_names:
+        pipelines.append(HandsPipeline(args.inference_ratio))
+    if 'objects' in pipeline_names:
+        pipelines.append(VisionPipeline(args.backend))
+
+    print(f"Soak: {args.video} through {', '.join(p.name for p in pipelines)} for {args.hours:g} h "
+          f"(baseline after {args.warmup:g}s, samples every {args.interval:g}s). Ctrl+C to stop early.")
+
+    start = time.perf_counter()
+    deadline = start + args.hours * 3600
+    next_sample = start + args.warmup
+    frame_id = 0
+
+    try:
+        while time.perf_counter() < deadline:
+            frame = replay.read()
+            frame_start = time.perf_counter()
+            for pipeline in pipelines:
+                step_start = time.perf_counter()
+                pipeline.step(frame)
+                monitor.record(pipeline.name, time.perf_counter() - step_start)
+            monitor.record('frame', time.perf_counter() - frame_start)
+            monitor.frame_done()
+            frame_id += 1
+
+            # Speech blocks on Windows, so it is timed separately from the frame
+            if args.speak_every and frame_id % args.speak_every == 0:
+                speech_start = time.perf_counter()
+                for pipeline in pipelines:
+                    pipeline.speak()
+                monitor.record('speech', time.perf_counter() - speech_start)
+
+            if time.perf_counter() >= next_sample:
+                monitor.sample()
+                next_sample += args.interval
+
+    except KeyboardInterrupt:
+        print("\nStopped early")
+
+    finally:
+        monitor.sample()
+        report = monitor.report()
+        monitor.write(args.output)
+        monitor.stop()
+        print("\n" + report)
+        print(f"\n{frame_id} frames, recording looped {replay.loops} times")
+        print(f"Report: {args.output}.txt, samples: {args.output}.csv")
+
+        replay.close()
+        for pipeline in pipelines:
+            pipeline.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,75 @@
+"""
+Speech Cache
+Synthesizes each sentence once and replays the audio afterwards. Scene
+descriptions repeat a lot (an unchanged room, "No objects detected in view"),
+and playing cached audio skips SAPI's text analysis and synthesis.
+
+Windows only: audio is rendered by SAPI into a memory stream, wrapped as WAV
+and played with winsound.
+"""
+
+import io
+import sys
+import wave
+from collections import OrderedDict
+
+if sys.platform == 'win32':
+    import win32com.client
+    import winsound
+
+
+# SAPI SpeechAudioFormatType for 22 kHz, 16-bit mono
+SAFT22kHz16BitMono = 22
+SAMPLE_RATE = 22050
+
+
+class SpeechCache:
+    """
+    Rendered speech audio by sentence (least recently used dropped first).
+    """
+
+    def __init__(self, rate: int = 1, volume: int = 100, max_entries: int = 64):
+        """
+        Create the SAPI voice used for rendering.
+
+        Args:
+            rate: Speaking rate (-10 to 10), as on the live voice
+            volume: Volume (0 to 100)
+            max_entries: Number of sentences kept
+        """
+        self.voice = win32com.client.Dispatch("SAPI.SpVoice")
+        self.voice.Rate = rate
+        self.voice.Volume = volume
+        self.max_entries = max_entries
+        self._audio = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+
+    def _render(self, text: str) -> bytes:
+        """Synthesize a sentence into WAV bytes."""
+        stream = win32com.client.Dispatch("SAPI.SpMemoryStream")
+        stream.Format.Type = SAFT22kHz16BitMono
+        self.voice.AudioOutputStream = stream
+        self.voice.Speak(text)
+
+        wav = io.BytesIO()
+        with wave.open(wav, 'wb') as writer:
+            writer.setnchannels(1)
+            writer.setsampwidth(2)
+            writer.setframerate(SAMPLE_RATE)
+            writer.writeframes(bytes(stream.GetData()))
+        return wav.getvalue()
+
+    def speak(self, text: str):
+        """Play a sentence, synthesizing it only the first time (blocks until played)."""
+        audio = self._audio.get(text)
+        if audio is None:
+            self.misses += 1
+            audio = self._render(text)
+            self._audio[text] = audio
+            while len(self._audio) > self.max_entries:
+                self._audio.popitem(last=False)
+        else:
+            self.hits += 1
+        self._audio.move_to_end(text)
+        winsound.PlaySound(audio, winsound.SND_MEMORY)
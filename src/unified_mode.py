@@ -0,0 +1,182 @@
+"""
+Unified Accessibility Mode
+Runs hand keypoint detection and object detection together on a single camera
+capture. Each mirrored frame is converted to RGB and HSV once, both models run
+concurrently on a thread pool, and their results share one overlay.
+"""
+
+import cv2
+import numpy as np
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import List, Tuple
+
+from hand_keypoint_detection import HandKeypointDetector, draw_hand_landmarks
+from recorder import FrameRecorder
+from runtime_config import configure_runtime
+from vision_assistant import VisionAssistant
+
+
+class UnifiedAccessibilityMode:
+    """
+    Hand keypoints and object detection sharing one capture and one overlay.
+    """
+
+    def __init__(self, camera_index: int = 0, width: int = 1280, height: int = 720):
+        """
+        Initialize both pipelines and the shared camera.
+
+        Args:
+            camera_index: OpenCV camera index
+            width: Requested capture width
+            height: Requested capture height
+        """
+        self.detector = HandKeypointDetector(
+            static_image_mode=False,
+            max_num_hands=2,
+            min_detection_confidence=0.7,
+            min_tracking_confidence=0.5
+        )
+        self.assistant = VisionAssistant(open_camera=False)
+
+        # MediaPipe and YOLO both release the GIL while inferring
+        self.executor = ThreadPoolExecutor(max_workers=2, thread_name_prefix='unified')
+
+        # Session recordings are encoded on a background thread
+        self.recorder = FrameRecorder()
+
+        self.cap = cv2.VideoCapture(camera_index)
+        if not self.cap.isOpened():
+            raise Exception("Could not open webcam")
+        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, width)
+        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, height)
+
+        # Buffers reused for every frame
+        self._raw = None
+        self._frame = None
+        self._rgb = None
+        self._hsv = None
+
+    def process_frame(self, frame: np.ndarray) -> Tuple[object, List[dict]]:
+        """
+        Run both models concurrently on one mirrored frame.
+
+        Args:
+            frame: Mirrored BGR frame
+
+        Returns:
+            Tuple of (MediaPipe hand results, object detections)
+        """
+        # Shared color conversions, done once per frame
+        self._rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB, dst=self._rgb)
+        self._hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV, dst=self._hsv)
+
+        hands_future = self.executor.submit(self.detector.process, frame, self._rgb)
+        objects_future = self.executor.submit(self.assistant.detect_objects, frame, self._hsv)
+        return hands_future.result(), objects_future.result()
+
+    def run(self):
+        """Main loop for the unified mode."""
+        print("\n" + "=" * 60)
+        print("UNIFIED ACCESSIBILITY MODE - Ready!")
+        print("=" * 60)
+        print("Controls:")
+        print("  Press 'S' - Describe the scene")
+        print("  Press 'P' - Describe what passed by recently")
+        print("  Press 'R' - Read text (signs, labels)")
+        print("  Press 'V' - Start/stop recording the session")
+        print("  Press 'Q' - Quit")
+        print("=" * 60 + "\n")
+
+        fps = 0.0
+        last_time = time.perf_counter()
+
+        try:
+            while True:
+                success, self._raw = self.cap.read(self._raw)
+                if not success:
+                    print("Failed to grab frame")
+                    break
+
+                # Flip frame horizontally to mirror the camera (more natural for user)
+                self._frame = frame = cv2.flip(self._raw, 1, dst=self._frame)
+
+                results, detections = self.process_frame(frame)
+                self.assistant.history.add(detections)
+                hands_data = self.detector.get_keypoint_coordinates(results, frame.shape)
+
+                # OCR works on the frame before anything is drawn on it
+                if self.assistant.read_text_requested:
+                    self.assistant.request_text_reading(frame)
+                self.assistant.speak_text_readings()
+
+                # Composite both results onto the one frame, hands on top
+                VisionAssistant.draw_detections(frame, detections)
+                draw_hand_landmarks(frame, results)
+
+                now = time.perf_counter()
+                fps = 0.9 * fps + 0.1 / max(now - last_time, 1e-6)
+                last_time = now
+
+                cv2.putText(
+                    frame,
+                    f"Hands: {len(hands_data)} | Objects: {len(detections)} | FPS: {fps:.1f}",
+                    (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX,
+                    0.8,
+                    (0, 255, 0),
+                    2
+                )
+                cv2.putText(frame, "Press 'S' to describe scene | 'P' recent | 'R' read text | 'Q' to quit",
+                            (10, frame.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX,
+                            0.5, (255, 255, 255), 1)
+
+                self.recorder.write(frame)
+                cv2.imshow('Unified Accessibility Mode', frame)
+
+                key = cv2.waitKey(1) & 0xFF
+                if key == ord('q') or key == ord('Q'):
+                    print("\nShutting down...")
+                    break
+                elif key == ord('s') or key == ord('S'):
+                    if detections:
+                        self.assistant.speak(self.assistant.analyze_scene(detections, frame.shape[1], frame.shape[0]))
+                    else:
+                        self.assistant.speak("No objects detected in view")
+                elif key == ord('p') or key == ord('P'):
+                    self.assistant.speak(self.assistant.describe_recent(5.0))
+                elif key == ord('r') or key == ord('R'):
+                    print("Reading text...")
+                    self.assistant.read_text_requested = True
+                elif key == ord('v') or key == ord('V'):
+                    self.recorder.toggle_recording(f"unified_session_{time.strftime('%Y%m%d_%H%M%S')}.mp4")
+
+        except KeyboardInterrupt:
+            print("\nInterrupted by user")
+
+        finally:
+            self.cleanup()
+
+    def cleanup(self):
+        """Clean up resources."""
+        self.executor.shutdown(wait=True)
+        self.recorder.close()
+        self.cap.release()
+        self.detector.close()
+        self.assistant.cleanup()
+
+
+def main():
+    """Main entry point."""
+    configure_runtime(['hands', 'objects'])
+    try:
+        mode = UnifiedAccessibilityMode()
+        mode.run()
+    except Exception as e:
+        print(f"Error: {e}")
+        import traceback
+        traceback.print_exc()
+
+
+if __name__ == "__main__":
+    main()
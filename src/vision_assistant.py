@@ -9,64 +9,82 @@ import numpy as np
 from datetime import datetime
 import time
 from collections import deque
-from ultralytics import YOLO
-import torch
 import sys
 import os
 
+from depth_stage import DepthStage
+from detection_history import DetectionHistory
+from detectors import DEFAULT_BACKEND, create_detector
+from inference_server import InferenceClient
+from overlay import OverlayLayer, text_sprite
+from recorder import FrameRecorder
+from runtime_config import configure_runtime, get_runtime
+from scene_description import SceneDescriber, count_word, pluralize
+from speech_cache import SpeechCache
+from text_reader import TextReader
+
 # Import TTS based on platform
 if sys.platform == 'win32':
     import win32com.client
 
+# Cached HUD sprites shared by every frame
+overlay_layer = OverlayLayer()
+
+
 class VisionAssistant:
-    def __init__(self):
+    def __init__(self, use_server=True, open_camera=True, backend=DEFAULT_BACKEND, depth=False):
         """Initialize the Vision Assistant with all necessary components."""
         print("Initializing Vision Assistant...")
         
         # Initialize Text-to-Speech engine for Windows
+        self.speech_cache = None
         if sys.platform == 'win32':
             self.tts_engine = win32com.client.Dispatch("SAPI.SpVoice")
             self.tts_engine.Rate = 1  # Speed (-10 to 10)
             self.tts_engine.Volume = 100  # Volume (0 to 100)
+            
+            # Repeated sentences (e.g. an unchanged scene) replay their rendered audio
+            try:
+                self.speech_cache = SpeechCache(rate=1, volume=100)
+            except Exception as e:
+                print(f"Speech cache unavailable: {e}")
         
-        # Initialize YOLO model for object detection
-        print("Loading YOLO model...")
-        # Get the model path relative to the project root
-        script_dir = os.path.dirname(os.path.abspath(__file__))
-        project_root = os.path.dirname(script_dir)
-        model_path = os.path.join(project_root, 'models', 'yolov8n.pt')
-        
-        # If model doesn't exist in models folder, download it there
-        if not os.path.exists(model_path):
-            os.makedirs(os.path.dirname(model_path), exist_ok=True)
-            self.model = YOLO('yolov8n.pt')  # Download
-            # Move to models folder
-            if os.path.exists('yolov8n.pt'):
-                import shutil
-                shutil.move('yolov8n.pt', model_path)
+        # Use the shared (YOLO) inference server if one is running, otherwise load
+        # the selected detector backend here
+        self.backend = backend
+        self.client = InferenceClient.connect() if use_server and backend == 'yolo' else None
+        if self.client is not None:
+            print("Using shared inference server")
+            self.detector = None
+            self.class_names = self.client.class_names()
         else:
-            self.model = YOLO(model_path)
-        
-        # Initialize webcam
-        self.cap = cv2.VideoCapture(0)
-        if not self.cap.isOpened():
-            raise Exception("Could not open webcam")
+            self.detector = create_detector(backend)
+            self.class_names = self.detector.names
         
-        # Set camera resolution
-        self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
-        self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
+        # Initialize webcam (skipped when another component owns the capture)
+        self.cap = None
+        if open_camera:
+            self.cap = cv2.VideoCapture(0)
+            if not self.cap.isOpened():
+                raise Exception("Could not open webcam")
+            
+            # Set camera resolution
+            self.cap.set(cv2.CAP_PROP_FRAME_WIDTH, 640)
+            self.cap.set(cv2.CAP_PROP_FRAME_HEIGHT, 480)
         
         # Detection tracking
         self.detected_objects = deque(maxlen=30)  # Store last 30 frames
+        self.history = DetectionHistory(self.class_names)
         
-        # Distance estimation parameters
-        self.known_distances = {
-            'person': 1.5,  # Average distance in meters
-            'car': 3.0,
-            'bicycle': 2.0,
-            'dog': 1.0,
-            'cat': 1.0
-        }
+        # Scene descriptions and their phrases, memoized by scene signature
+        self.describer = SceneDescriber(self.class_names)
+        
+        # Optional low-rate depth model for metric distances (runs on its own thread)
+        self.depth_stage = DepthStage() if depth else None
+        
+        # On-demand text reading (OCR worker started on the first request)
+        self.text_reader = None
+        self.read_text_requested = False
         
         print("Vision Assistant initialized successfully!")
         self.speak("Vision Assistant activated. Press S to describe the scene. Press Q to quit.")
@@ -76,38 +94,20 @@ class VisionAssistant:
         print(f"Speaking: {text}")
         try:
             if sys.platform == 'win32':
-                self.tts_engine.Speak(text)
+                if self.speech_cache is not None:
+                    self.speech_cache.speak(text)
+                else:
+                    self.tts_engine.Speak(text)
         except Exception as e:
             print(f"TTS Error: {e}")
     
-    def estimate_distance(self, bbox, class_name):
-        """Estimate distance based on bounding box size."""
-        # Calculate bbox height
-        height = bbox[3] - bbox[1]
+    @staticmethod
+    def get_dominant_color(frame, bbox, hsv=None):
+        """Extract dominant color from the bounding box region.
         
-        # Simple distance estimation (inverse relationship)
-        # Larger objects are closer
-        if height > 300:
-            return "very close"
-        elif height > 200:
-            return "close"
-        elif height > 100:
-            return "at medium distance"
-        else:
-            return "far away"
-    
-    def get_position(self, bbox, frame_width):
-        """Determine if object is on left, center, or right."""
-        center_x = (bbox[0] + bbox[2]) / 2
-        
-        if center_x < frame_width * 0.33:
-            return "on your left"
-        elif center_x > frame_width * 0.67:
-            return "on your right"
-        else:
-            return "in front of you"
-    def get_dominant_color(self, frame, bbox):
-        """Extract dominant color from the bounding box region."""
+        If an HSV conversion of the whole frame is already available it is
+        sampled directly instead of converting the region again.
+        """
         try:
             x1, y1, x2, y2 = [int(coord) for coord in bbox]
             
@@ -118,14 +118,14 @@ class VisionAssistant:
             if x2 <= x1 or y2 <= y1:
                 return None
             
-            # Extract the region
-            roi = frame[y1:y2, x1:x2]
-            
-            # Convert to HSV for better color detection
-            hsv = cv2.cvtColor(roi, cv2.COLOR_BGR2HSV)
+            # Extract the region, converted to HSV for better color detection
+            if hsv is not None:
+                roi_hsv = hsv[y1:y2, x1:x2]
+            else:
+                roi_hsv = cv2.cvtColor(frame[y1:y2, x1:x2], cv2.COLOR_BGR2HSV)
             
             # Calculate average color
-            avg_color = np.mean(hsv, axis=(0, 1))
+            avg_color = np.mean(roi_hsv, axis=(0, 1))
             h, s, v = avg_color
             
             # If saturation is too low, it's grayscale
@@ -155,125 +155,96 @@ class VisionAssistant:
         except:
             return None
     
-    def detect_objects(self, frame):
-        """Detect objects in the frame using YOLO."""
-        results = self.model(frame, conf=0.5, verbose=False)
+    def detect_objects(self, frame, hsv=None):
+        """Detect objects in the frame using the selected detector backend.
         
-        detections = []
-        for result in results:
-            boxes = result.boxes
-            for box in boxes:
-                # Get box coordinates
-                x1, y1, x2, y2 = box.xyxy[0].cpu().numpy()
-                confidence = box.conf[0].cpu().numpy()
-                class_id = int(box.cls[0].cpu().numpy())
-                class_name = self.model.names[class_id]
-                
-                # Get dominant color
-                color = self.get_dominant_color(frame, [x1, y1, x2, y2])
-                
-                detections.append({
-                    'bbox': [x1, y1, x2, y2],
-                    'confidence': confidence,
-                    'class': class_name,
-                    'color': color
-                })
+        `hsv` is an optional HSV conversion of the frame shared with other stages.
+        """
+        if self.client is not None:
+            try:
+                rows = self.client.detect(frame, conf=0.5)
+            except (OSError, ConnectionError, RuntimeError) as e:
+                # Server went away: fall back to in-process inference
+                print(f"Inference server unavailable ({e}), loading model locally")
+                self.client.close()
+                self.client = None
+                self.detector = create_detector(self.backend)
+            else:
+                return [self._make_detection(frame, row[:4], row[4], int(row[5]), hsv) for row in rows]
         
-        return detections
+        # Torch starts its intra-op pool on the first inference, so run inference
+        # (not just model loading) on the object detection CPUs
+        with get_runtime().pinned('objects'):
+            rows = self.detector.detect(frame, conf=0.5)
+        return [self._make_detection(frame, row[:4], row[4], int(row[5]), hsv) for row in rows.tolist()]
     
-    def analyze_scene(self, detections, frame_width):
-        """Analyze the scene and create a natural language description."""
-        if not detections:
-            return "No objects detected in view."
+    def _make_detection(self, frame, bbox, confidence, class_id, hsv=None):
+        """Build a detection dict, including the dominant color of the box."""
+        x1, y1, x2, y2 = bbox
+        class_name = self.class_names[class_id]
         
-        # Group objects by class with their details
-        object_groups = {}
+        # Get dominant color
+        color = self.get_dominant_color(frame, [x1, y1, x2, y2], hsv)
         
-        for det in detections:
-            class_name = det['class']
-            position = self.get_position(det['bbox'], frame_width)
-            distance = self.estimate_distance(det['bbox'], class_name)
-            color = det.get('color')
-            
-            if class_name not in object_groups:
-                object_groups[class_name] = []
-            
-            object_groups[class_name].append({
-                'position': position,
-                'distance': distance,
-                'color': color
-            })
-        
-        # Build natural language description
-        description_parts = []
-        
-        # Convert counts to words for numbers 1-10
-        number_words = {
-            1: "one", 2: "two", 3: "three", 4: "four", 5: "five",
-            6: "six", 7: "seven", 8: "eight", 9: "nine", 10: "ten"
+        return {
+            'bbox': [x1, y1, x2, y2],
+            'confidence': confidence,
+            'class': class_name,
+            'class_id': class_id,
+            'color': color
         }
+    
+    def count_word(self, count):
+        """Convert counts to words for numbers 1-10."""
+        return count_word(count)
+    
+    def pluralize(self, class_name, count):
+        """Make a class name plural if needed."""
+        return pluralize(class_name, count)
+    
+    def analyze_scene(self, detections, frame_width, frame_height=None):
+        """Analyze the scene and create a natural language description.
         
-        # Create description for each object type
-        object_descriptions = []
+        Descriptions are memoized by a quantized scene signature, so an
+        unchanged scene returns the cached sentence.
+        """
+        if not detections:
+            return "No objects detected in view."
         
-        for class_name, items in object_groups.items():
-            count = len(items)
-            count_word = number_words.get(count, str(count))
-            
-            # Make plural if needed
-            if count > 1:
-                # Handle irregular plurals
-                if class_name.endswith('s') or class_name.endswith('sh') or class_name.endswith('ch'):
-                    plural_name = f"{class_name}es"
-                elif class_name.endswith('y') and class_name not in ['toy', 'key', 'boy']:
-                    plural_name = f"{class_name[:-1]}ies"
-                else:
-                    plural_name = f"{class_name}s"
-            else:
-                plural_name = class_name
-            
-            # Build the object phrase with color if available
-            if count == 1:
-                item = items[0]
-                color_desc = f"{item['color']} " if item['color'] else ""
-                object_desc = f"one {color_desc}{class_name}"
-            else:
-                # Count colors for multiple items
-                colors = [item['color'] for item in items if item['color']]
-                if colors and len(set(colors)) == 1:
-                    # All same color
-                    object_desc = f"{count_word} {colors[0]} {plural_name}"
-                elif len(set(colors)) > 1 and len(colors) >= count * 0.7:
-                    # Multiple colors
-                    color_counts = {}
-                    for c in colors:
-                        color_counts[c] = color_counts.get(c, 0) + 1
-                    dominant_color = max(color_counts, key=color_counts.get)
-                    object_desc = f"{count_word} {plural_name}, mostly {dominant_color}"
-                else:
-                    object_desc = f"{count_word} {plural_name}"
-            
-            # Add position and distance for the first/closest item
-            closest_item = min(items, key=lambda x: 0 if x['distance'] == "very close" else 1 if x['distance'] == "close" else 2 if x['distance'] == "at medium distance" else 3)
-            
-            if count == 1:
-                full_desc = f"{object_desc} {closest_item['distance']} {closest_item['position']}"
-            else:
-                full_desc = f"{object_desc}, with one {closest_item['distance']} {closest_item['position']}"
-            
-            object_descriptions.append(full_desc)
+        # Scale the cached depth map to meters using objects of known height
+        if self.depth_stage is not None and frame_height:
+            self.depth_stage.calibrate(detections, (frame_height, frame_width))
         
-        # Combine all descriptions
-        if len(object_descriptions) == 1:
-            return f"I see {object_descriptions[0]}."
-        elif len(object_descriptions) == 2:
-            return f"I see {object_descriptions[0]}, and {object_descriptions[1]}."
-        else:
-            # List all but last with commas, then "and" for the last one
-            all_but_last = ", ".join(object_descriptions[:-1])
-            return f"I see {all_but_last}, and {object_descriptions[-1]}."
+        return self.describer.describe(detections, frame_width, frame_height, self.depth_stage)
     
-    def draw_detections(self, frame, detections):
+    def request_text_reading(self, frame):
+        """Start reading the text in a clean (undrawn) frame on the OCR worker."""
+        self.read_text_requested = False
+        if self.text_reader is None:
+            self.text_reader = TextReader()
+        self.text_reader.request(frame)
+    
+    def speak_text_readings(self):
+        """Speak text the OCR worker has finished reading, if any."""
+        if self.text_reader is not None:
+            text = self.text_reader.poll()
+            if text is not None:
+                self.speak(text)
+    
+    def describe_recent(self, seconds=5.0):
+        """Summarize what has been seen over the last few seconds."""
+        seen = self.history.summarize(seconds)
+        if not seen:
+            return f"Nothing detected in the last {seconds:g} seconds."
+        
+        phrases = [f"{self.count_word(count)} {self.pluralize(class_name, count)}"
+                   for class_name, count in seen.items()]
+        if len(phrases) == 1:
+            return f"In the last {seconds:g} seconds I saw {phrases[0]}."
+        return f"In the last {seconds:g} seconds I saw {', '.join(phrases[:-1])}, and {phrases[-1]}."
+    
+    @staticmethod
+    def draw_detections(frame, detections):
         """Draw bounding boxes and labels on the frame."""
         for det in detections:
             x1, y1, x2, y2 = [int(coord) for coord in det['bbox']]
@@ -290,7 +261,8 @@ class VisionAssistant:
             else:
                 label = f"{class_name} {confidence:.2f}"
             
-            # Add background to label for better visibility
+            # Add background to label for better visibility (drawn directly: the
+            # confidence changes every frame, so a cached sprite would never be reused)
             label_size, _ = cv2.getTextSize(label, cv2.FONT_HERSHEY_SIMPLEX, 0.5, 2)
             cv2.rectangle(frame, (x1, y1 - label_size[1] - 10), 
                          (x1 + label_size[0], y1), (0, 255, 0), -1)
@@ -299,6 +271,23 @@ class VisionAssistant:
         
         return frame
     
+    def draw_hud(self, frame, object_count):
+        """Draw the object count and key hints."""
+        count_text = f"Objects detected: {object_count}"
+        count_sprite = overlay_layer.sprite(
+            'hud_count', count_text,
+            lambda: text_sprite(count_text, 1, (0, 255, 0), 2)
+        )
+        count_sprite.blend(frame, 10, 30 - count_sprite.baseline)
+        
+        hint_sprite = overlay_layer.sprite(
+            'hud_hint', None,
+            lambda: text_sprite("Press 'S' to describe scene | 'P' recent | 'R' read text | 'Q' to quit",
+                                0.5, (255, 255, 255), 1)
+        )
+        hint_sprite.blend(frame, 10, frame.shape[0] - 10 - hint_sprite.baseline)
+        return frame
+    
     def run(self):
         """Main loop for the vision assistant."""
         print("\n" + "="*60)
@@ -306,9 +295,15 @@ class VisionAssistant:
         print("="*60)
         print("Controls:")
         print("  Press 'S' - Describe the scene")
+        print("  Press 'P' - Describe what passed by recently")
+        print("  Press 'R' - Read text (signs, labels)")
+        print("  Press 'V' - Start/stop recording the session")
         print("  Press 'Q' - Quit")
         print("="*60 + "\n")
         
+        # Session recordings are encoded on a background thread
+        recorder = FrameRecorder()
+        
         try:
             while True:
                 ret, frame = self.cap.read()
@@ -321,16 +316,25 @@ class VisionAssistant:
                 
                 # Always detect objects for visual display
                 detections = self.detect_objects(frame)
+                self.history.add(detections)
+                
+                # Hand the clean frame to the depth stage (never waits; rate limited)
+                if self.depth_stage is not None:
+                    self.depth_stage.submit(frame)
+                
+                # Hand the clean frame to the OCR worker after 'R' and speak finished readings
+                if self.read_text_requested:
+                    self.request_text_reading(frame)
+                self.speak_text_readings()
                 
                 # Draw detections on frame
                 frame = self.draw_detections(frame, detections)
                 
-                # Add text overlay
-                cv2.putText(frame, f"Objects detected: {len(detections)}", 
-                           (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
-                cv2.putText(frame, "Press 'S' to describe scene | 'Q' to quit", 
-                           (10, frame.shape[0] - 10), cv2.FONT_HERSHEY_SIMPLEX, 
-                           0.5, (255, 255, 255), 1)
+                # Add text overlay (cached sprites, re-rendered only when the text changes)
+                self.draw_hud(frame, len(detections))
+                
+                # Queue the frame for the session recording (no-op when not recording)
+                recorder.write(frame)
                 
                 # Display frame
                 cv2.imshow('Vision Assistant', frame)
@@ -345,36 +349,75 @@ class VisionAssistant:
                     
                 elif key == ord('s') or key == ord('S'):
                     print("\n--- Analyzing scene ---")
-                    # Get fresh detection for speech
-                    ret, fresh_frame = self.cap.read()
-                    if ret:
-                        # Flip frame horizontally to mirror the camera
-                        fresh_frame = cv2.flip(fresh_frame, 1)
-                        detections = self.detect_objects(fresh_frame)
-                        if detections:
-                            description = self.analyze_scene(detections, fresh_frame.shape[1])
-                            self.speak(description)
+                    # Reuse the detection already on screen when it is fresh
+                    recent = self.history.latest(max_age=0.1)
+                    if recent is not None:
+                        if recent:
+                            self.speak(self.analyze_scene(recent, frame.shape[1], frame.shape[0]))
                         else:
                             self.speak("No objects detected in view")
+                    else:
+                        # Get fresh detection for speech
+                        ret, fresh_frame = self.cap.read()
+                        if ret:
+                            # Flip frame horizontally to mirror the camera
+                            fresh_frame = cv2.flip(fresh_frame, 1)
+                            detections = self.detect_objects(fresh_frame)
+                            self.history.add(detections)
+                            if detections:
+                                description = self.analyze_scene(detections, fresh_frame.shape[1], fresh_frame.shape[0])
+                                self.speak(description)
+                            else:
+                                self.speak("No objects detected in view")
                     print("--- Analysis complete ---\n")
+                
+                elif key == ord('p') or key == ord('P'):
+                    # Summarize what passed by recently
+                    self.speak(self.describe_recent(5.0))
+                
+                elif key == ord('r') or key == ord('R'):
+                    # Read on the next (undrawn) frame
+                    print("Reading text...")
+                    self.read_text_requested = True
+                
+                elif key == ord('v') or key == ord('V'):
+                    recorder.toggle_recording(f"vision_session_{datetime.now():%Y%m%d_%H%M%S}.mp4")
         
         except KeyboardInterrupt:
             print("\nInterrupted by user")
         
         finally:
+            recorder.close()
             self.cleanup()
     
     def cleanup(self):
         """Clean up resources."""
         print("Cleaning up...")
-        self.cap.release()
+        if self.cap is not None:
+            self.cap.release()
         cv2.destroyAllWindows()
+        if self.client is not None:
+            self.client.close()
+        if self.depth_stage is not None:
+            self.depth_stage.close()
+        if self.text_reader is not None:
+            print(self.text_reader.summary())
+            self.text_reader.close()
         print("Vision Assistant shut down successfully.")
 
 def main():
     """Main entry point."""
+    import argparse
+    parser = argparse.ArgumentParser(description="Vision Assistant for the Blind")
+    parser.add_argument('--backend', choices=['yolo', 'mobilenet-ssd'], default=DEFAULT_BACKEND,
+                        help="Object detector (mobilenet-ssd needs no torch; for low-end CPUs)")
+    parser.add_argument('--depth', action='store_true',
+                        help="Estimate metric distances with a low-rate monocular depth model")
+    args = parser.parse_args()
+    configure_runtime(['objects'])
+    
     try:
-        assistant = VisionAssistant()
+        assistant = VisionAssistant(backend=args.backend, depth=args.depth)
         assistant.run()
     except Exception as e:
         print(f"Error: {e}")
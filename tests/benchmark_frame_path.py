@@ -0,0 +1,124 @@
+"""
+Benchmark the hand interpreter frame path: copying vs. in-place buffers.
+
+Runs without a camera: synthetic 1280x720 frames are fed through the flip,
+colour conversion and drawing steps of the interpreter loop, with MediaPipe
+inference replaced by canned landmarks so only the frame handling is timed.
+Reports per-frame latency and the transient memory allocated per frame.
+
+Run with:  python tests/benchmark_frame_path.py
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from hand_keypoint_detection import HandKeypointDetector, build_hand_results
+
+
+class CannedHands:
+    """Stands in for mp.solutions.hands.Hands and returns fixed landmarks."""
+
+    def __init__(self, num_hands=2):
+        rng = np.random.default_rng(0)
+        hands = []
+        for i in range(num_hands):
+            landmarks = rng.uniform(0.2, 0.8, size=(21, 3)).tolist()
+            hands.append({'label': 'Right' if i == 0 else 'Left', 'score': 0.95, 'landmarks': landmarks})
+        self.results = build_hand_results(hands)
+
+    def process(self, image):
+        return self.results
+
+    def close(self):
+        pass
+
+
+def copying_path(detector, raw_frame, show_enhanced):
+    """The original loop: every step allocates a new frame."""
+    frame = cv2.flip(raw_frame, 1)
+    # Forget the RGB buffer so the colour conversion allocates as it used to
+    detector._rgb_buffer = None
+    annotated_frame, results = detector.detect_hands(frame)
+    hands_data = detector.get_keypoint_coordinates(results, frame.shape)
+    if show_enhanced and hands_data:
+        annotated_frame = detector.draw_enhanced_keypoints(frame, hands_data)
+    return annotated_frame
+
+
+def in_place_path(detector, raw_frame, show_enhanced, buffers):
+    """The in-place loop: flip and convert into reused buffers, draw onto them."""
+    buffers['frame'] = frame = cv2.flip(raw_frame, 1, dst=buffers.get('frame'))
+    if show_enhanced:
+        results = detector.process(frame)
+        annotated_frame = frame
+    else:
+        annotated_frame, results = detector.detect_hands(frame, in_place=True)
+    hands_data = detector.get_keypoint_coordinates(results, frame.shape)
+    if show_enhanced and hands_data:
+        annotated_frame = detector.draw_enhanced_keypoints(frame, hands_data, in_place=True)
+    return annotated_frame
+
+
+def measure(step, raw_frames, warmup=10):
+    """Time a step and record the peak transient allocation of each call."""
+    for raw_frame in raw_frames[:warmup]:
+        step(raw_frame)
+
+    latencies = []
+    peaks = []
+    tracemalloc.start()
+    for raw_frame in raw_frames:
+        tracemalloc.reset_peak()
+        baseline, _ = tracemalloc.get_traced_memory()
+        start = time.perf_counter()
+        step(raw_frame)
+        latencies.append(time.perf_counter() - start)
+        _, peak = tracemalloc.get_traced_memory()
+        peaks.append(peak - baseline)
+    tracemalloc.stop()
+
+    return np.median(latencies) * 1000, np.median(peaks) / 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the copying and in-place frame paths")
+    parser.add_argument('--frames', type=int, default=200, help="Frames per measurement")
+    parser.add_argument('--width', type=int, default=1280, help="Frame width")
+    parser.add_argument('--height', type=int, default=720, help="Frame height")
+    args = parser.parse_args()
+
+    detector = HandKeypointDetector(use_server=False)
+    detector.hands.close()
+    detector.hands = CannedHands()
+
+    rng = np.random.default_rng(1)
+    raw_frames = [rng.integers(0, 256, (args.height, args.width, 3), dtype=np.uint8) for _ in range(8)]
+    raw_frames = [raw_frames[i % len(raw_frames)] for i in range(args.frames)]
+
+    print(f"Frame path benchmark ({args.width}x{args.height}, {args.frames} frames)")
+    print(f"{'mode':<28}{'latency (ms)':>14}{'alloc/frame (MB)':>20}")
+
+    for show_enhanced in (False, True):
+        buffers = {}
+        modes = [
+            ('copying', lambda f: copying_path(detector, f, show_enhanced)),
+            ('in-place', lambda f: in_place_path(detector, f, show_enhanced, buffers))
+        ]
+        for name, step in modes:
+            latency_ms, alloc_mb = measure(step, raw_frames)
+            label = f"{name} ({'enhanced' if show_enhanced else 'default'})"
+            print(f"{label:<28}{latency_ms:>14.3f}{alloc_mb:>20.2f}")
+
+    detector.close()
+
+
+if __name__ == "__main__":
+    main()
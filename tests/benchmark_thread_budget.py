@@ -0,0 +1,161 @@
+"""
+Benchmark CPU oversubscription with and without the shared thread budget.
+
+Runs without a camera or models: three threads stand in for the pipelines of
+the unified/multi-station setups and run concurrently for a fixed time:
+
+    objects - torch convolution (or an OpenCV 15x15 filter when torch is missing)
+    hands   - the resize/convert/blur preprocessing MediaPipe does per frame
+    opencv  - the display path (flip, colour conversion)
+
+Each configuration runs in its own process, since thread pool sizes are
+process-wide:
+
+    default  - every library sizes its pool to the whole machine
+    budget   - runtime_config splits the CPUs between the pipelines
+    pinned   - as budget, plus each pipeline thread pinned to its own CPUs
+
+Reports per-pipeline throughput and p50/p99 latency; oversubscription shows up
+as p99 spikes well above p50.
+
+Run with:  python tests/benchmark_thread_budget.py [--seconds 5]
+"""
+
+import argparse
+import os
+import subprocess
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from runtime_config import configure_runtime
+
+
+MODES = ('default', 'budget', 'pinned')
+
+
+def objects_workload():
+    """One object-detector-sized step."""
+    try:
+        import torch
+    except ImportError:
+        frame = np.random.default_rng(0).random((720, 1280), dtype=np.float32)
+        kernel = np.ones((15, 15), dtype=np.float32) / 225
+        return lambda: cv2.filter2D(frame, -1, kernel)
+
+    weight = torch.randn(32, 16, 3, 3)
+    batch = torch.randn(1, 16, 320, 320)
+
+    def step():
+        with torch.no_grad():
+            torch.nn.functional.conv2d(batch, weight, padding=1)
+    return step
+
+
+def hands_workload():
+    """MediaPipe-style preprocessing of one frame."""
+    frame = np.random.default_rng(1).integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+
+    def step():
+        rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        small = cv2.resize(rgb, (256, 256), interpolation=cv2.INTER_AREA)
+        cv2.GaussianBlur(small, (5, 5), 0)
+    return step
+
+
+def opencv_workload():
+    """Display path for one frame."""
+    frame = np.random.default_rng(2).integers(0, 256, (720, 1280, 3), dtype=np.uint8)
+
+    def step():
+        flipped = cv2.flip(frame, 1)
+        cv2.cvtColor(flipped, cv2.COLOR_BGR2HSV)
+    return step
+
+
+WORKLOADS = {
+    'objects': objects_workload,
+    'hands': hands_workload,
+    'opencv': opencv_workload,
+}
+
+
+def run_mode(mode, seconds):
+    """Run all pipelines concurrently in this process and print one result line each."""
+    runtime = None
+    if mode == 'default':
+        cv2.setNumThreads(os.cpu_count() or 1)
+    else:
+        runtime = configure_runtime(['hands', 'objects'], pin=(mode == 'pinned'))
+        if _torch_available():
+            runtime.apply_torch()
+
+    latencies = {name: [] for name in WORKLOADS}
+    stop = threading.Event()
+
+    def worker(name):
+        step = WORKLOADS[name]()
+        if runtime is not None:
+            # Pin this pipeline thread (a no-op unless pinning is enabled)
+            with runtime.pinned(name):
+                loop(name, step)
+        else:
+            loop(name, step)
+
+    def loop(name, step):
+        step()
+        while not stop.is_set():
+            start = time.perf_counter()
+            step()
+            latencies[name].append(time.perf_counter() - start)
+
+    threads = [threading.Thread(target=worker, args=(name,)) for name in WORKLOADS]
+    for thread in threads:
+        thread.start()
+    time.sleep(seconds)
+    stop.set()
+    for thread in threads:
+        thread.join()
+
+    for name, values in latencies.items():
+        values = np.array(values) * 1000
+        print(f"{mode:<10}{name:<10}{len(values) / seconds:>10.1f}"
+              f"{np.percentile(values, 50):>12.2f}{np.percentile(values, 99):>12.2f}")
+
+
+def _torch_available():
+    try:
+        import torch  # noqa: F401
+    except ImportError:
+        return False
+    return True
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the shared CPU thread budget")
+    parser.add_argument('--seconds', type=float, default=5.0, help="Run time per mode")
+    parser.add_argument('--mode', choices=MODES, help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    if args.mode:
+        run_mode(args.mode, args.seconds)
+        return
+
+    print(f"Thread budget benchmark ({os.cpu_count()} CPUs, {args.seconds:.0f}s per mode, "
+          f"objects on {'torch' if _torch_available() else 'OpenCV'})")
+    print(f"{'mode':<10}{'pipeline':<10}{'steps/s':>10}{'p50 (ms)':>12}{'p99 (ms)':>12}")
+    for mode in MODES:
+        sys.stdout.flush()
+        subprocess.run(
+            [sys.executable, os.path.abspath(__file__), '--mode', mode, '--seconds', str(args.seconds)],
+            check=True
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,104 @@
+"""
+Camera-free micro-benchmarks for the per-frame hot paths.
+
+Frames are synthetic and model outputs are canned, so the suite runs on any
+Linux box without a webcam, YOLO weights or a display. Requires pytest-benchmark.
+
+By default the suite only records timings. The regression check is opt-in:
+with a threshold, each benchmark's median is compared with
+tests/benchmarks/baselines.json and the test fails when it is slower than the
+baseline by more than the threshold:
+
+    pytest tests/benchmarks                      # record timings only
+    pytest tests/benchmarks --perf-threshold 0.25
+    BRIDGING_WORLDS_PERF_THRESHOLD=0.25 pytest tests/benchmarks
+    pytest tests/benchmarks --perf-update        # re-record baselines on this machine
+
+Baselines are machine specific; re-record them on the machine that runs the check.
+"""
+
+import json
+import os
+import sys
+import warnings
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', '..', 'src'))
+
+
+BASELINE_PATH = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'baselines.json')
+
+FRAME_SHAPE = (720, 1280, 3)
+
+
+def pytest_addoption(parser):
+    group = parser.getgroup('perf', 'performance regression check')
+    group.addoption('--perf-baseline', default=BASELINE_PATH, help="Baseline medians (JSON)")
+    group.addoption('--perf-threshold', type=float,
+                    default=float(os.environ.get('BRIDGING_WORLDS_PERF_THRESHOLD') or 0) or None,
+                    help="Fail when a median is slower than its baseline by more than this "
+                         "(0.25 = 25%%; default: BRIDGING_WORLDS_PERF_THRESHOLD, or no check)")
+    group.addoption('--perf-update', action='store_true', help="Record this run's medians as the baselines")
+
+
+@pytest.fixture(scope='session')
+def perf_baselines(request):
+    """Baseline medians in seconds, keyed by test id; written back with --perf-update."""
+    path = request.config.getoption('--perf-baseline')
+    try:
+        with open(path, 'r', encoding='utf-8') as f:
+            baselines = json.load(f)
+    except (OSError, ValueError):
+        baselines = {}
+
+    yield baselines
+
+    if request.config.getoption('--perf-update'):
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(baselines, f, indent=2, sort_keys=True)
+            f.write('\n')
+
+
+@pytest.fixture(autouse=True)
+def perf_regression(request, perf_baselines):
+    """Compare the test's benchmark median with its baseline."""
+    yield
+
+    benchmark = request.node.funcargs.get('benchmark')
+    if benchmark is None or benchmark.stats is None:
+        # Not a benchmark, or benchmarks disabled (--benchmark-disable)
+        return
+
+    name = request.node.name
+    median = benchmark.stats.stats.median
+    if request.config.getoption('--perf-update'):
+        perf_baselines[name] = median
+        return
+
+    threshold = request.config.getoption('--perf-threshold')
+    if threshold is None:
+        # Regression check not requested: pytest-benchmark still reports the timings
+        return
+
+    baseline = perf_baselines.get(name)
+    if baseline is None:
+        warnings.warn(f"No performance baseline for {name}; record one with --perf-update")
+        return
+
+    if median > baseline * (1 + threshold):
+        pytest.fail(
+            f"{name} regressed: median {median * 1e6:.1f} us vs. baseline {baseline * 1e6:.1f} us "
+            f"(+{(median / baseline - 1) * 100:.0f}%, threshold {threshold * 100:.0f}%)"
+        )
+
+
+@pytest.fixture(scope='session')
+def frame():
+    """Synthetic 1280x720 BGR frame with flat colour patches and noise."""
+    rng = np.random.default_rng(0)
+    image = rng.integers(0, 256, FRAME_SHAPE, dtype=np.uint8)
+    image[100:400, 100:500] = (0, 0, 200)
+    image[300:700, 700:1100] = (200, 120, 0)
+    return image
@@ -0,0 +1,53 @@
+"""Benchmarks for the hand interpreter's per-frame helpers."""
+
+from types import SimpleNamespace
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+pytest.importorskip('mediapipe')
+
+from hand_keypoint_detection import HandKeypointDetector, SentenceManager
+
+
+def canned_results(num_hands=2, seed=0):
+    """MediaPipe-shaped results with random landmarks (no protobufs needed)."""
+    rng = np.random.default_rng(seed)
+    landmarks = []
+    handedness = []
+    for i in range(num_hands):
+        points = rng.uniform(0.2, 0.8, size=(21, 3))
+        landmarks.append(SimpleNamespace(landmark=[SimpleNamespace(x=x, y=y, z=z) for x, y, z in points]))
+        handedness.append(SimpleNamespace(classification=[
+            SimpleNamespace(label='Right' if i == 0 else 'Left', score=0.95)
+        ]))
+    return SimpleNamespace(multi_hand_landmarks=landmarks, multi_handedness=handedness)
+
+
+@pytest.fixture(scope='module')
+def detector():
+    detector = HandKeypointDetector(use_server=False)
+    yield detector
+    detector.close()
+
+
+def test_get_keypoint_coordinates(benchmark, detector, frame):
+    results = canned_results()
+    hands_data = benchmark(detector.get_keypoint_coordinates, results, frame.shape)
+    assert len(hands_data) == 2
+
+
+def test_draw_enhanced_keypoints(benchmark, detector, frame):
+    hands_data = detector.get_keypoint_coordinates(canned_results(), frame.shape)
+    canvas = frame.copy()
+    benchmark(detector.draw_enhanced_keypoints, canvas, hands_data, True, True)
+
+
+@pytest.mark.parametrize('words', [12, 100000])
+def test_get_display_text(benchmark, words):
+    manager = SentenceManager(' '.join(f"word{i}" for i in range(words)), tts=None)
+    # Middle of the text, where both sides of the window have to be filled
+    manager.current_word_index = words // 2
+    text = benchmark(manager.get_display_text)
+    assert text
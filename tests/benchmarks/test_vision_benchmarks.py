@@ -0,0 +1,102 @@
+"""Benchmarks for the Vision Assistant's per-frame helpers."""
+
+import itertools
+
+import numpy as np
+import pytest
+
+pytest.importorskip('pytest_benchmark')
+
+import vision_assistant
+from vision_assistant import VisionAssistant
+
+
+COCO_NAMES = {
+    0: 'person', 1: 'bicycle', 2: 'car', 15: 'cat', 16: 'dog',
+    39: 'bottle', 41: 'cup', 56: 'chair', 62: 'tv', 63: 'laptop'
+}
+COLORS = ['red', 'blue', 'green', 'white', 'black', None]
+
+
+class CannedDetector:
+    """Stands in for a YOLO backend; never loads a model."""
+
+    names = COCO_NAMES
+
+    def detect(self, frame, conf=0.5):
+        return np.empty((0, 6), dtype=np.float32)
+
+
+@pytest.fixture(scope='module')
+def assistant():
+    monkeypatch = pytest.MonkeyPatch()
+    monkeypatch.setattr(vision_assistant, 'create_detector', lambda backend: CannedDetector())
+    yield VisionAssistant(use_server=False, open_camera=False)
+    monkeypatch.undo()
+
+
+def make_detections(count, seed=0):
+    """Random detections in the Vision Assistant's dict format."""
+    rng = np.random.default_rng(seed)
+    class_ids = list(COCO_NAMES)
+    detections = []
+    for _ in range(count):
+        x1, y1 = rng.integers(0, 1000), rng.integers(0, 500)
+        w, h = rng.integers(40, 280), rng.integers(40, 220)
+        class_id = class_ids[rng.integers(len(class_ids))]
+        detections.append({
+            'bbox': [float(x1), float(y1), float(x1 + w), float(y1 + h)],
+            'confidence': float(rng.uniform(0.5, 1.0)),
+            'class': COCO_NAMES[class_id],
+            'class_id': class_id,
+            'color': COLORS[rng.integers(len(COLORS))]
+        })
+    return detections
+
+
+def test_get_dominant_color(benchmark, frame):
+    color = benchmark(VisionAssistant.get_dominant_color, frame, [100, 100, 500, 400])
+    assert color == 'red'
+
+
+def test_get_dominant_color_shared_hsv(benchmark, frame):
+    import cv2
+
+    hsv = cv2.cvtColor(frame, cv2.COLOR_BGR2HSV)
+    color = benchmark(VisionAssistant.get_dominant_color, frame, [100, 100, 500, 400], hsv)
+    assert color == 'red'
+
+
+@pytest.mark.parametrize('count', [1, 10, 100])
+def test_analyze_scene(benchmark, assistant, count):
+    detections = make_detections(count)
+    description = benchmark(assistant.analyze_scene, detections, 1280)
+    assert description
+
+
+@pytest.mark.parametrize('count', [1, 10, 100])
+def test_analyze_scene_uncached(benchmark, assistant, count):
+    detections = make_detections(count)
+
+    def describe():
+        assistant.describer.descriptions.clear()
+        assistant.describer.phrases.clear()
+        return assistant.analyze_scene(detections, 1280)
+
+    assert benchmark(describe)
+
+
+def test_draw_detections(benchmark, frame):
+    detections = make_detections(10)
+    canvas = frame.copy()
+    confidences = np.random.default_rng(1).uniform(0.5, 1.0, (64, len(detections)))
+    frames = itertools.count()
+
+    def draw():
+        # Confidences change from frame to frame, as they do on a live camera
+        row = confidences[next(frames) % len(confidences)]
+        for det, confidence in zip(detections, row):
+            det['confidence'] = float(confidence)
+        return VisionAssistant.draw_detections(canvas, detections)
+
+    benchmark(draw)
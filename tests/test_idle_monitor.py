@@ -0,0 +1,44 @@
+"""Tests for the idle presence check and wake metrics (synthetic frames)."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from idle_monitor import IdleMonitor
+
+
+STILL = np.full((240, 320, 3), 40, dtype=np.uint8)
+MOVED = np.full((240, 320, 3), 200, dtype=np.uint8)
+
+
+@pytest.fixture
+def monitor():
+    monitor = IdleMonitor(idle_after=1.0, check_interval=10.0)
+    monitor.enter_idle(now=0.0)
+    monitor.should_check_hands(STILL, now=0.0)
+    return monitor
+
+
+def test_time_to_wake_starts_at_first_motion(monitor):
+    # Motion at 1.0s, hands only found on the third moving frame
+    assert monitor.should_check_hands(MOVED, now=1.0)
+    assert monitor.should_check_hands(STILL, now=1.2)
+    assert monitor.should_check_hands(MOVED, now=1.4)
+    monitor.wake(now=1.45)
+    monitor.update(True, now=1.5)
+
+    assert monitor.wake_times == [pytest.approx(0.5)]
+
+
+def test_motion_that_stopped_does_not_count(monitor):
+    assert monitor.should_check_hands(MOVED, now=1.0)
+    assert not monitor.should_check_hands(MOVED, now=1.2)
+    assert monitor.should_check_hands(STILL, now=3.0)
+    monitor.wake(now=3.05)
+    monitor.update(True, now=3.1)
+
+    assert monitor.wake_times == [pytest.approx(0.1)]
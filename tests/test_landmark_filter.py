@@ -0,0 +1,69 @@
+"""Tests for landmark tracking and prediction (canned detector results)."""
+
+import os
+import sys
+
+import numpy as np
+import pytest
+
+pytest.importorskip('mediapipe')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from hand_keypoint_detection import build_hand_results, serialize_hand_results
+from landmark_filter import LandmarkPredictor
+
+
+def hand(label, wrist_x):
+    """A flat hand whose landmarks sit right of its wrist."""
+    landmarks = np.zeros((21, 3))
+    landmarks[:, 0] = wrist_x + np.linspace(0, 0.1, 21)
+    landmarks[:, 1] = 0.5
+    return {'label': label, 'score': 0.9, 'landmarks': landmarks.tolist()}
+
+
+class CannedDetector:
+    """Replays a list of frames of serialized hands."""
+
+    def __init__(self, frames):
+        self.frames = iter(frames)
+
+    def process(self, image):
+        return build_hand_results(next(self.frames))
+
+
+def wrists(results):
+    return sorted(round(h['landmarks'][0][0], 3) for h in serialize_hand_results(results))
+
+
+def test_ratio_one_passes_results_through():
+    frames = [[hand('Right', 0.2), hand('Right', 0.6)]]
+    detector = CannedDetector(frames)
+    results = LandmarkPredictor(detector, inference_ratio=1).process(None)
+    assert serialize_hand_results(results) == frames[0]
+
+
+def test_hands_with_the_same_label_are_both_tracked():
+    frames = [[hand('Right', 0.2 + step * 0.01), hand('Right', 0.6 - step * 0.01)] for step in range(4)]
+    predictor = LandmarkPredictor(CannedDetector(frames), inference_ratio=2)
+
+    for step in range(4):
+        results = predictor.process(None, timestamp=step / 30)
+        assert len(results.multi_hand_landmarks) == 2
+    assert len(predictor.tracks) == 2
+
+
+def test_tracks_follow_hands_when_labels_swap():
+    # Crossed hands: MediaPipe swaps the labels, the positions keep moving smoothly
+    frames = [
+        [hand('Left', 0.2), hand('Right', 0.6)],
+        [hand('Right', 0.21), hand('Left', 0.59)],
+    ]
+    predictor = LandmarkPredictor(CannedDetector(frames), inference_ratio=2)
+    predictor.process(None, timestamp=0.0)
+    first = list(predictor.tracks)
+    predictor.process(None, timestamp=1 / 30)  # predicted
+    results = predictor.process(None, timestamp=2 / 30)
+
+    assert predictor.tracks == first
+    assert wrists(results)[0] < 0.3 < wrists(results)[1]
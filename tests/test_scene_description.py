@@ -0,0 +1,36 @@
+"""Tests for scene signatures built from detection dicts."""
+
+import os
+import sys
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from scene_description import SceneDescriber
+
+
+CLASS_NAMES = {0: 'person', 56: 'chair'}
+
+
+def detection(class_name, bbox, class_id=None):
+    det = {'bbox': bbox, 'confidence': 0.9, 'class': class_name, 'color': 'red'}
+    if class_id is not None:
+        det['class_id'] = class_id
+    return det
+
+
+def test_detections_without_class_id_match_new_format():
+    describer = SceneDescriber(CLASS_NAMES)
+    boxes = [('person', [100, 100, 200, 500], 0), ('chair', [500, 300, 600, 450], 56),
+             ('person', [800, 50, 900, 450], 0)]
+
+    new = describer.signature([detection(name, bbox, class_id) for name, bbox, class_id in boxes], 1280, 720)
+    old = describer.signature([detection(name, bbox) for name, bbox, _ in boxes], 1280, 720)
+
+    assert old == new
+    assert [group[:2] for group in old] == [('person', 2), ('chair', 1)]
+
+
+def test_unknown_class_without_class_id():
+    describer = SceneDescriber(CLASS_NAMES)
+    signature = describer.signature([detection('kite', [10, 10, 60, 60])], 1280, 720)
+    assert [group[:2] for group in signature] == [('kite', 1)]
@@ -0,0 +1,30 @@
+"""Tests for wrapping the sentence window into the sentence panel."""
+
+import os
+import sys
+
+import pytest
+
+pytest.importorskip('mediapipe')
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from hand_keypoint_detection import SENTENCE_PANEL_LINES, SentenceManager, wrap_sentence_lines
+
+
+@pytest.mark.parametrize('index', [0, 10, 30, 59, 60])
+def test_default_window_fits_the_panel(index):
+    # Words of uneven length, so the 100-character window wraps into three lines
+    words = [("w" * (1 + i % 9)) for i in range(60)]
+    manager = SentenceManager(" ".join(words), tts=None)
+    manager.current_word_index = index
+
+    lines = wrap_sentence_lines(manager.get_display_text())
+
+    assert len(lines) <= SENTENCE_PANEL_LINES
+    if index < len(words):
+        assert any(f"[{words[index]}]" in line for line in lines)
+
+
+def test_short_text_is_not_cut():
+    assert wrap_sentence_lines("Hello [my] name") == ["Hello [my] name"]
@@ -0,0 +1,117 @@
+"""Tests for the OCR caches (no models needed)."""
+
+import os
+import sys
+
+import cv2
+import numpy as np
+import pytest
+
+sys.path.insert(0, os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'src'))
+
+from text_reader import RECOGNITION_SIZE, TextReader, TextRegionCache, region_signature
+
+
+BOX = (100.0, 200.0, 360.0, 264.0)
+
+SIMILAR_WORDS = [
+    ("OPEN", "PUSH"),
+    ("OPEN", "SHOP"),
+    ("PUSH", "PULL"),
+    ("ROOM 12", "ROOM 13"),
+    ("ROOM 12", "ROOM 21"),
+    ("GATE A", "GATE B"),
+]
+
+
+def render(word, gain=1.0, noise=6.0, seed=0):
+    """Rectified crop of a printed sign, as the recognizer would see it."""
+    image = np.full((64, 260), 200, np.uint8)
+    cv2.putText(image, word, (10, 48), cv2.FONT_HERSHEY_SIMPLEX, 1.6, 30, 4)
+    image = image * gain + np.random.default_rng(seed).normal(0, noise, image.shape)
+    image = np.clip(image, 0, 255).astype(np.uint8)
+    return cv2.resize(image, RECOGNITION_SIZE, interpolation=cv2.INTER_AREA)
+
+
+@pytest.mark.parametrize('cached, seen', SIMILAR_WORDS + [(b, a) for a, b in SIMILAR_WORDS])
+def test_similar_words_do_not_collide(cached, seen):
+    cache = TextRegionCache()
+    cache.add(BOX, region_signature(render(cached)), cached.lower())
+    assert cache.lookup(BOX, region_signature(render(seen, seed=1))) is None
+
+
+@pytest.mark.parametrize('word', ["PUSH", "ROOM 12", "GATE A"])
+def test_same_region_is_reused(word):
+    cache = TextRegionCache()
+    cache.add(BOX, region_signature(render(word)), word.lower())
+
+    # Re-captured with different lighting and noise, box moved a few pixels
+    moved = (BOX[0] + 6, BOX[1] + 2, BOX[2] + 6, BOX[3] + 2)
+    assert cache.lookup(moved, region_signature(render(word, gain=0.8, noise=8.0, seed=3))) == word.lower()
+
+
+def test_same_text_elsewhere_is_not_reused():
+    cache = TextRegionCache()
+    cache.add(BOX, region_signature(render("EXIT")), "exit")
+    elsewhere = (BOX[0] + 400, BOX[1], BOX[2] + 400, BOX[3])
+    assert cache.lookup(elsewhere, region_signature(render("EXIT", seed=1))) is None
+
+
+# Sign in a still 640x480 scene: (x1, y1, x2, y2)
+SIGN = (200, 200, 440, 280)
+
+
+def scene(word, seed):
+    """Grayscale-textured camera frame with a printed sign, re-captured with fresh noise."""
+    background = np.random.default_rng(0).integers(0, 255, (480, 640), dtype=np.uint8)
+    image = cv2.normalize(cv2.GaussianBlur(background, (31, 31), 0), None, 40, 200, cv2.NORM_MINMAX)
+    x1, y1, x2, y2 = SIGN
+    image[y1:y2, x1:x2] = 230
+    cv2.putText(image, word, (x1 + 10, y2 - 18), cv2.FONT_HERSHEY_SIMPLEX, 1.5, 20, 4)
+    image = image + np.random.default_rng(seed).normal(0, 3, image.shape)
+    return cv2.cvtColor(np.clip(image, 0, 255).astype(np.uint8), cv2.COLOR_GRAY2BGR)
+
+
+class SignDetector:
+    """Finds the sign wherever the scene puts it."""
+
+    def detect(self, frame):
+        x1, y1, x2, y2 = SIGN
+        return [np.array([[x1, y2], [x1, y1], [x2, y1], [x2, y2]], dtype=np.float32)], [1.0]
+
+
+class ScriptedRecognizer:
+    """Returns the word the test says is on the sign."""
+
+    word = None
+
+    def recognize(self, patch):
+        return self.word
+
+
+@pytest.fixture
+def reader():
+    reader = TextReader()
+    reader.detector = SignDetector()
+    reader.recognizer = ScriptedRecognizer()
+    yield reader
+    reader.close()
+
+
+def test_unchanged_frame_is_reused(reader):
+    reader.recognizer.word = "push"
+    assert reader.read(scene("PUSH", seed=1)) == ["push"]
+    assert reader.read(scene("PUSH", seed=2)) == ["push"]
+    assert reader.frame_hits == 1
+    assert reader.recognitions == 1
+
+
+@pytest.mark.parametrize('before, after', [("PUSH", "PULL"), ("ROOM 12", "ROOM 13"), ("PUSH", "")])
+def test_changed_sign_on_still_camera_is_read_again(reader, before, after):
+    reader.recognizer.word = before.lower()
+    assert reader.read(scene(before, seed=1)) == [before.lower()]
+
+    reader.recognizer.word = after.lower()
+    assert reader.read(scene(after, seed=2)) == ([after.lower()] if after else [])
+    assert reader.frame_hits == 0
+    assert reader.recognitions == 2